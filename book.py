@@ -0,0 +1,71 @@
+import getopt
+import sys
+
+# Sin interfaz: debe fijarse antes de importar los módulos del juego
+import src.Settings
+src.Settings.INTERFACE = False
+src.Settings.DEBUG     = False
+
+from src.OpeningBook import *
+
+
+PARAMETERS_ERROR_RETURN_CODE = 1
+
+def printUsage():
+    print("Uso: python book.py [opciones] partidas.qgr [partidas.qgr ...]\n\n"+
+          "Opciones:\n"+
+          "  -h, --help\t\t\tMostrar esta ayuda\n"+
+          "  -o, --output=\t\tFichero del libro de aperturas (obligatorio)\n"+
+          "  -x, --cols=\t\tNúmero de columnas del tablero (por defecto 9)\n"+
+          "  -y, --rows=\t\tNúmero de filas del tablero (por defecto 9)\n"+
+          "  -p, --plies=\t\tJugadas desde el comienzo de cada partida (por defecto %d)\n" % OPENING_BOOK_PLIES+
+          "  -m, --min_games=\t\tPartidas mínimas en que se jugó una acción (por defecto %d)\n\n" % OPENING_BOOK_MIN_GAMES+
+          "Ejemplo:\n"+
+          "  python tournament.py --bots=RunnerBotImproved,BuilderBot,BuildAndRunBot --games=500 --record=torneo.qgr\n"+
+          "  python book.py --output=aperturas.qob torneo.qgr\n"+
+          "  python main.py --players=Yo:Human,IA:BuilderBot --book=aperturas.qob")
+
+def readArguments():
+    try:
+        opts, args = getopt.getopt(sys.argv[1:], "o:x:y:p:m:h", ["output=", "cols=", "rows=", "plies=", "min_games=", "help"])
+    except getopt.GetoptError as err:
+        print(err)
+        printUsage()
+        sys.exit(PARAMETERS_ERROR_RETURN_CODE)
+    arguments = {"output": None, "cols": 9, "rows": 9, "plies": OPENING_BOOK_PLIES, "minGames": OPENING_BOOK_MIN_GAMES}
+
+    for opt, arg in opts:
+        if opt in ("-h", "--help"):
+            printUsage()
+            sys.exit(0)
+        elif opt in ("-o", "--output"):
+            arguments["output"] = arg
+        elif opt in ("-x", "--cols"):
+            arguments["cols"] = int(arg)
+        elif opt in ("-y", "--rows"):
+            arguments["rows"] = int(arg)
+        elif opt in ("-p", "--plies"):
+            arguments["plies"] = int(arg)
+        elif opt in ("-m", "--min_games"):
+            arguments["minGames"] = int(arg)
+        else:
+            print("Opción no manejada. Abortando.")
+            sys.exit(PARAMETERS_ERROR_RETURN_CODE)
+
+    if arguments["output"] is None or not args:
+        print("Se esperan un fichero de salida y al menos un fichero de partidas. Abortando.")
+        printUsage()
+        sys.exit(PARAMETERS_ERROR_RETURN_CODE)
+    arguments["files"] = args
+    return arguments
+
+def main():
+    arguments = readArguments()
+    builder = OpeningBookBuilder(arguments["cols"], arguments["rows"], arguments["plies"])
+    for file in arguments["files"]:
+        print("%s: %d partidas" % (file, builder.addFile(file)))
+    entries = builder.write(arguments["output"], arguments["minGames"])
+    print("%d posiciones vistas, %d en el libro %s" % (len(builder.positions), entries, arguments["output"]))
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 import getopt
+import os
 
 from src.Settings              import *
 from src.Game                  import *
@@ -7,6 +8,10 @@ from src.player.RandomBot      import *
 from src.player.RunnerBotImproved import *
 from src.player.BuilderBot     import *
 from src.player.BuildAndRunBot import *
+from src.player.SearchBot      import *
+from src.player.MCTSBot        import *
+from src.GameRecord            import *
+from src.OpeningBook           import *
 import sys
 
 
@@ -23,20 +28,27 @@ def printUsage():
           "      \t\t\t  RunnerBotImproved: Usa algoritmo Greedy (voraz) - siempre busca camino más corto\n"+
           "      \t\t\t  BuilderBot: Usa algoritmo DynamicProgramming - estrategia defensiva avanzada\n"+
           "      \t\t\t  BuildAndRunBot: Usa algoritmo DivideAndConquer - estrategia balanceada óptima\n"+
+          "      \t\t\t  SearchBot: Usa búsqueda Alpha-Beta con profundización iterativa - mira varias jugadas por delante\n"+
+          "      \t\t\t  MCTSBot: Usa Monte Carlo Tree Search (UCT) con simulaciones voraces rápidas\n"+
           "  -r, --rounds=\t\tNúmero de rondas a jugar (por defecto 1)\n"+
           "  -x, --cols=\t\tNúmero de columnas del tablero (por defecto 9)\n"+
           "  -y, --rows=\t\tNúmero de filas del tablero (por defecto 9)\n"+
           "  -f, --fences=\t\tNúmero de muros por jugador (por defecto 5)\n"+
-          "  -s, --square_size=\tTamaño de cada casilla en píxeles (por defecto 32)\n\n"+
+          "  -s, --square_size=\tTamaño de cada casilla en píxeles (por defecto 32)\n"+
+          "  -a, --pathfinding=\tAlgoritmo de búsqueda de caminos: BFS o AStar (por defecto BFS)\n"+
+          "  -o, --record=\t\tAñade las partidas jugadas a este fichero de partidas (formato binario GameRecord)\n"+
+          "  -k, --book=\t\tLibro de aperturas que consultan los bots antes de su estrategia (ver book.py)\n\n"+
           "NOTA: Cada bot tiene su algoritmo fijo asignado:\n"+
           "  - RunnerBotImproved → Greedy Strategy (Estrategia Voraz)\n"+
           "  - BuilderBot → Dynamic Programming (Programación Dinámica)\n"+
-          "  - BuildAndRunBot → Divide and Conquer (Divide y Vencerás)\n\n"+
+          "  - BuildAndRunBot → Divide and Conquer (Divide y Vencerás)\n"+
+          "  - SearchBot → Alpha-Beta Negamax (Búsqueda en árbol)\n"+
+          "  - MCTSBot → Monte Carlo Tree Search (UCT)\n\n"+
           "Ejemplo:\n  python main.py --players=Me:Human,IA:BuildAndRunBot --fences=5 --square_size=32")
 
 def readArguments():
     try:
-        opts, args = getopt.getopt(sys.argv[1:], "p:r:w:x:y:s:fh", ["players=", "rounds=", "cols=", "rows=", "fences=", "square_size=", "help"])
+        opts, args = getopt.getopt(sys.argv[1:], "p:r:w:x:y:s:a:o:k:fh", ["players=", "rounds=", "cols=", "rows=", "fences=", "square_size=", "pathfinding=", "record=", "book=", "help"])
     except getopt.GetoptError as err:
         print(err)
         printUsage()
@@ -47,6 +59,7 @@ def readArguments():
     rows = 9
     fencesPerPlayer = 5
     squareSize = 32
+    recordFile = None
     
     for opt, arg in opts:
         if opt in ("-h", "--help"):
@@ -73,14 +86,26 @@ def readArguments():
             fencesPerPlayer = int(arg)
         elif opt in ("-s", "--square_size"):
             squareSize = int(arg)
+        elif opt in ("-a", "--pathfinding"):
+            if arg not in Path.METHODS:
+                print("Algoritmo de búsqueda de caminos desconocido: %s. Abortando." % (arg))
+                sys.exit(PARAMETERS_ERROR_RETURN_CODE)
+            Path.defaultMethod = arg
+        elif opt in ("-o", "--record"):
+            recordFile = arg
+        elif opt in ("-k", "--book"):
+            if not os.path.exists(arg):
+                print("No existe el libro de aperturas: %s. Abortando." % (arg))
+                sys.exit(PARAMETERS_ERROR_RETURN_CODE)
+            OpeningBook.file = arg
         else:
             print("Opción no manejada. Abortando.")
             sys.exit(PARAMETERS_ERROR_RETURN_CODE)
     
-    return players, rounds, cols, rows, fencesPerPlayer, squareSize
+    return players, rounds, cols, rows, fencesPerPlayer, squareSize, recordFile
 
 def main():
-    players, rounds, cols, rows, fencesPerPlayer, squareSize = readArguments()
+    players, rounds, cols, rows, fencesPerPlayer, squareSize, recordFile = readArguments()
 
     # Mostrar información de algoritmos asignados
     print("\n" + "="*60)
@@ -92,8 +117,12 @@ def main():
         print(f"  {p.name} ({bot_type}) → Algoritmo: {algo_info}")
     print("="*60 + "\n")
 
-    game = Game(players, cols, rows, fencesPerPlayer, squareSize)
+    recordWriter = GameRecordWriter(recordFile) if recordFile is not None else None
+    log = TeeLog(GameLog.default(), recordWriter) if recordWriter is not None else None
+    game = Game(players, cols, rows, fencesPerPlayer, squareSize, log = log)
     game.start(rounds)
+    if recordWriter is not None:
+        recordWriter.close()
     game.end()
 
     global TRACE
@@ -0,0 +1,91 @@
+import getopt
+import sys
+
+# Sin interfaz: debe fijarse antes de importar los módulos del juego
+import src.Settings
+src.Settings.INTERFACE = False
+src.Settings.DEBUG     = False
+
+from src.Replay import *
+
+
+PARAMETERS_ERROR_RETURN_CODE = 1
+INVALID_RECORD_RETURN_CODE   = 2
+
+def printUsage():
+    print("Uso: python replay.py [opciones] fichero.qgr\n\n"+
+          "Opciones:\n"+
+          "  -h, --help\t\t\tMostrar esta ayuda\n"+
+          "  -l, --list\t\t\tListar las partidas del fichero\n"+
+          "  -g, --game=\t\tÍndice de la partida (por defecto 0)\n"+
+          "  -p, --ply=\t\tNúmero de jugadas a aplicar (por defecto todas)\n"+
+          "  -m, --moves\t\tMostrar las acciones hasta esa jugada\n"+
+          "  -u, --untrusted\t\tComprobar la legalidad de cada acción\n\n"+
+          "Ejemplo:\n  python replay.py --game=3 --ply=20 partidas.qgr")
+
+def readArguments():
+    try:
+        opts, args = getopt.getopt(sys.argv[1:], "lg:p:muh", ["list", "game=", "ply=", "moves", "untrusted", "help"])
+    except getopt.GetoptError as err:
+        print(err)
+        printUsage()
+        sys.exit(PARAMETERS_ERROR_RETURN_CODE)
+    arguments = {"list": False, "game": 0, "ply": None, "moves": False, "trusted": True}
+
+    for opt, arg in opts:
+        if opt in ("-h", "--help"):
+            printUsage()
+            sys.exit(0)
+        elif opt in ("-l", "--list"):
+            arguments["list"] = True
+        elif opt in ("-g", "--game"):
+            arguments["game"] = int(arg)
+        elif opt in ("-p", "--ply"):
+            arguments["ply"] = int(arg)
+        elif opt in ("-m", "--moves"):
+            arguments["moves"] = True
+        elif opt in ("-u", "--untrusted"):
+            arguments["trusted"] = False
+        else:
+            print("Opción no manejada. Abortando.")
+            sys.exit(PARAMETERS_ERROR_RETURN_CODE)
+
+    if len(args) != 1:
+        print("Se espera un fichero de partidas. Abortando.")
+        printUsage()
+        sys.exit(PARAMETERS_ERROR_RETURN_CODE)
+    arguments["file"] = args[0]
+    return arguments
+
+def listGames(file):
+    for gameIndex, record in enumerate(GameRecordReader(file).games()):
+        print("#%d: %s" % (gameIndex, record))
+
+def main():
+    arguments = readArguments()
+    if arguments["list"]:
+        listGames(arguments["file"])
+        return
+    try:
+        replay = Replay.fromFile(arguments["file"], arguments["game"], arguments["trusted"])
+    except (IndexError, ValueError) as err:
+        print(err)
+        sys.exit(INVALID_RECORD_RETURN_CODE)
+    ply = len(replay) if arguments["ply"] is None else arguments["ply"]
+    if not 0 <= ply <= len(replay):
+        print("La partida tiene %d jugadas. Abortando." % len(replay))
+        sys.exit(PARAMETERS_ERROR_RETURN_CODE)
+
+    record = replay.record
+    print("Partida #%d: %s" % (arguments["game"], record))
+    if arguments["moves"]:
+        for actionPly, action in enumerate(record.actions[:ply]):
+            print("%4d. %s: %s" % (actionPly + 1, record.names[record.playerForPly(actionPly)], action))
+    state = replay.seek(ply)
+    print("Jugada %d de %d, turno de %s" % (ply, len(replay), record.names[state.playerToMove]))
+    print(replay.toText(state))
+    for playerIndex, name in enumerate(record.names):
+        print("- %s: %s, %d muros, distancia %d" % (name, state.pawns[playerIndex], state.remainingFences[playerIndex], state.distanceToGoal(playerIndex)))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+from src.interface.Fence      import *
+from src.action.PawnMove     import *
+from src.action.FencePlacing import *
+
+
+
+class BitBoard:
+    """
+    Núcleo compacto del estado del tablero, independiente de la interfaz gráfica.
+
+    La casilla (col, row) ocupa el bit row*cols + col de cada máscara entera:
+    - horizontalFences / verticalFences: muros anclados en la casilla
+    - blockedTop / blockedLeft: arista superior / izquierda de la casilla bloqueada por un muro
+    - pawns: casillas ocupadas por un peón
+
+    Las aristas bloqueadas se derivan de los muros con dos desplazamientos de bits:
+    un muro horizontal en i bloquea la arista superior de i y de i + 1, y uno
+    vertical en i bloquea la arista izquierda de i y de i + cols.
+
+    Todas las consultas son O(1) y no dependen del número de muros colocados.
+    Las coordenadas consultadas deben estar dentro del tablero.
+
+    steps y fencePlacings son las tablas de acciones internadas del tamaño del
+    tablero (PawnMove.steps, FencePlacing.table), que la generación de
+    movimientos devuelve en vez de crear objetos nuevos.
+    """
+
+    def __init__(self, cols, rows):
+        self.cols, self.rows  = cols, rows
+        self.horizontalFences = 0
+        self.verticalFences   = 0
+        self.blockedTop       = 0
+        self.blockedLeft      = 0
+        self.pawns            = 0
+        self.steps            = PawnMove.steps(cols, rows)
+        self.fencePlacings    = FencePlacing.table(cols, rows)
+
+    def index(self, coord):
+        return coord.row*self.cols + coord.col
+
+    def fencePlacing(self, coord, direction):
+        return self.fencePlacings[2*(coord.row*self.cols + coord.col) + direction.value]
+
+    def isLeftBlocked(self, coord):
+        return (self.blockedLeft >> (coord.row*self.cols + coord.col)) & 1 == 1
+
+    def isRightBlocked(self, coord):
+        return (self.blockedLeft >> (coord.row*self.cols + coord.col + 1)) & 1 == 1
+
+    def isTopBlocked(self, coord):
+        return (self.blockedTop >> (coord.row*self.cols + coord.col)) & 1 == 1
+
+    def isBottomBlocked(self, coord):
+        return (self.blockedTop >> ((coord.row + 1)*self.cols + coord.col)) & 1 == 1
+
+    def hasFence(self, coord, direction):
+        fences = self.horizontalFences if direction == Fence.DIRECTION.HORIZONTAL else self.verticalFences
+        return (fences >> (coord.row*self.cols + coord.col)) & 1 == 1
+
+    def isFenceSlotFree(self, coord, direction):
+        """
+        Indica si un muro en coord no se superpone ni se cruza con los existentes.
+        No comprueba los bordes del tablero.
+        """
+        if direction == Fence.DIRECTION.HORIZONTAL:
+            i = coord.row*self.cols + coord.col
+            if (self.blockedTop >> i) & 3:
+                return False
+            # Muro vertical que cruzaría por el centro: anclado arriba a la derecha
+            return (self.verticalFences >> (i - self.cols + 1)) & 1 == 0
+        i = coord.row*self.cols + coord.col
+        if (self.blockedLeft >> i) & 1 or (self.blockedLeft >> (i + self.cols)) & 1:
+            return False
+        # Muro horizontal que cruzaría por el centro: anclado abajo a la izquierda
+        return (self.horizontalFences >> (i + self.cols - 1)) & 1 == 0
+
+    def placeFence(self, coord, direction):
+        bit = 1 << (coord.row*self.cols + coord.col)
+        if direction == Fence.DIRECTION.HORIZONTAL:
+            self.horizontalFences |= bit
+        else:
+            self.verticalFences |= bit
+        self.updateBlockedEdges()
+
+    def removeFence(self, coord, direction):
+        bit = 1 << (coord.row*self.cols + coord.col)
+        if direction == Fence.DIRECTION.HORIZONTAL:
+            self.horizontalFences &= ~bit
+        else:
+            self.verticalFences &= ~bit
+        self.updateBlockedEdges()
+
+    def updateBlockedEdges(self):
+        self.blockedTop  = self.horizontalFences | (self.horizontalFences << 1)
+        self.blockedLeft = self.verticalFences   | (self.verticalFences << self.cols)
+
+    def hasPawn(self, coord):
+        return (self.pawns >> (coord.row*self.cols + coord.col)) & 1 == 1
+
+    def movePawn(self, fromCoord, toCoord):
+        if fromCoord is not None:
+            self.pawns &= ~(1 << (fromCoord.row*self.cols + fromCoord.col))
+        if toCoord is not None:
+            self.pawns |= 1 << (toCoord.row*self.cols + toCoord.col)
+
+    def validPawnMoves(self, coord, ignorePawns = False):
+        """
+        Movimientos de peón válidos desde coord, incluidos saltos sobre otros peones.
+        Mismo orden que Board.validPawnMoves: izquierda, derecha, arriba, abajo.
+        """
+        lastCol, lastRow = self.cols - 1, self.rows - 1
+        isLeftBlocked, isRightBlocked = self.isLeftBlocked, self.isRightBlocked
+        isTopBlocked,  isBottomBlocked = self.isTopBlocked,  self.isBottomBlocked
+        hasPawn = self.hasPawn
+        steps, step = self.steps, 4*(coord.row*self.cols + coord.col)
+        validMoves = []
+        if coord.col != 0 and not isLeftBlocked(coord):
+            leftCoord = coord.left()
+            if ignorePawns or not hasPawn(leftCoord):
+                validMoves.append(steps[step])
+            else:
+                if leftCoord.col != 0 and not isLeftBlocked(leftCoord) and not hasPawn(leftCoord.left()):
+                    validMoves.append(PawnMove(coord, leftCoord.left(), leftCoord))
+                else:
+                    if leftCoord.row != 0 and not isTopBlocked(leftCoord) and not hasPawn(leftCoord.top()):
+                        validMoves.append(PawnMove(coord, leftCoord.top(), leftCoord))
+                    if leftCoord.row != lastRow and not isBottomBlocked(leftCoord) and not hasPawn(leftCoord.bottom()):
+                        validMoves.append(PawnMove(coord, leftCoord.bottom(), leftCoord))
+        if coord.col != lastCol and not isRightBlocked(coord):
+            rightCoord = coord.right()
+            if ignorePawns or not hasPawn(rightCoord):
+                validMoves.append(steps[step + 1])
+            else:
+                if rightCoord.col != lastCol and not isRightBlocked(rightCoord) and not hasPawn(rightCoord.right()):
+                    validMoves.append(PawnMove(coord, rightCoord.right(), rightCoord))
+                else:
+                    if rightCoord.row != 0 and not isTopBlocked(rightCoord) and not hasPawn(rightCoord.top()):
+                        validMoves.append(PawnMove(coord, rightCoord.top(), rightCoord))
+                    if rightCoord.row != lastRow and not isBottomBlocked(rightCoord) and not hasPawn(rightCoord.bottom()):
+                        validMoves.append(PawnMove(coord, rightCoord.bottom(), rightCoord))
+        if coord.row != 0 and not isTopBlocked(coord):
+            topCoord = coord.top()
+            if ignorePawns or not hasPawn(topCoord):
+                validMoves.append(steps[step + 2])
+            else:
+                if topCoord.row != 0 and not isTopBlocked(topCoord) and not hasPawn(topCoord.top()):
+                    validMoves.append(PawnMove(coord, topCoord.top(), topCoord))
+                else:
+                    if topCoord.col != 0 and not isLeftBlocked(topCoord) and not hasPawn(topCoord.left()):
+                        validMoves.append(PawnMove(coord, topCoord.left(), topCoord))
+                    if topCoord.col != lastCol and not isRightBlocked(topCoord) and not hasPawn(topCoord.right()):
+                        validMoves.append(PawnMove(coord, topCoord.right(), topCoord))
+        if coord.row != lastRow and not isBottomBlocked(coord):
+            bottomCoord = coord.bottom()
+            if ignorePawns or not hasPawn(bottomCoord):
+                validMoves.append(steps[step + 3])
+            else:
+                if bottomCoord.row != lastRow and not isBottomBlocked(bottomCoord) and not hasPawn(bottomCoord.bottom()):
+                    validMoves.append(PawnMove(coord, bottomCoord.bottom(), bottomCoord))
+                else:
+                    if bottomCoord.col != 0 and not isLeftBlocked(bottomCoord) and not hasPawn(bottomCoord.left()):
+                        validMoves.append(PawnMove(coord, bottomCoord.left(), bottomCoord))
+                    if bottomCoord.col != lastCol and not isRightBlocked(bottomCoord) and not hasPawn(bottomCoord.right()):
+                        validMoves.append(PawnMove(coord, bottomCoord.right(), bottomCoord))
+        return validMoves
@@ -0,0 +1,270 @@
+import heapq
+import math
+from collections import deque
+
+from src.Settings          import *
+from src.GridCoordinates   import *
+from src.interface.Fence   import *
+from src.action.PawnMove   import *
+from src.Path              import *
+
+
+
+class DistanceMap:
+    """
+    Distancia de cada casilla a la línea objetivo de un jugador, ignorando peones.
+
+    Se calcula con un único BFS multi-origen hacia atrás, desde todas las casillas
+    objetivo a la vez, sobre los índices row*cols + col del BitBoard. La distancia
+    de cualquier peón es entonces una consulta en la tabla, y un camino más corto
+    se reconstruye bajando por el gradiente (vecino con distancia d - 1).
+
+    Solo depende de los muros: fenceKey guarda (horizontalFences, verticalFences)
+    del BitBoard con el que se calculó, y el mapa es válido mientras no cambien.
+    Las casillas sin camino al objetivo tienen distancia math.inf.
+
+    Al colocar un muro solo desaparecen dos aristas, así que las distancias se
+    reparan de forma decremental (al estilo de Ramalingam-Reps) en lugar de
+    repetir el BFS: placeFence() actualiza el mapa, afterFence() devuelve una
+    copia actualizada y distanceAfterFence() responde al "¿y si?" sin modificarlo.
+    """
+
+    def __init__(self, bitboard, endCoords):
+        global TRACE
+        TRACE["DistanceMap.compute"] += 1
+        self.cols, self.rows = bitboard.cols, bitboard.rows
+        self.fenceKey        = (bitboard.horizontalFences, bitboard.verticalFences)
+        self.endCoords       = list(endCoords)
+        self.blockedTop      = DistanceMap.bits(bitboard.blockedTop, self.cols*self.rows)
+        self.blockedLeft     = DistanceMap.bits(bitboard.blockedLeft, self.cols*self.rows)
+        self.distances       = [math.inf]*(self.cols*self.rows)
+        sources = deque()
+        for endCoord in self.endCoords:
+            i = endCoord.row*self.cols + endCoord.col
+            self.distances[i] = 0
+            sources.append(i)
+        self.expand(sources)
+
+    def bits(mask, length):
+        """
+        Lista de booleanos con los length primeros bits de mask, del menos significativo al más.
+        """
+        binary = bin(mask)[:1:-1]
+        return [bit == "1" for bit in binary[:length]] + [False]*(length - len(binary))
+
+    def neighbours(self, i):
+        """
+        Índices de las casillas vecinas de i no separadas por un muro:
+        izquierda, derecha, arriba, abajo.
+        """
+        cols = self.cols
+        col = i % cols
+        if col != 0 and not self.blockedLeft[i]:
+            yield i - 1
+        if col != cols - 1 and not self.blockedLeft[i + 1]:
+            yield i + 1
+        if i >= cols and not self.blockedTop[i]:
+            yield i - cols
+        if i + cols < len(self.distances) and not self.blockedTop[i + cols]:
+            yield i + cols
+
+    def expand(self, queue):
+        distances = self.distances
+        while queue:
+            i = queue.popleft()
+            distance = distances[i] + 1
+            for j in self.neighbours(i):
+                if distances[j] > distance:
+                    distances[j] = distance
+                    queue.append(j)
+
+    def fenceEdges(self, coord, direction):
+        """
+        Aristas que bloquea un muro, como (tabla, índice): blockedTop[i] separa
+        i de i - cols y blockedLeft[i] separa i de i - 1.
+        """
+        i = coord.row*self.cols + coord.col
+        if direction == Fence.DIRECTION.HORIZONTAL:
+            return [(self.blockedTop, i), (self.blockedTop, i + 1)]
+        return [(self.blockedLeft, i), (self.blockedLeft, i + self.cols)]
+
+    def removeEdges(self, edges):
+        """
+        Bloquea las aristas (libres hasta ahora) y repara las distancias. Devuelve los cambios
+        [(índice, distancia anterior)] para poder deshacerlos con restoreEdges().
+
+        1. Las casillas que pierden su último vecino a distancia d - 1 quedan
+           afectadas; se recorren por distancia creciente propagando a sus
+           vecinos a distancia d + 1.
+        2. Las afectadas se recalculan con una cola de prioridad partiendo de
+           sus vecinos no afectados, como en Dijkstra.
+        Solo se visitan las casillas cuya distancia cambia y sus vecinas.
+        """
+        global TRACE
+        TRACE["DistanceMap.repair"] += 1
+        distances = self.distances
+        candidates = []
+        for (blocked, i) in edges:
+            blocked[i] = True
+            j = i - self.cols if blocked is self.blockedTop else i - 1
+            if distances[i] == math.inf or distances[j] == math.inf:
+                continue
+            if distances[i] == distances[j] + 1:
+                heapq.heappush(candidates, (distances[i], i))
+            elif distances[j] == distances[i] + 1:
+                heapq.heappush(candidates, (distances[j], j))
+
+        affected = set()
+        while candidates:
+            (distance, i) = heapq.heappop(candidates)
+            if i in affected:
+                continue
+            if any(distances[j] == distance - 1 and j not in affected for j in self.neighbours(i)):
+                continue
+            affected.add(i)
+            for j in self.neighbours(i):
+                if distances[j] == distance + 1:
+                    heapq.heappush(candidates, (distance + 1, j))
+        if not affected:
+            return []
+
+        changes = [(i, distances[i]) for i in affected]
+        for i in affected:
+            distances[i] = math.inf
+        nextNodes = []
+        for i in affected:
+            distance = min([distances[j] + 1 for j in self.neighbours(i)], default = math.inf)
+            if distance != math.inf:
+                distances[i] = distance
+                heapq.heappush(nextNodes, (distance, i))
+        while nextNodes:
+            (distance, i) = heapq.heappop(nextNodes)
+            if distance > distances[i]:
+                continue
+            for j in self.neighbours(i):
+                if distances[j] > distance + 1:
+                    distances[j] = distance + 1
+                    heapq.heappush(nextNodes, (distance + 1, j))
+        return changes
+
+    def restoreEdges(self, edges, changes):
+        for (blocked, i) in edges:
+            blocked[i] = False
+        for (i, distance) in changes:
+            self.distances[i] = distance
+
+    def placeFence(self, coord, direction):
+        """
+        Actualiza el mapa tras colocar un muro.
+        """
+        self.removeEdges(self.fenceEdges(coord, direction))
+        bit = 1 << (coord.row*self.cols + coord.col)
+        (horizontalFences, verticalFences) = self.fenceKey
+        if direction == Fence.DIRECTION.HORIZONTAL:
+            self.fenceKey = (horizontalFences | bit, verticalFences)
+        else:
+            self.fenceKey = (horizontalFences, verticalFences | bit)
+
+    def afterFence(self, coord, direction):
+        """
+        Copia del mapa con un muro más, sin modificar este.
+        """
+        distanceMap = DistanceMap.__new__(DistanceMap)
+        distanceMap.__dict__.update(self.__dict__)
+        distanceMap.blockedTop  = list(self.blockedTop)
+        distanceMap.blockedLeft = list(self.blockedLeft)
+        distanceMap.distances   = list(self.distances)
+        distanceMap.placeFence(coord, direction)
+        return distanceMap
+
+    def distanceAfterFence(self, fenceCoord, direction, coord):
+        """
+        Distancia desde coord si se colocara un muro en fenceCoord, sin modificar el mapa.
+        """
+        edges = self.fenceEdges(fenceCoord, direction)
+        changes = self.removeEdges(edges)
+        distance = self.distances[coord.row*self.cols + coord.col]
+        self.restoreEdges(edges, changes)
+        return distance
+
+    def shortestPathFences(self, coord):
+        """
+        Anclajes de los muros que cortan alguna arista de algún camino más corto
+        desde coord, como máscaras (horizontales, verticales) con los índices del BitBoard.
+
+        Los caminos más cortos forman un grafo acíclico: las aristas que bajan
+        de d a d - 1 alcanzables desde coord. La arista superior de la casilla t
+        la cortan los muros horizontales en t y t - 1; la izquierda de la
+        casilla l, los verticales en l y l - cols. Un muro fuera de las máscaras
+        no cambia la distancia desde coord.
+        """
+        cols, distances = self.cols, self.distances
+        lastRowStart = cols*(self.rows - 1)
+        horizontalMask, verticalMask = 0, 0
+        start = coord.row*cols + coord.col
+        if distances[start] == math.inf:
+            return (0, 0)
+        visited = {start}
+        nextNodes = [start]
+        while nextNodes:
+            i = nextNodes.pop()
+            for j in self.neighbours(i):
+                if distances[j] != distances[i] - 1:
+                    continue
+                if j == i - cols or j == i + cols:
+                    top = max(i, j)
+                    if top % cols != cols - 1:
+                        horizontalMask |= 1 << top
+                    if top % cols != 0:
+                        horizontalMask |= 1 << (top - 1)
+                else:
+                    left = max(i, j)
+                    if left < lastRowStart:
+                        verticalMask |= 1 << left
+                    if left >= cols:
+                        verticalMask |= 1 << (left - cols)
+                if j not in visited:
+                    visited.add(j)
+                    nextNodes.append(j)
+        return (horizontalMask, verticalMask)
+
+    def isValidFor(self, bitboard):
+        return self.fenceKey == (bitboard.horizontalFences, bitboard.verticalFences)
+
+    def update(self, bitboard):
+        """
+        Mapa para los muros de bitboard, sin modificar este (que puede estar
+        guardado en una caché). Si solo se ha añadido un muro se repara una
+        copia; si no (muro retirado, partida nueva...) se recalcula.
+        """
+        (horizontalFences, verticalFences) = self.fenceKey
+        addedHorizontal = bitboard.horizontalFences & ~horizontalFences
+        addedVertical   = bitboard.verticalFences & ~verticalFences
+        isSuperset = horizontalFences & ~bitboard.horizontalFences == 0 and verticalFences & ~bitboard.verticalFences == 0
+        if isSuperset and bin(addedHorizontal).count("1") + bin(addedVertical).count("1") == 1:
+            bit = (addedHorizontal | addedVertical).bit_length() - 1
+            coord = GridCoordinates.grid(self.cols, self.rows)[bit]
+            return self.afterFence(coord, Fence.DIRECTION.HORIZONTAL if addedHorizontal else Fence.DIRECTION.VERTICAL)
+        return DistanceMap(bitboard, self.endCoords)
+
+    def distance(self, coord):
+        return self.distances[coord.row*self.cols + coord.col]
+
+    def path(self, startCoord):
+        """
+        Camino más corto desde startCoord siguiendo el gradiente, o None si no hay camino.
+        """
+        i = startCoord.row*self.cols + startCoord.col
+        if self.distances[i] == math.inf:
+            return None
+        coords = GridCoordinates.grid(self.cols, self.rows)
+        moves = []
+        coord = startCoord
+        while self.distances[i] > 0:
+            for j in self.neighbours(i):
+                if self.distances[j] == self.distances[i] - 1:
+                    break
+            nextCoord = coords[j]
+            moves.append(PawnMove(coord, nextCoord))
+            coord, i = nextCoord, j
+        return Path(moves)
@@ -0,0 +1,204 @@
+from array       import array
+from collections import OrderedDict, deque
+
+from src.Settings        import *
+from src.GridCoordinates import *
+
+
+
+class EndgameTablebase:
+    """
+    Finales sin muros de dos jugadores resueltos por análisis retrógrado.
+
+    Cuando a ningún jugador le quedan muros, los muros del tablero ya no
+    cambian y la partida es una carrera de peones. Para esa disposición de
+    muros se resuelven a la vez todas las posiciones (peón 0, peón 1, turno):
+    2·(cols·rows)² estados, 13122 en un 9x9.
+
+    Se parte de las posiciones terminales (el jugador que acaba de mover está
+    en su meta: pierde el que tiene el turno) y se retrocede por niveles: un
+    estado es ganador si alguna jugada lleva a uno perdedor, y perdedor cuando
+    todas sus jugadas llevan a estados ganadores. Así se obtiene, para cada
+    estado, el resultado con juego perfecto y en cuántas jugadas se alcanza.
+    Los estados que nunca se resuelven son tablas (los peones se bloquean
+    mutuamente para siempre).
+
+    Las jugadas se generan con las mismas reglas que BitBoard.validPawnMoves
+    (saltos rectos y, si hay muro o borde detrás, en diagonal). Las tablas
+    resueltas se guardan por disposición de muros en una caché LRU.
+    """
+
+    WIN  = 1
+    DRAW = 0
+    LOSS = -1
+
+    cache = OrderedDict()
+
+    def __init__(self, bitboard, goals):
+        global TRACE
+        TRACE["EndgameTablebase.solve"] += 1
+        self.cols, self.rows = bitboard.cols, bitboard.rows
+        self.size  = self.cols*self.rows
+        self.goals = [frozenset(coord.row*self.cols + coord.col for coord in endPositions) for endPositions in goals]
+        self.moves = self.pawnMoves(bitboard)
+        self.solve()
+
+    @staticmethod
+    def forBitBoard(bitboard, goals):
+        """
+        Tabla resuelta de la disposición de muros de bitboard, de la caché si ya se resolvió.
+        """
+        key = (bitboard.cols, bitboard.rows, bitboard.horizontalFences, bitboard.verticalFences, tuple(tuple(endPositions) for endPositions in goals))
+        tablebase = EndgameTablebase.cache.get(key)
+        if tablebase is None:
+            tablebase = EndgameTablebase(bitboard, goals)
+            EndgameTablebase.cache[key] = tablebase
+            if len(EndgameTablebase.cache) > ENDGAME_TABLEBASE_CACHE:
+                EndgameTablebase.cache.popitem(last = False)
+        else:
+            EndgameTablebase.cache.move_to_end(key)
+        return tablebase
+
+    @staticmethod
+    def applies(players):
+        return ENDGAME_TABLEBASE and len(players) == 2 and all(player.remainingFences() == 0 for player in players)
+
+    @staticmethod
+    def moveFor(board, player):
+        """
+        Jugada con juego perfecto para player, o None si la posición no es un
+        final sin muros de dos jugadores o está en tablas.
+        """
+        players = board.game.players
+        if not EndgameTablebase.applies(players):
+            return None
+        tablebase = EndgameTablebase.forBitBoard(board.bitboard, [other.endPositions for other in players])
+        pawns = [other.pawn.coord for other in players]
+        target = tablebase.bestTarget(player.index, pawns[0].row*tablebase.cols + pawns[0].col, pawns[1].row*tablebase.cols + pawns[1].col)
+        if target is None:
+            return None
+        for validMove in board.storedValidPawnMoves[player.pawn.coord]:
+            if validMove.toCoord.row*tablebase.cols + validMove.toCoord.col == target:
+                return validMove
+        return None
+
+    def pawnMoves(self, bitboard):
+        """
+        moves[x*size + y]: casillas a las que puede ir un peón en x con el otro peón en y.
+        """
+        cols, rows, size = self.cols, self.rows, self.size
+        # Pasos abiertos desde cada casilla por dirección: izquierda, derecha, arriba, abajo
+        steps = [[None]*4 for _ in range(size)]
+        for i, coord in enumerate(GridCoordinates.grid(cols, rows)):
+            if coord.col != 0 and not bitboard.isLeftBlocked(coord):
+                steps[i][0] = i - 1
+            if coord.col != cols - 1 and not bitboard.isRightBlocked(coord):
+                steps[i][1] = i + 1
+            if coord.row != 0 and not bitboard.isTopBlocked(coord):
+                steps[i][2] = i - cols
+            if coord.row != rows - 1 and not bitboard.isBottomBlocked(coord):
+                steps[i][3] = i + cols
+        sides = ((2, 3), (2, 3), (0, 1), (0, 1))
+
+        moves = [()]*(size*size)
+        for x in range(size):
+            for y in range(size):
+                if x == y:
+                    continue
+                targets = []
+                for direction, n in enumerate(steps[x]):
+                    if n is None:
+                        continue
+                    if n != y:
+                        targets.append(n)
+                    elif steps[n][direction] is not None:
+                        targets.append(steps[n][direction])
+                    else:
+                        targets.extend(steps[n][side] for side in sides[direction] if steps[n][side] is not None)
+                moves[x*size + y] = tuple(targets)
+        return moves
+
+    def index(self, playerIndex, pawn0, pawn1):
+        return (playerIndex*self.size + pawn0)*self.size + pawn1
+
+    def solve(self):
+        size, moves, goals = self.size, self.moves, self.goals
+        states = 2*size*size
+        self.results   = array("b", [EndgameTablebase.DRAW])*states
+        self.distances = array("H", [0])*states
+        results, distances = self.results, self.distances
+
+        # Predecesores: origins[t*size + y] son las casillas desde las que se llega a t con el otro peón en y
+        origins = [[] for _ in range(size*size)]
+        for x in range(size):
+            for y in range(size):
+                for t in moves[x*size + y]:
+                    origins[t*size + y].append(x)
+
+        pending = array("B", [0])*states
+        queue = deque()
+        for pawn0 in range(size):
+            for pawn1 in range(size):
+                if pawn0 == pawn1:
+                    continue
+                for playerIndex in (0, 1):
+                    state = (playerIndex*size + pawn0)*size + pawn1
+                    if pawn0 in goals[0] or pawn1 in goals[1]:
+                        # Ha ganado quien acaba de mover, es decir, el que no tiene el turno
+                        won = pawn1 in goals[1] if playerIndex == 0 else pawn0 in goals[0]
+                        results[state] = EndgameTablebase.LOSS if won else EndgameTablebase.WIN
+                        if won:
+                            queue.append(state)
+                    else:
+                        pending[state] = len(moves[pawn0*size + pawn1] if playerIndex == 0 else moves[pawn1*size + pawn0])
+
+        while queue:
+            state = queue.popleft()
+            result, distance = results[state], distances[state] + 1
+            playerIndex, rest = divmod(state, size*size)
+            pawn0, pawn1 = divmod(rest, size)
+            # Los predecesores los movió el otro jugador
+            if playerIndex == 1:
+                predecessors = [pawn0Before*size + pawn1 for pawn0Before in origins[pawn0*size + pawn1]]
+            else:
+                predecessors = [(size + pawn0)*size + pawn1Before for pawn1Before in origins[pawn1*size + pawn0]]
+            for predecessor in predecessors:
+                if results[predecessor] != EndgameTablebase.DRAW or pending[predecessor] == 0:
+                    continue
+                if result == EndgameTablebase.LOSS:
+                    results[predecessor], distances[predecessor] = EndgameTablebase.WIN, distance
+                    pending[predecessor] = 0
+                    queue.append(predecessor)
+                else:
+                    pending[predecessor] -= 1
+                    if pending[predecessor] == 0:
+                        results[predecessor], distances[predecessor] = EndgameTablebase.LOSS, distance
+                        queue.append(predecessor)
+
+    def probe(self, playerIndex, pawn0, pawn1):
+        """
+        (resultado para el jugador con el turno, jugadas hasta el final con juego perfecto).
+        """
+        state = self.index(playerIndex, pawn0, pawn1)
+        return (self.results[state], self.distances[state])
+
+    def bestTarget(self, playerIndex, pawn0, pawn1):
+        """
+        Casilla a la que mover el peón de playerIndex: la victoria más corta o
+        la derrota más larga. None si la posición está en tablas.
+        """
+        result, _ = self.probe(playerIndex, pawn0, pawn1)
+        if result == EndgameTablebase.DRAW:
+            return None
+        size = self.size
+        own, other = (pawn0, pawn1) if playerIndex == 0 else (pawn1, pawn0)
+        bestTarget, bestRank = None, None
+        for target in self.moves[own*size + other]:
+            if target in self.goals[playerIndex]:
+                return target
+            childResult, childDistance = self.probe(1 - playerIndex, *((target, other) if playerIndex == 0 else (other, target)))
+            # Ordenar por el resultado del rival (perder es lo mejor) y luego por distancia
+            rank = (-childResult, -childDistance if childResult == EndgameTablebase.LOSS else childDistance)
+            if bestRank is None or rank > bestRank:
+                bestTarget, bestRank = target, rank
+        return bestTarget
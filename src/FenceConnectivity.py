@@ -0,0 +1,86 @@
+from src.interface.Fence import *
+
+
+
+class FenceConnectivity:
+    """
+    Componentes conexas de los muros, para saber sin buscar caminos si un muro
+    nuevo puede bloquear a algún jugador.
+
+    Los muros se ven como segmentos sobre la rejilla de esquinas de las casillas:
+    el punto (x, y), con 0 <= x <= cols y 0 <= y <= rows, es la esquina superior
+    izquierda de la casilla (x, y). Un muro horizontal en (c, r) une los puntos
+    (c, r), (c + 1, r) y (c + 2, r); uno vertical en (c, r) une (c, r), (c, r + 1)
+    y (c, r + 2). Todos los puntos del borde forman una única componente.
+
+    Un muro solo puede separar dos casillas si cierra un ciclo, es decir, si dos
+    de sus puntos ya estaban en la misma componente. Si no, no bloquea a nadie y
+    no hace falta ningún BFS.
+
+    Union-find con unión por tamaño y sin compresión de caminos, de modo que
+    removeLastFence() deshace las uniones del último muro en orden inverso.
+    """
+
+    def __init__(self, cols, rows):
+        self.cols, self.rows = cols, rows
+        self.border  = (cols + 1)*(rows + 1)
+        self.parents = list(range(self.border + 1))
+        self.sizes   = [1]*(self.border + 1)
+        self.history = []
+        for x in range(cols + 1):
+            for y in range(rows + 1):
+                if x == 0 or y == 0 or x == cols or y == rows:
+                    self.union(self.point(x, y), self.border)
+
+    def point(self, x, y):
+        return y*(self.cols + 1) + x
+
+    def fencePoints(self, coord, direction):
+        if direction == Fence.DIRECTION.HORIZONTAL:
+            return [self.point(coord.col + i, coord.row) for i in range(3)]
+        return [self.point(coord.col, coord.row + i) for i in range(3)]
+
+    def find(self, point):
+        parents = self.parents
+        while parents[point] != point:
+            point = parents[point]
+        return point
+
+    def union(self, first, second):
+        """
+        Une las componentes de dos puntos y devuelve (raíz absorbida, raíz), o None si ya estaban unidas.
+        """
+        first, second = self.find(first), self.find(second)
+        if first == second:
+            return None
+        if self.sizes[first] > self.sizes[second]:
+            first, second = second, first
+        self.parents[first] = second
+        self.sizes[second] += self.sizes[first]
+        return (first, second)
+
+    def canBlock(self, coord, direction):
+        """
+        False si el muro seguro que no bloquea a ningún jugador; True si hay que comprobarlo.
+        """
+        roots = [self.find(point) for point in self.fencePoints(coord, direction)]
+        return roots[0] == roots[1] or roots[0] == roots[2] or roots[1] == roots[2]
+
+    def placeFence(self, coord, direction):
+        (first, middle, last) = self.fencePoints(coord, direction)
+        unions = [self.union(first, middle), self.union(middle, last)]
+        self.history.append([union for union in unions if union is not None])
+
+    def removeLastFence(self):
+        for (absorbed, root) in reversed(self.history.pop()):
+            self.parents[absorbed] = absorbed
+            self.sizes[root] -= self.sizes[absorbed]
+
+    def copy(self):
+        connectivity = FenceConnectivity.__new__(FenceConnectivity)
+        connectivity.cols, connectivity.rows = self.cols, self.rows
+        connectivity.border  = self.border
+        connectivity.parents = list(self.parents)
+        connectivity.sizes   = list(self.sizes)
+        connectivity.history = [list(unions) for unions in self.history]
+        return connectivity
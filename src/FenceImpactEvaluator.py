@@ -0,0 +1,111 @@
+import math
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from src.Settings  import *
+from src.GameState import *
+from src.exception.PlayerPathObstructedException import *
+
+
+
+class FenceImpactEvaluator:
+    """
+    Impacto de muchos muros candidatos sobre los caminos de los jugadores,
+    repartido entre procesos.
+
+    Cada turno se envía a cada proceso una copia compacta de la partida (un
+    GameState) y un trozo contiguo de los candidatos; los resultados se juntan
+    en el orden original, así que el resultado es el mismo que en serie.
+
+    Con FENCE_EVALUATION_WORKERS <= 1, con menos de FENCE_EVALUATION_MIN_PARALLEL
+    candidatos o si no se puede usar el pool, se evalúan todos en este proceso
+    con Board.evaluateFencesBatch().
+    """
+
+    executor = None
+    executorWorkers = 0
+
+    @staticmethod
+    def impacts(board, fencePlacings, workers = None):
+        """
+        {FencePlacing: {nombre de jugador: aumento de su distancia}} en el orden
+        de fencePlacings, sin los muros que bloquearían a algún jugador. Vacío
+        si algún jugador ya está bloqueado.
+        """
+        if workers is None:
+            workers = FENCE_EVALUATION_WORKERS
+        # Antes de enviar la partida a ningún proceso
+        for player in board.game.players:
+            if board.getDistanceToGoal(player) == math.inf:
+                if board.game.log.enabled:
+                    board.game.log.emit("playerBlocked", player = player)
+                return {}
+        fencePlacings = list(fencePlacings)
+        if workers > 1 and len(fencePlacings) >= FENCE_EVALUATION_MIN_PARALLEL:
+            impacts = FenceImpactEvaluator.parallelImpacts(board, fencePlacings, workers)
+            if impacts is not None:
+                return impacts
+        return FenceImpactEvaluator.serialImpacts(board, fencePlacings)
+
+    @staticmethod
+    def serialImpacts(board, fencePlacings):
+        return board.evaluateFencesBatch(fencePlacings)
+
+    @staticmethod
+    def parallelImpacts(board, fencePlacings, workers):
+        """
+        Reparte fencePlacings en workers trozos; None si el pool no está disponible.
+        """
+        state = GameState.fromBoard(board)
+        playerNames = [player.name for player in board.game.players]
+        chunkSize = math.ceil(len(fencePlacings) / workers)
+        chunks = [fencePlacings[i:i + chunkSize] for i in range(0, len(fencePlacings), chunkSize)]
+        try:
+            executor = FenceImpactEvaluator.getExecutor(workers)
+            futures = [executor.submit(FenceImpactEvaluator.evaluateChunk, state, playerNames, chunk) for chunk in chunks]
+            results = [future.result() for future in futures]
+        except (OSError, NotImplementedError, BrokenProcessPool):
+            FenceImpactEvaluator.executor = None
+            return None
+        impacts = {}
+        for (chunk, chunkImpacts) in zip(chunks, results):
+            for (fencePlacing, impact) in zip(chunk, chunkImpacts):
+                if impact is not False:
+                    impacts[fencePlacing] = impact
+        return impacts
+
+    @staticmethod
+    def getExecutor(workers):
+        if FenceImpactEvaluator.executor is None or FenceImpactEvaluator.executorWorkers != workers:
+            if FenceImpactEvaluator.executor is not None:
+                FenceImpactEvaluator.executor.shutdown(wait = False)
+            FenceImpactEvaluator.executor = ProcessPoolExecutor(max_workers = workers)
+            FenceImpactEvaluator.executorWorkers = workers
+        return FenceImpactEvaluator.executor
+
+    @staticmethod
+    def evaluateChunk(state, playerNames, fencePlacings):
+        """
+        Trabajo de un proceso: el impacto de cada muro como en
+        Board.getFencePlacingImpactOnPaths(), o False si bloquearía a alguien.
+        Ningún jugador está bloqueado (lo comprueba impacts()).
+        """
+        distances = [state.distanceToGoal(playerIndex) for playerIndex in range(state.playerCount())]
+        # Como en Board.isImpactCandidate(): un muro fuera de los caminos más cortos no cambia la distancia
+        masks = [state.distanceMap(playerIndex).shortestPathFences(state.pawns[playerIndex]) for playerIndex in range(state.playerCount())]
+        chunkImpacts = []
+        for fencePlacing in fencePlacings:
+            bit = 1 << (fencePlacing.coord.row*state.cols + fencePlacing.coord.col)
+            maskIndex = 0 if fencePlacing.direction == Fence.DIRECTION.HORIZONTAL else 1
+            impact = {}
+            for (playerIndex, playerName) in enumerate(playerNames):
+                if not masks[playerIndex][maskIndex] & bit:
+                    impact[playerName] = 0
+                    continue
+                distance = state.distanceMap(playerIndex).distanceAfterFence(fencePlacing.coord, fencePlacing.direction, state.pawns[playerIndex])
+                if distance == math.inf:
+                    impact = False
+                    break
+                impact[playerName] = distance - distances[playerIndex]
+            chunkImpacts.append(impact)
+        return chunkImpacts
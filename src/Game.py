@@ -8,7 +8,9 @@ from src.interface.Pawn      import *
 from src.player.Human        import *
 from src.action.PawnMove     import *
 from src.action.FencePlacing import *
+from src.action.Pass         import *
 from src.Path                import *
+from src.GameLog             import *
 
 
 
@@ -31,10 +33,12 @@ class Game:
         "4"
     ]
 
-    def __init__(self, players, cols = 9, rows = 9, totalFenceCount = 20, squareSize = 32, innerSize = None):
+    def __init__(self, players, cols = 9, rows = 9, totalFenceCount = 20, squareSize = 32, innerSize = None, log = None):
         if innerSize is None:
             innerSize = int(squareSize/8)
         self.totalFenceCount = totalFenceCount
+        # Destino de los eventos de la partida (ver GameLog); sin interfaz, ninguno por defecto
+        self.log = log if log is not None else GameLog.default()
         self.current_player_index = 0  # Para tracking del jugador actual
 
         # Estadísticas de rendimiento por jugador
@@ -50,6 +54,7 @@ class Game:
                 players[i].name = Game.DefaultNameForPlayer[i]
             if players[i].color is None:
                 players[i].color = Game.DefaultColorForPlayer[i]
+            players[i].index = i
             players[i].pawn = Pawn(board, players[i])
             players[i].startPosition = board.startPosition(i)
             players[i].endPositions = board.endPositions(i)
@@ -68,14 +73,12 @@ class Game:
         """
         Inicia una serie de rondas; para cada ronda, solicita sucesivamente a cada jugador que juegue.
         """
-        roundNumberZeroFill = len(str(roundCount))
         for roundNumber in range(1, roundCount + 1):
             self.board.current_round = roundNumber
+            self.board.clear()
             self.board.initStoredValidActions()
-            print("Ronda #%s: " % str(roundNumber).zfill(roundNumberZeroFill), end="")
             playerCount = len(self.players)
             playerFenceCount = self.totalFenceCount
-            self.board.fences, self.board.pawns = [], []
             for i in range(playerCount):
                 player = self.players[i]
                 player.pawn.place(player.startPosition)
@@ -84,6 +87,9 @@ class Game:
             self.board.draw()
             
             self.current_player_index = random.randrange(playerCount)
+            self.board.setPlayerToMove(self.current_player_index)
+            if self.log.enabled:
+                self.log.emit("roundStart", game = self, roundNumber = roundNumber, roundCount = roundCount, firstPlayer = self.current_player_index)
             finished = False
             turn_number = 0
 
@@ -99,7 +105,7 @@ class Game:
                 # Iniciar medición de tiempo para el jugador
                 start_time = time.perf_counter()
 
-                action = player.play(self.board)
+                action = player.nextAction(self.board)
 
                 # Calcular tiempo transcurrido
                 elapsed_time = time.perf_counter() - start_time
@@ -111,32 +117,39 @@ class Game:
                 stats["avg_time"] = stats["total_time"] / stats["actions"]
 
                 if isinstance(action, PawnMove):
+                    if self.log.enabled:
+                        self.log.emit("pawnMove", player = player, coord = action.toCoord)
                     player.movePawn(action.toCoord)
                     if player.hasWon():
                         finished = True
-                        print("El jugador %s ganó" % player.name)
+                        if self.log.enabled:
+                            self.log.emit("win", player = player)
                         player.score += 1
                 elif isinstance(action, FencePlacing):
+                    if self.log.enabled:
+                        self.log.emit("fencePlacing", player = player, fencePlacing = action)
                     player.placeFence(action.coord, action.direction)
                 elif isinstance(action, Quit):
                     finished = True
-                    print("El jugador %s se rindió" % player.name)
+                    if self.log.enabled:
+                        self.log.emit("quit", player = player)
+                else:
+                    # Sin acción (None o Pass): el turno pasa sin jugar
+                    if self.log.enabled:
+                        self.log.emit("pass", player = player)
 
                 self.current_player_index = (self.current_player_index + 1) % playerCount
+                self.board.setPlayerToMove(self.current_player_index)
                 
                 if INTERFACE:
                     time.sleep(TEMPO_SEC)
         
-        print()
-        print("PUNTUACIONES FINALES:")
         bestPlayer = self.players[0]
         for player in self.players:
-            stats = self.player_stats[player.name]
-            print("- %s: %d victorias | %d acciones | %.2fms promedio" %
-                  (str(player), player.score, stats["actions"], stats["avg_time"] * 1000))
             if player.score > bestPlayer.score:
                 bestPlayer = player
-        print("¡El jugador %s ganó con %d victorias!" % (bestPlayer.name, bestPlayer.score))
+        if self.log.enabled:
+            self.log.emit("finalScores", players = self.players, playerStats = self.player_stats, bestPlayer = bestPlayer)
 
     def end(self):
         """
@@ -0,0 +1,139 @@
+import sys
+
+from src.Settings import *
+
+
+
+class GameLog:
+    """
+    Destino de los eventos de una partida (Game.log).
+
+    Los eventos se emiten con su nombre y sus datos en bruto (jugadores,
+    coordenadas, acciones); cada destino decide si los formatea. Quien emite
+    comprueba antes log.enabled, de modo que con NullLog no se construye ni se
+    formatea nada:
+
+        if self.log.enabled:
+            self.log.emit("pawnMove", player = player, coord = coord)
+
+    EVENTOS:
+    - roundStart(game, roundNumber, roundCount, firstPlayer): peones ya colocados
+    - pawnMove(player, coord)
+    - fencePlacing(player, fencePlacing)
+    - win(player)
+    - quit(player)
+    - pass(player): turno sin acción, el jugador no tenía movimientos
+    - blockingFence(player, coord, direction): solo con DEBUG
+    - playerBlocked(player)
+    - finalScores(players, playerStats, bestPlayer)
+    """
+
+    enabled = True
+
+    def emit(self, event, **fields):
+        pass
+
+    @staticmethod
+    def default():
+        """
+        Consola con interfaz; sin interfaz, ningún destino (partidas silenciosas).
+        """
+        return TextLog() if INTERFACE else NullLog()
+
+
+
+class TeeLog(GameLog):
+    """
+    Reenvía los eventos a varios destinos a la vez.
+    """
+
+    def __init__(self, *logs):
+        self.logs    = [log for log in logs if log.enabled]
+        self.enabled = bool(self.logs)
+
+    def emit(self, event, **fields):
+        for log in self.logs:
+            log.emit(event, **fields)
+
+
+
+class NullLog(GameLog):
+    """
+    Descarta todos los eventos.
+    """
+
+    enabled = False
+
+
+
+class TextLog(GameLog):
+    """
+    Escribe los mensajes de siempre en un flujo de texto (stdout por defecto).
+    """
+
+    def __init__(self, stream = None):
+        self.stream = stream
+
+    def emit(self, event, **fields):
+        (self.stream or sys.stdout).write(TextLog.format(event, fields))
+
+    @staticmethod
+    def format(event, fields):
+        if event == "roundStart":
+            return "Ronda #%s: " % str(fields["roundNumber"]).zfill(len(str(fields["roundCount"])))
+        if event == "pawnMove":
+            return "El jugador %s movió su peón a %s\n" % (fields["player"].name, fields["coord"])
+        if event == "fencePlacing":
+            return "El jugador %s coloca %s\n" % (fields["player"].name, fields["fencePlacing"])
+        if event == "win":
+            return "El jugador %s ganó\n" % fields["player"].name
+        if event == "quit":
+            return "El jugador %s se rindió\n" % fields["player"].name
+        if event == "pass":
+            return "El jugador %s pasa el turno\n" % fields["player"].name
+        if event == "blockingFence":
+            return "⚠️  Muro %s en %s bloquearía completamente a %s\n" % (fields["direction"].name, fields["coord"], fields["player"].name)
+        if event == "playerBlocked":
+            return "¡El jugador %s ya está bloqueado!\n" % fields["player"].name
+        if event == "finalScores":
+            lines = ["", "PUNTUACIONES FINALES:"]
+            for player in fields["players"]:
+                stats = fields["playerStats"][player.name]
+                lines.append("- %s: %d victorias | %d acciones | %.2fms promedio" %
+                    (str(player), player.score, stats["actions"], stats["avg_time"] * 1000))
+            lines.append("¡El jugador %s ganó con %d victorias!" % (fields["bestPlayer"].name, fields["bestPlayer"].score))
+            return "\n".join(lines) + "\n"
+        return "%s %s\n" % (event, fields)
+
+
+
+class BufferedTextLog(TextLog):
+    """
+    Acumula los mensajes en memoria; text() los devuelve juntos.
+    """
+
+    def __init__(self):
+        self.chunks = []
+
+    def emit(self, event, **fields):
+        self.chunks.append(TextLog.format(event, fields))
+
+    def text(self):
+        return "".join(self.chunks)
+
+
+
+class StructuredLog(GameLog):
+    """
+    Guarda cada evento como un registro (nombre, datos) sin formatear, para
+    analizarlo o serializarlo después.
+    """
+
+    def __init__(self):
+        self.records = []
+
+    def emit(self, event, **fields):
+        self.records.append((event, fields))
+
+    def events(self, event):
+        return [fields for (recordEvent, fields) in self.records if recordEvent == event]
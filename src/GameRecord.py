@@ -0,0 +1,290 @@
+from itertools import islice
+
+from src.GridCoordinates     import *
+from src.interface.Fence     import *
+from src.action.PawnMove     import *
+from src.action.FencePlacing import *
+from src.action.Pass         import *
+from src.GameLog             import *
+
+
+
+class GameRecord:
+    """
+    Partida grabada: cabecera y acciones en orden de juego.
+
+    FORMATO BINARIO (un fichero puede contener millones de partidas seguidas):
+
+        fichero  = MAGIC partida*
+        partida  = cols rows númeroJugadores primerJugador jugador* acción* FIN resultado
+        jugador  = casillaInicial murosRestantes longitudNombre nombre(UTF-8)
+        acción   = casilla                        movimiento de peón a esa casilla
+                 | 0x80 + dirección, anclaje      muro (0x80 horizontal, 0x81 vertical)
+                 | 0xFE                           turno sin acción (Pass)
+        FIN      = 0xFF
+        resultado = índice del ganador | 0x10 + índice si se rinde | 0x7F sin terminar
+
+    Las casillas son índices row*cols + col, en un byte si el tablero tiene
+    como mucho 128 casillas y en dos (big-endian) si no; su primer byte nunca
+    tiene el bit alto, lo que las distingue de los marcadores. En un tablero
+    9x9 un movimiento ocupa 1 byte y un muro 2. El jugador de cada acción se
+    deduce del turno y el origen de cada movimiento, de la casilla anterior
+    del peón; por eso también se graban los turnos sin acción.
+
+    Una partida cortada (fichero a medio escribir) se lee con ValueError.
+    """
+
+    MAGIC = b"QGR\x01"
+
+    FENCE      = 0x80
+    PASS       = 0xFE
+    END        = 0xFF
+    QUIT       = 0x10
+    UNFINISHED = 0x7F
+
+    def __init__(self, cols, rows, names, startCoords, remainingFences, firstPlayer, actions = None, result = None):
+        self.cols, self.rows   = cols, rows
+        self.names             = list(names)
+        self.startCoords       = list(startCoords)
+        self.remainingFences   = list(remainingFences)
+        self.firstPlayer       = firstPlayer
+        self.actions           = [] if actions is None else actions
+        self.result            = result
+
+    def playerCount(self):
+        return len(self.names)
+
+    def indexBytes(self):
+        return GameRecord.indexBytesFor(self.cols, self.rows)
+
+    @staticmethod
+    def indexBytesFor(cols, rows):
+        return 1 if cols*rows <= 128 else 2
+
+    def winner(self):
+        """
+        Índice del ganador, o None si alguien se rindió o la partida no terminó.
+        """
+        return self.result if self.result is not None and self.result < GameRecord.QUIT else None
+
+    def playerForPly(self, ply):
+        return (self.firstPlayer + ply) % self.playerCount()
+
+    def encode(self):
+        """
+        Bytes de la partida completa (sin MAGIC).
+        """
+        encoded = bytearray(self.encodeHeader())
+        for action in self.actions:
+            encoded += self.encodeAction(action)
+        encoded += bytes([GameRecord.END, GameRecord.UNFINISHED if self.result is None else self.result])
+        return bytes(encoded)
+
+    def encodeHeader(self):
+        header = bytearray([self.cols, self.rows, self.playerCount(), self.firstPlayer])
+        for name, startCoord, remainingFences in zip(self.names, self.startCoords, self.remainingFences):
+            # Como mucho 255 bytes, sin partir un carácter de varios bytes
+            name = name.encode("utf-8")[:255].decode("utf-8", "ignore").encode("utf-8")
+            header += self.encodeCoord(startCoord) + bytes([remainingFences, len(name)]) + name
+        return bytes(header)
+
+    def encodeCoord(self, coord):
+        i = coord.row*self.cols + coord.col
+        return bytes([i]) if self.indexBytes() == 1 else bytes([i >> 8, i & 0xFF])
+
+    def encodeAction(self, action):
+        if isinstance(action, PawnMove):
+            return self.encodeCoord(action.toCoord)
+        if isinstance(action, Pass):
+            return bytes([GameRecord.PASS])
+        return bytes([GameRecord.FENCE + action.direction.value]) + self.encodeCoord(action.coord)
+
+    def __str__(self):
+        return "%dx%d %s, %d acciones, resultado %s" % (self.cols, self.rows, " vs ".join(self.names), len(self.actions), self.result)
+
+
+
+class GameRecordWriter(GameLog):
+    """
+    Destino de eventos de Game que graba cada ronda en un fichero de partidas
+    a medida que se juega (ver GameRecord). Se combina con otros destinos con
+    TeeLog:
+
+        writer = GameRecordWriter("partidas.qgr")
+        game = Game(players, log = TeeLog(TextLog(), writer))
+        game.start(100)
+        writer.close()
+    """
+
+    def __init__(self, file):
+        if isinstance(file, str):
+            self.stream, self.ownsStream = open(file, "ab"), True
+        else:
+            self.stream, self.ownsStream = file, False
+        if self.stream.tell() == 0:
+            self.stream.write(GameRecord.MAGIC)
+        self.record = None
+        self.recordCount = 0
+
+    def emit(self, event, **fields):
+        if event == "pawnMove":
+            self.stream.write(self.record.encodeCoord(fields["coord"]))
+        elif event == "fencePlacing":
+            self.stream.write(self.record.encodeAction(fields["fencePlacing"]))
+        elif event == "pass":
+            self.stream.write(bytes([GameRecord.PASS]))
+        elif event == "roundStart":
+            self.endRecord(GameRecord.UNFINISHED)
+            game = fields["game"]
+            self.record = GameRecord(
+                game.board.cols, game.board.rows,
+                [player.name for player in game.players],
+                [player.pawn.coord for player in game.players],
+                [player.remainingFences() for player in game.players],
+                fields["firstPlayer"])
+            self.stream.write(self.record.encodeHeader())
+        elif event == "win":
+            self.endRecord(fields["player"].index)
+        elif event == "quit":
+            self.endRecord(GameRecord.QUIT + fields["player"].index)
+
+    def endRecord(self, result):
+        if self.record is not None:
+            self.stream.write(bytes([GameRecord.END, result]))
+            self.record = None
+            self.recordCount += 1
+
+    def close(self):
+        self.endRecord(GameRecord.UNFINISHED)
+        self.stream.flush()
+        if self.ownsStream:
+            self.stream.close()
+
+
+
+class GameRecordReader:
+    """
+    Lee un fichero de partidas por bloques, sin cargarlo entero.
+
+        for record in GameRecordReader("partidas.qgr").games():
+            ...
+        for (gameIndex, playerIndex, action) in GameRecordReader("partidas.qgr").actions():
+            ...
+    """
+
+    CHUNK_SIZE = 1 << 16
+
+    def __init__(self, file):
+        self.file = file
+
+    def chunks(self):
+        stream = open(self.file, "rb") if isinstance(self.file, str) else self.file
+        try:
+            magic = stream.read(len(GameRecord.MAGIC))
+            if magic != GameRecord.MAGIC:
+                raise ValueError("No es un fichero de partidas: %r" % magic)
+            while True:
+                chunk = stream.read(GameRecordReader.CHUNK_SIZE)
+                if not chunk:
+                    return
+                yield chunk
+        finally:
+            if isinstance(self.file, str):
+                stream.close()
+
+    def byteStream(self):
+        for chunk in self.chunks():
+            yield from chunk
+
+    def games(self):
+        """
+        Genera un GameRecord por partida, con sus acciones.
+        """
+        for (gameIndex, playerIndex, item) in self.items():
+            if playerIndex is not None:
+                record.actions.append(item)
+            elif item is not None:
+                record = item
+            else:
+                yield record
+
+    def actions(self):
+        """
+        Genera (índice de partida, índice del jugador, acción) sin guardar las partidas.
+        """
+        for item in self.items():
+            if item[1] is not None:
+                yield item
+
+    def items(self):
+        """
+        Genera (índice de partida, jugador, elemento): (i, None, GameRecord) al
+        leer una cabecera (el GameRecord aún sin acciones), (i, jugador, acción)
+        por cada acción e (i, None, None) al terminar la partida.
+        """
+        data = self.byteStream()
+        nextByte = data.__next__
+        gameIndex = 0
+        for cols in data:
+            # Un StopIteration a mitad de partida no debe escapar del generador (PEP 479)
+            try:
+                rows, playerCount, firstPlayer = nextByte(), nextByte(), nextByte()
+                twoBytes = GameRecord.indexBytesFor(cols, rows) == 2
+                coords = GridCoordinates.grid(cols, rows)
+                fencePlacings, pawnSteps = FencePlacing.table(cols, rows), PawnMove.steps(cols, rows)
+                # Dirección de cada paso simple en PawnMove.steps: izquierda, derecha, arriba, abajo
+                steps = {-1: 0, 1: 1, -cols: 2, cols: 3}
+
+                names, pawns, remainingFences = [], [], []
+                for _ in range(playerCount):
+                    first = nextByte()
+                    pawns.append(first << 8 | nextByte() if twoBytes else first)
+                    remainingFences.append(nextByte())
+                    nameLength = nextByte()
+                    name = bytes(islice(data, nameLength))
+                    if len(name) != nameLength:
+                        raise StopIteration
+                    names.append(name.decode("utf-8"))
+                record = GameRecord(cols, rows, names, [coords[i] for i in pawns], remainingFences, firstPlayer)
+                yield (gameIndex, None, record)
+
+                playerIndex = firstPlayer
+                while True:
+                    marker = nextByte()
+                    if marker == GameRecord.END:
+                        record.result = nextByte()
+                        break
+                    if marker == GameRecord.PASS:
+                        action = Pass()
+                    elif marker & GameRecord.FENCE:
+                        first = nextByte()
+                        action = fencePlacings[2*(first << 8 | nextByte() if twoBytes else first) + marker - GameRecord.FENCE]
+                    else:
+                        i = marker << 8 | nextByte() if twoBytes else marker
+                        fromIndex = pawns[playerIndex]
+                        if i - fromIndex in steps:
+                            action = pawnSteps[4*fromIndex + steps[i - fromIndex]]
+                        else:
+                            action = PawnMove(coords[fromIndex], coords[i], GameRecordReader.jumpedPawn([coords[j] for j in pawns], playerIndex, coords[i]))
+                        pawns[playerIndex] = i
+                    yield (gameIndex, playerIndex, action)
+                    playerIndex = (playerIndex + 1) % playerCount
+            except StopIteration:
+                raise ValueError("Partida #%d cortada: el fichero termina a mitad de partida" % gameIndex) from None
+            yield (gameIndex, None, None)
+            gameIndex += 1
+
+    @staticmethod
+    def jumpedPawn(pawns, playerIndex, toCoord):
+        """
+        Peón sobre el que salta un movimiento de más de una casilla, o None.
+        """
+        fromCoord = pawns[playerIndex]
+        if abs(toCoord.col - fromCoord.col) + abs(toCoord.row - fromCoord.row) <= 1:
+            return None
+        for (otherIndex, coord) in enumerate(pawns):
+            if otherIndex != playerIndex \
+                    and abs(coord.col - fromCoord.col) + abs(coord.row - fromCoord.row) == 1 \
+                    and abs(coord.col - toCoord.col) + abs(coord.row - toCoord.row) == 1:
+                return coord
+        return None
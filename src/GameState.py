@@ -0,0 +1,283 @@
+from src.Settings            import *
+from src.GridCoordinates     import *
+from src.BitBoard            import *
+from src.FenceConnectivity   import *
+from src.Zobrist             import *
+from src.interface.Fence     import *
+from src.action.PawnMove     import *
+from src.action.FencePlacing import *
+from src.action.Pass         import *
+from src.Path                import *
+from src.DistanceMap         import *
+from src.PathCache           import *
+
+
+
+class StoredPawnMoves(dict):
+    """
+    Tabla de movimientos válidos calculada bajo demanda a partir del BitBoard.
+    Ofrece la misma interfaz que Board.storedValidPawnMoves, de modo que Path
+    puede buscar caminos sobre un GameState.
+    """
+
+    def __init__(self, bitboard, ignorePawns):
+        super().__init__()
+        self.bitboard    = bitboard
+        self.ignorePawns = ignorePawns
+
+    def __missing__(self, coord):
+        moves = self.bitboard.validPawnMoves(coord, self.ignorePawns)
+        self[coord] = moves
+        return moves
+
+    def invalidate(self, minCol, minRow, maxCol, maxRow):
+        # Sin consultas desde la última invalidación (p. ej. Replay) no hay nada que borrar
+        if not self:
+            return
+        for col in range(minCol, maxCol + 1):
+            for row in range(minRow, maxRow + 1):
+                self.pop(GridCoordinates(col, row), None)
+
+
+
+class GameState:
+    """
+    Estado de una partida sin interfaz gráfica: solo las reglas.
+
+    Guarda la posición de los peones, los muros colocados, los muros restantes
+    de cada jugador y el jugador al que le toca mover, indexados por el orden
+    de Game.players. No crea Square, no dibuja y no mantiene referencia a Game,
+    por lo que los bots pueden copiarlo y modificarlo con apply()/undo() miles
+    de veces por segundo sin tocar el Board en pantalla.
+    """
+
+    def __init__(self, cols, rows, pawns, goals, remainingFences, playerToMove = 0, fences = ()):
+        self.cols, self.rows = cols, rows
+        self.bitboard        = BitBoard(cols, rows)
+        self.fenceConnectivity = FenceConnectivity(cols, rows)
+        self.pawns           = list(pawns)
+        self.goals           = [list(endPositions) for endPositions in goals]
+        self.goalSets        = [set(endPositions) for endPositions in self.goals]
+        self.remainingFences = list(remainingFences)
+        self.playerToMove    = playerToMove
+        self.fences          = []
+        self.history         = []
+        self.zobrist         = Zobrist.forSize(cols, rows)
+        self.pawnsHash       = self.zobrist.pawnsHash(self.pawns)
+        self.fencesHash      = 0
+        for coord in self.pawns:
+            self.bitboard.movePawn(None, coord)
+        for fencePlacing in fences:
+            self.fences.append(fencePlacing)
+            self.bitboard.placeFence(fencePlacing.coord, fencePlacing.direction)
+            self.fenceConnectivity.placeFence(fencePlacing.coord, fencePlacing.direction)
+            self.fencesHash ^= self.zobrist.fenceKey(fencePlacing.coord, fencePlacing.direction)
+        self.storedValidPawnMoves               = StoredPawnMoves(self.bitboard, False)
+        self.storedValidPawnMovesIgnoringPawns  = StoredPawnMoves(self.bitboard, True)
+        self.storedValidFencePlacings           = None
+        self.storedValidActions                 = None
+        self.distanceMaps                       = [None]*len(self.pawns)
+
+    @staticmethod
+    def fromBoard(board, playerToMove = None):
+        """
+        Copia el estado de reglas de un Board en juego.
+        """
+        players = board.game.players
+        if playerToMove is None:
+            playerToMove = board.game.current_player_index
+        return GameState(
+            board.cols, board.rows,
+            [player.pawn.coord for player in players],
+            [player.endPositions for player in players],
+            [player.remainingFences() for player in players],
+            playerToMove,
+            [FencePlacing(fence.coord, fence.direction) for fence in board.fences])
+
+    @staticmethod
+    def endPositionsFor(cols, rows, playerIndex):
+        """
+        Casillas objetivo del jugador playerIndex, como en Board.endPositions().
+        """
+        if playerIndex == 0:
+            return [GridCoordinates(col, rows - 1) for col in range(cols)]
+        if playerIndex == 1:
+            return [GridCoordinates(col, 0) for col in range(cols)]
+        if playerIndex == 2:
+            return [GridCoordinates(cols - 1, row) for row in range(rows)]
+        return [GridCoordinates(0, row) for row in range(rows)]
+
+    def copy(self):
+        state = GameState.__new__(GameState)
+        state.cols, state.rows = self.cols, self.rows
+        state.bitboard = BitBoard(self.cols, self.rows)
+        state.bitboard.__dict__.update(self.bitboard.__dict__)
+        state.fenceConnectivity = self.fenceConnectivity.copy()
+        state.pawns           = list(self.pawns)
+        state.goals           = self.goals
+        state.goalSets        = self.goalSets
+        state.remainingFences = list(self.remainingFences)
+        state.playerToMove    = self.playerToMove
+        state.fences          = list(self.fences)
+        state.history         = []
+        state.zobrist         = self.zobrist
+        state.pawnsHash       = self.pawnsHash
+        state.fencesHash      = self.fencesHash
+        state.storedValidPawnMoves              = StoredPawnMoves(state.bitboard, False)
+        state.storedValidPawnMovesIgnoringPawns = StoredPawnMoves(state.bitboard, True)
+        state.storedValidPawnMoves.update(self.storedValidPawnMoves)
+        state.storedValidPawnMovesIgnoringPawns.update(self.storedValidPawnMovesIgnoringPawns)
+        state.storedValidFencePlacings = self.storedValidFencePlacings
+        state.storedValidActions       = self.storedValidActions
+        state.distanceMaps             = list(self.distanceMaps)
+        return state
+
+    def positionKey(self):
+        """
+        Clave Zobrist de la posición: peones, muros y jugador al que le toca mover.
+        Coincide con Board.positionKey() de la misma posición.
+        """
+        return self.fencesHash ^ self.pawnsHash ^ self.zobrist.playerToMoveKey(self.playerToMove)
+
+    def playerCount(self):
+        return len(self.pawns)
+
+    def hasWon(self, playerIndex):
+        return self.pawns[playerIndex] in self.goalSets[playerIndex]
+
+    def winner(self):
+        for playerIndex in range(len(self.pawns)):
+            if self.hasWon(playerIndex):
+                return playerIndex
+        return None
+
+    def isTerminal(self):
+        return self.winner() is not None
+
+    def validPawnMoves(self, playerIndex = None):
+        if playerIndex is None:
+            playerIndex = self.playerToMove
+        return self.storedValidPawnMoves[self.pawns[playerIndex]]
+
+    def distanceMap(self, playerIndex):
+        """
+        Mapa de distancias a la meta del jugador, en caché hasta que cambien los muros.
+        """
+        distanceMap = self.distanceMaps[playerIndex]
+        if distanceMap is None or not distanceMap.isValidFor(self.bitboard):
+            cacheKey = PathCache.key(self, "distanceMap", None, self.goals[playerIndex], True)
+            cachedMap = PathCache.shared.get(cacheKey)
+            if cachedMap is not PathCache.MISSING:
+                distanceMap = cachedMap
+            elif distanceMap is None:
+                distanceMap = PathCache.shared.put(cacheKey, DistanceMap(self.bitboard, self.goals[playerIndex]))
+            else:
+                distanceMap = PathCache.shared.put(cacheKey, distanceMap.update(self.bitboard))
+            self.distanceMaps[playerIndex] = distanceMap
+        return distanceMap
+
+    def distanceToGoal(self, playerIndex):
+        return self.distanceMap(playerIndex).distance(self.pawns[playerIndex])
+
+    def isFencePlacingBlocking(self, fencePlacing):
+        """
+        Indica si el muro dejaría a algún jugador sin camino, reparando los mapas
+        de distancias sin modificarlos en lugar de lanzar un BFS por jugador.
+        Los muros que no cierran ningún ciclo de muros se descartan antes.
+        """
+        if not self.fenceConnectivity.canBlock(fencePlacing.coord, fencePlacing.direction):
+            return False
+        for playerIndex in range(len(self.pawns)):
+            distance = self.distanceMap(playerIndex).distanceAfterFence(fencePlacing.coord, fencePlacing.direction, self.pawns[playerIndex])
+            if distance == math.inf:
+                return True
+        return False
+
+    def validFencePlacings(self):
+        """
+        Muros que no se superponen, no se cruzan y no bloquean a ningún jugador,
+        en caché hasta el siguiente apply()/undo().
+        """
+        if self.storedValidFencePlacings is None:
+            validPlacings = []
+            for col in range(self.cols):
+                for row in range(self.rows):
+                    coord = GridCoordinates(col, row)
+                    if col != self.cols - 1 and row != 0 and self.bitboard.isFenceSlotFree(coord, Fence.DIRECTION.HORIZONTAL):
+                        validPlacings.append(self.bitboard.fencePlacing(coord, Fence.DIRECTION.HORIZONTAL))
+                    if col != 0 and row != self.rows - 1 and self.bitboard.isFenceSlotFree(coord, Fence.DIRECTION.VERTICAL):
+                        validPlacings.append(self.bitboard.fencePlacing(coord, Fence.DIRECTION.VERTICAL))
+            self.storedValidFencePlacings = [fencePlacing for fencePlacing in validPlacings if not self.isFencePlacingBlocking(fencePlacing)]
+        return self.storedValidFencePlacings
+
+    def validActions(self):
+        """
+        Acciones válidas del jugador al que le toca mover, en caché hasta el siguiente apply()/undo().
+        """
+        if self.storedValidActions is None:
+            actions = list(self.validPawnMoves())
+            if self.remainingFences[self.playerToMove] > 0:
+                actions.extend(self.validFencePlacings())
+            self.storedValidActions = actions
+        return self.storedValidActions
+
+    def apply(self, action):
+        playerIndex = self.playerToMove
+        if isinstance(action, PawnMove):
+            fromCoord = self.pawns[playerIndex]
+            self.history.append((action, playerIndex, fromCoord, self.storedValidFencePlacings))
+            self.movePawn(playerIndex, fromCoord, action.toCoord)
+            self.storedValidFencePlacings = None
+        elif isinstance(action, FencePlacing):
+            self.history.append((action, playerIndex, None, self.storedValidFencePlacings))
+            self.remainingFences[playerIndex] -= 1
+            self.addFence(action)
+            self.storedValidFencePlacings = None
+        elif isinstance(action, Pass):
+            self.history.append((action, playerIndex, None, self.storedValidFencePlacings))
+        else:
+            raise ValueError("Acción no soportada por GameState: %s" % action)
+        self.playerToMove = (playerIndex + 1) % len(self.pawns)
+        self.storedValidActions = None
+
+    def undo(self):
+        action, playerIndex, fromCoord, storedValidFencePlacings = self.history.pop()
+        if isinstance(action, PawnMove):
+            self.movePawn(playerIndex, self.pawns[playerIndex], fromCoord)
+        elif isinstance(action, FencePlacing):
+            self.fences.pop()
+            self.remainingFences[playerIndex] += 1
+            self.bitboard.removeFence(action.coord, action.direction)
+            self.fenceConnectivity.removeLastFence()
+            self.fencesHash ^= self.zobrist.fenceKey(action.coord, action.direction)
+            self.invalidateAfterFencePlacing(action.coord, action.direction)
+        self.playerToMove = playerIndex
+        self.storedValidFencePlacings = storedValidFencePlacings
+        self.storedValidActions = None
+        return action
+
+    def addFence(self, fencePlacing):
+        """
+        Coloca un muro sin cambiar de turno ni descontarlo de ningún jugador.
+        """
+        self.fences.append(fencePlacing)
+        self.bitboard.placeFence(fencePlacing.coord, fencePlacing.direction)
+        self.fenceConnectivity.placeFence(fencePlacing.coord, fencePlacing.direction)
+        self.fencesHash ^= self.zobrist.fenceKey(fencePlacing.coord, fencePlacing.direction)
+        self.invalidateAfterFencePlacing(fencePlacing.coord, fencePlacing.direction)
+
+    def movePawn(self, playerIndex, fromCoord, toCoord):
+        self.pawns[playerIndex] = toCoord
+        self.bitboard.movePawn(fromCoord, toCoord)
+        self.pawnsHash ^= self.zobrist.pawnKey(playerIndex, fromCoord) ^ self.zobrist.pawnKey(playerIndex, toCoord)
+        # Los saltos dependen de los peones a distancia 2 como máximo
+        for coord in (fromCoord, toCoord):
+            self.storedValidPawnMoves.invalidate(coord.col - 2, coord.row - 2, coord.col + 2, coord.row + 2)
+
+    def invalidateAfterFencePlacing(self, coord, direction):
+        if direction == Fence.DIRECTION.VERTICAL:
+            self.storedValidPawnMoves.invalidate(coord.col - 2, coord.row - 1, coord.col + 1, coord.row + 2)
+            self.storedValidPawnMovesIgnoringPawns.invalidate(coord.col - 1, coord.row, coord.col, coord.row + 1)
+        else:
+            self.storedValidPawnMoves.invalidate(coord.col - 1, coord.row - 2, coord.col + 2, coord.row + 1)
+            self.storedValidPawnMovesIgnoringPawns.invalidate(coord.col, coord.row - 1, coord.col + 1, coord.row)
@@ -1,27 +1,73 @@
 class GridCoordinates:
+    """
+    Coordenadas inmutables e internadas: GridCoordinates(col, row) devuelve
+    siempre la misma instancia para la misma casilla, con el hash calculado
+    una sola vez y las vecinas (left, right, top, bottom) enlazadas la
+    primera vez que se piden. Así las consultas a diccionarios indexados por
+    casilla no crean objetos ni tuplas nuevas.
 
-    def __init__(self, col, row):
-        self.col  = col
-        self.row  = row
+    grid(cols, rows) es la tabla de casillas de un tamaño de tablero, indexada
+    por row*cols + col (el bit de la casilla en BitBoard), con todas las
+    vecinas ya enlazadas.
+    """
+
+    __slots__ = ("col", "row", "hash", "neighbours")
+
+    interned = {}
+    grids    = {}
+
+    def __new__(cls, col, row):
+        coord = GridCoordinates.interned.get((col, row))
+        if coord is None:
+            coord = object.__new__(cls)
+            object.__setattr__(coord, "col", col)
+            object.__setattr__(coord, "row", row)
+            object.__setattr__(coord, "hash", hash((col, row)))
+            object.__setattr__(coord, "neighbours", None)
+            GridCoordinates.interned[(col, row)] = coord
+        return coord
+
+    @staticmethod
+    def grid(cols, rows):
+        grid = GridCoordinates.grids.get((cols, rows))
+        if grid is None:
+            grid = tuple(GridCoordinates(i % cols, i // cols) for i in range(cols*rows))
+            for coord in grid:
+                coord.link()
+            GridCoordinates.grids[(cols, rows)] = grid
+        return grid
+
+    def link(self):
+        col, row = self.col, self.row
+        neighbours = (GridCoordinates(col - 1, row), GridCoordinates(col + 1, row), GridCoordinates(col, row - 1), GridCoordinates(col, row + 1))
+        object.__setattr__(self, "neighbours", neighbours)
+        return neighbours
 
     def left(self):
-        return GridCoordinates(self.col - 1, self.row)
+        return (self.neighbours or self.link())[0]
 
     def right(self):
-        return GridCoordinates(self.col + 1, self.row)
+        return (self.neighbours or self.link())[1]
 
     def top(self):
-        return GridCoordinates(self.col, self.row - 1)
+        return (self.neighbours or self.link())[2]
 
     def bottom(self):
-        return GridCoordinates(self.col, self.row + 1)
+        return (self.neighbours or self.link())[3]
 
     def clone(self):
-        return GridCoordinates(self.col, self.row)
+        return self
+
+    def __setattr__(self, name, value):
+        raise AttributeError("GridCoordinates es inmutable")
+
+    def __reduce__(self):
+        return (GridCoordinates, (self.col, self.row))
 
     def __eq__(self, other):
+        if self is other:
+            return True
         if isinstance(other, self.__class__):
-            #return self.__dict__ == other.__dict__
             return self.col == other.col and self.row == other.row
         return NotImplemented
 
@@ -31,7 +77,7 @@ class GridCoordinates:
         return NotImplemented
 
     def __hash__(self):
-        return hash((self.col, self.row))
+        return self.hash
 
     def __str__(self):
         return "%d,%d" % (self.col, self.row)
@@ -0,0 +1,230 @@
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from src.Settings        import *
+from src.GridCoordinates import *
+from src.interface.Fence import *
+
+
+
+class NumpyDistances:
+    """
+    Campos de distancias de todo el tablero calculados con NumPy (opcional).
+
+    Las aristas transitables (sin muro ni borde) se guardan como cuatro
+    vectores booleanos de V = cols*rows casillas, uno por dirección, derivados
+    de las máscaras blockedTop / blockedLeft del BitBoard. Los peones se ignoran,
+    como en storedValidPawnMovesIgnoringPawns.
+
+    - distanceField(sources): BFS por frentes. Cada paso desplaza el frente
+      una casilla en las cuatro direcciones (desplazamientos de 1 y de cols
+      posiciones enmascarados por los muros), de modo que se hace un paso vectorizado
+      por nivel de distancia en vez de una operación por casilla. Admite
+      varios campos a la vez (un frente por capa).
+    - fenceBatch(fencePlacings) + distancesAt(): las distancias de todos los
+      jugadores con cada muro candidato, en una sola propagación sobre una
+      pila de K tableros (los muros actuales más un candidato cada uno).
+    - allPairs(): distancias entre todos los pares por cuadrados sucesivos en
+      el semianillo (min, +) de la matriz de adyacencia densa, en
+      ceil(log2(V)) pasos como mucho.
+
+    Las casillas inalcanzables valen UNREACHABLE (cols*rows, mayor que
+    cualquier distancia real). Sin NumPy, AVAILABLE es False y quien lo usa
+    debe recurrir a su versión en Python puro.
+    """
+
+    AVAILABLE = np is not None and NUMPY_DISTANCES
+
+    # Filas de la matriz de distancias que se combinan a la vez en allPairs() (memoria O(CHUNK·V²))
+    CHUNK = 32
+
+    def __init__(self, bitboard):
+        cols, rows = bitboard.cols, bitboard.rows
+        self.cols, self.rows = cols, rows
+        self.size = cols*rows
+        self.UNREACHABLE = self.size
+        # Vectores de V casillas (índice row*cols + col); en un lote, K x V
+        blockedTop  = NumpyDistances.bits(bitboard.blockedTop, self.size + cols)
+        blockedLeft = NumpyDistances.bits(bitboard.blockedLeft, self.size + 1)
+        column = np.arange(self.size) % cols
+        self.canLeft  = ~blockedLeft[:-1] & (column != 0)
+        self.canRight = ~blockedLeft[1:] & (column != cols - 1)
+        self.canUp    = ~blockedTop[:-cols]
+        self.canUp[:cols] = False
+        self.canDown  = ~blockedTop[cols:]
+        self.canDown[-cols:] = False
+
+    @staticmethod
+    def bits(mask, length):
+        """
+        Bits 0..length-1 de una máscara entera como vector booleano.
+        """
+        byteCount = (max(length, mask.bit_length()) + 7) // 8
+        data = np.frombuffer(mask.to_bytes(byteCount, "little"), dtype = np.uint8)
+        return np.unpackbits(data, bitorder = "little")[:length].astype(bool)
+
+    def packedEdges(self, layers):
+        """
+        Aristas de cada dirección para layers capas empaquetadas en bits: V x B
+        bytes, con el bit l del byte l // 8 de la casilla i para la capa l. Sin
+        lote, una sola columna de 0x00/0xFF que vale para todas las capas; con
+        lote, la capa l usa las aristas del candidato l % K.
+        """
+        packed = []
+        for edges in (self.canLeft, self.canRight, self.canUp, self.canDown):
+            if edges.ndim == 1:
+                packed.append(np.where(edges, 0xFF, 0).astype(np.uint8)[:, None])
+            else:
+                edges = np.tile(edges, (layers // len(edges), 1))
+                packed.append(np.ascontiguousarray(np.packbits(edges, axis = 0, bitorder = "little").T))
+        return packed
+
+    def expand(self, frontier, edges, reached, step):
+        """
+        Deja en reached las casillas a un paso de frontier (V x B, capas en
+        bits), usando step como memoria auxiliar del mismo tamaño. Las
+        columnas de los bordes no tienen aristas hacia fuera, así que los
+        desplazamientos de 1 no pasan de una fila a la siguiente.
+        """
+        cols = self.cols
+        canLeft, canRight, canUp, canDown = edges
+        np.bitwise_and(frontier[1:], canLeft[1:], out = reached[:-1])
+        reached[-1] = 0
+        np.bitwise_and(frontier[:-1], canRight[:-1], out = step[1:])
+        np.bitwise_or(reached[1:], step[1:], out = reached[1:])
+        np.bitwise_and(frontier[cols:], canUp[cols:], out = step[:-cols])
+        np.bitwise_or(reached[:-cols], step[:-cols], out = reached[:-cols])
+        np.bitwise_and(frontier[:-cols], canDown[:-cols], out = step[cols:])
+        np.bitwise_or(reached[cols:], step[cols:], out = reached[cols:])
+        return reached
+
+    def propagate(self, sources, onLevel):
+        """
+        BFS por frentes desde sources (L x V booleano), con las L capas
+        empaquetadas en bits para que cada paso sean unas pocas operaciones
+        sobre V x ceil(L/8) bytes. Llama a onLevel(distancia, casillas
+        alcanzadas a esa distancia, V x B) por nivel, empezando por 0, hasta
+        que el frente se vacía o onLevel devuelve True.
+        """
+        edges    = self.packedEdges(len(sources))
+        frontier = np.ascontiguousarray(np.packbits(sources, axis = 0, bitorder = "little").T)
+        unvisited = ~frontier
+        reached  = np.empty_like(frontier)
+        step     = np.empty_like(frontier)
+        distance = 0
+        while not onLevel(distance, frontier) and frontier.any():
+            distance += 1
+            frontier, reached = self.expand(frontier, edges, reached, step), frontier
+            np.bitwise_and(frontier, unvisited, out = frontier)
+            np.bitwise_xor(unvisited, frontier, out = unvisited)
+
+    def distanceFields(self, sources):
+        """
+        Distancias a las casillas origen de cada capa de sources (booleano, k x rows x cols).
+        """
+        sources = np.array(sources, dtype = bool).reshape(-1, self.size)
+        distances = np.full(sources.shape, self.UNREACHABLE, dtype = np.int32)
+        def onLevel(distance, level):
+            distances[np.unpackbits(level, axis = 1, count = len(sources), bitorder = "little").T.astype(bool)] = distance
+        self.propagate(sources, onLevel)
+        return distances.reshape(-1, self.rows, self.cols)
+
+    def distanceField(self, coords):
+        """
+        Matriz rows x cols de distancias a la casilla más cercana de coords.
+        """
+        sources = np.zeros((1, self.rows, self.cols), dtype = bool)
+        for coord in coords:
+            sources[0, coord.row, coord.col] = True
+        return self.distanceFields(sources)[0]
+
+    def fenceBatch(self, fencePlacings):
+        """
+        Copia con una capa de aristas por muro candidato: los vectores pasan a
+        ser K x V y la capa k no tiene las aristas que corta fencePlacings[k].
+        """
+        batch = NumpyDistances.__new__(NumpyDistances)
+        batch.__dict__.update(self.__dict__)
+        count, cols = len(fencePlacings), self.cols
+        for name in ("canLeft", "canRight", "canUp", "canDown"):
+            setattr(batch, name, np.repeat(getattr(self, name)[None], count, axis = 0))
+        horizontal = [(k, fencePlacing.coord.row*cols + fencePlacing.coord.col) for k, fencePlacing in enumerate(fencePlacings) if fencePlacing.direction == Fence.DIRECTION.HORIZONTAL]
+        vertical   = [(k, fencePlacing.coord.row*cols + fencePlacing.coord.col) for k, fencePlacing in enumerate(fencePlacings) if fencePlacing.direction == Fence.DIRECTION.VERTICAL]
+        if horizontal:
+            # Un muro horizontal en i corta las aristas superiores de i e i + 1
+            k, i = np.array(horizontal).T
+            batch.canUp[k, i] = batch.canUp[k, i + 1] = False
+            batch.canDown[k, i - cols] = batch.canDown[k, i - cols + 1] = False
+        if vertical:
+            # Uno vertical corta las aristas izquierdas de i e i + cols
+            k, i = np.array(vertical).T
+            batch.canLeft[k, i] = batch.canLeft[k, i + cols] = False
+            batch.canRight[k, i - 1] = batch.canRight[k, i + cols - 1] = False
+        return batch
+
+    def distancesAt(self, goals, coords):
+        """
+        Distancia de cada coords[p] a la casilla más cercana de goals[p] en cada
+        capa del lote: matriz P x K (una sola columna sin fenceBatch()). Deja de
+        propagar en cuanto todas las casillas consultadas se han alcanzado.
+        """
+        players, cols = len(goals), self.cols
+        layers = len(self.canLeft) if self.canLeft.ndim == 2 else 1
+        # Una capa por (jugador, candidato)
+        sources = np.zeros((players, layers, self.size), dtype = bool)
+        for p, endCoords in enumerate(goals):
+            sources[p, :, [coord.row*cols + coord.col for coord in endCoords]] = True
+        layerIndexes = np.arange(players*layers)
+        cells  = np.repeat([coord.row*cols + coord.col for coord in coords], layers)
+        bytes_ = layerIndexes >> 3
+        bits   = (1 << (layerIndexes & 7)).astype(np.uint8)
+        result = np.full(players*layers, self.UNREACHABLE, dtype = np.int32)
+        # Cada capa alcanza su casilla una sola vez: en un único nivel
+        def onLevel(distance, level):
+            newlyReached = (level[cells, bytes_] & bits) != 0
+            result[newlyReached] = distance
+            return (result != self.UNREACHABLE).all()
+        self.propagate(sources.reshape(players*layers, self.size), onLevel)
+        return result.reshape(players, layers)
+
+    def adjacency(self):
+        """
+        Matriz V x V de la longitud de cada arista (0 en la diagonal, UNREACHABLE si no hay arista).
+        """
+        size, cols = self.size, self.cols
+        matrix = np.full((size, size), self.UNREACHABLE, dtype = np.int32)
+        np.fill_diagonal(matrix, 0)
+        right = np.flatnonzero(self.canRight)
+        down  = np.flatnonzero(self.canDown)
+        matrix[right, right + 1] = matrix[right + 1, right] = 1
+        matrix[down, down + cols] = matrix[down + cols, down] = 1
+        return matrix
+
+    def minPlus(self, left, right):
+        """
+        Producto (min, +): result[i, j] = min_k left[i, k] + right[k, j].
+        """
+        result = np.empty_like(left)
+        for start in range(0, len(left), NumpyDistances.CHUNK):
+            block = left[start:start + NumpyDistances.CHUNK, :, None] + right[None, :, :]
+            result[start:start + NumpyDistances.CHUNK] = block.min(axis = 1)
+        return np.minimum(result, self.UNREACHABLE, out = result)
+
+    def allPairs(self):
+        """
+        Matriz V x V de distancias entre casillas (índice row*cols + col).
+        """
+        distances = self.adjacency()
+        while True:
+            squared = self.minPlus(distances, distances)
+            if np.array_equal(squared, distances):
+                return distances
+            distances = squared
+
+    def coords(self):
+        return list(GridCoordinates.grid(self.cols, self.rows))
+
+    def toDistance(self, value):
+        return float('inf') if value >= self.UNREACHABLE else int(value)
@@ -0,0 +1,211 @@
+import mmap
+import os
+import struct
+
+from src.Settings            import *
+from src.GridCoordinates     import *
+from src.Zobrist             import *
+from src.interface.Fence     import *
+from src.action.PawnMove     import *
+from src.action.FencePlacing import *
+from src.action.Pass         import *
+from src.GameRecord          import *
+from src.Replay              import Replay
+from src.benchmark.Profiler  import Profiler
+
+
+
+class OpeningBook:
+    """
+    Libro de aperturas: la mejor acción conocida para las posiciones de
+    comienzo de partida, consultado por los bots antes de aplicar su estrategia
+    (IBot.nextAction).
+
+    Se construye fuera de la partida con OpeningBookBuilder y se guarda en un
+    fichero con una cabecera y una tabla de entradas de 12 bytes ordenadas por
+    clave. El fichero se abre con mmap: no se carga en memoria y cada consulta
+    es una búsqueda binaria sobre la tabla, de unos pocos microsegundos.
+
+        cabecera = MAGIC cols rows jugadas númeroEntradas       (<4sBBHI)
+        entrada  = clave acción partidas                         (<QHH)
+        acción   = casilla | 0x8000 + dirección << 14 + anclaje
+
+    La clave es la clave Zobrist de la posición (Board.positionKey() o
+    GameState.positionKey()) combinada con la de los muros que le quedan a
+    cada jugador (Zobrist.remainingFencesHash), que no depende del intérprete
+    ni del proceso. La acción del libro se comprueba contra el
+    tablero antes de devolverla, de modo que una colisión de claves o un libro
+    de otra configuración nunca producen una acción ilegal.
+    """
+
+    MAGIC  = b"QOB\x02"
+    HEADER = struct.Struct("<4sBBHI")
+    ENTRY  = struct.Struct("<QHH")
+
+    FENCE     = 0x8000
+    DIRECTION = 14
+    INDEX     = (1 << DIRECTION) - 1
+
+    file   = OPENING_BOOK_FILE
+    loaded = {}
+
+    def __init__(self, file, name = "OpeningBook"):
+        with open(file, "rb") as stream:
+            self.data = mmap.mmap(stream.fileno(), 0, access = mmap.ACCESS_READ)
+        magic, self.cols, self.rows, self.plies, self.count = OpeningBook.HEADER.unpack_from(self.data, 0)
+        if magic != OpeningBook.MAGIC:
+            raise ValueError("No es un libro de aperturas: %r" % magic)
+        self.name  = name
+        self.stats = {"probes": 0, "hits": 0, "rejected": 0}
+
+    @staticmethod
+    def default():
+        """
+        Libro de OpeningBook.file (OPENING_BOOK_FILE por defecto), abierto una
+        sola vez por proceso, o None si no hay libro configurado.
+        """
+        file = OpeningBook.file
+        if file is None:
+            return None
+        if file not in OpeningBook.loaded:
+            OpeningBook.loaded[file] = OpeningBook(file) if os.path.exists(file) else None
+        return OpeningBook.loaded[file]
+
+    @staticmethod
+    def key(cols, rows, positionKey, remainingFences):
+        return positionKey ^ Zobrist.forSize(cols, rows).remainingFencesHash(remainingFences)
+
+    @staticmethod
+    def encodeAction(cols, action):
+        if isinstance(action, PawnMove):
+            return action.toCoord.row*cols + action.toCoord.col
+        return OpeningBook.FENCE | action.direction.value << OpeningBook.DIRECTION | action.coord.row*cols + action.coord.col
+
+    def probe(self, key):
+        """
+        (acción codificada, partidas) de la clave, o None si no está en el libro.
+        """
+        self.stats["probes"] += 1
+        data, entry, offset = self.data, OpeningBook.ENTRY, OpeningBook.HEADER.size
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) >> 1
+            entryKey, code, games = entry.unpack_from(data, offset + middle*entry.size)
+            if entryKey < key:
+                low = middle + 1
+            elif entryKey > key:
+                high = middle
+            else:
+                self.stats["hits"] += 1
+                return (code, games)
+        return None
+
+    def action(self, board, player):
+        """
+        Acción del libro para player en board, o None si no hay ninguna legal.
+        """
+        if board.cols != self.cols or board.rows != self.rows:
+            return None
+        entry = self.probe(OpeningBook.key(self.cols, self.rows, board.positionKey(), [other.remainingFences() for other in board.game.players]))
+        if entry is None:
+            return None
+        code = entry[0]
+        index = code & OpeningBook.INDEX
+        coord = GridCoordinates.grid(self.cols, self.rows)[index]
+        if code & OpeningBook.FENCE:
+            direction = Fence.DIRECTION((code >> OpeningBook.DIRECTION) & 1)
+            if player.remainingFences() > 0 and board.isValidFencePlacing(coord, direction):
+                return FencePlacing(coord, direction)
+        else:
+            for validMove in board.storedValidPawnMoves[player.pawn.coord]:
+                if validMove.toCoord == coord:
+                    return validMove
+        self.stats["rejected"] += 1
+        return None
+
+    def publishStats(self):
+        """
+        Copia los contadores en Profiler.stats, junto a las claves habituales del profiler.
+        """
+        s = Profiler.stats[self.name]
+        s.update(self.stats)
+        s["hit_rate"] = self.stats["hits"] / self.stats["probes"] if self.stats["probes"] else 0.0
+        s["entries"] = self.count
+
+    def __len__(self):
+        return self.count
+
+    def close(self):
+        self.data.close()
+
+
+
+class OpeningBookBuilder:
+    """
+    Construye un libro de aperturas a partir de partidas grabadas (GameRecord,
+    por ejemplo de tournament.py --record=) o de acciones sueltas, como las
+    elegidas por una búsqueda.
+
+    Por cada posición de las primeras plies jugadas cuenta, para cada acción,
+    en cuántas partidas se jugó y cuántas ganó quien la jugó. Al escribir el
+    libro se queda con la acción de mejor proporción de victorias (suavizada,
+    (victorias + 1) / (partidas + 2)) entre las jugadas en al menos minGames
+    partidas.
+
+        builder = OpeningBookBuilder(9, 9)
+        builder.addFile("partidas.qgr")
+        builder.write("aperturas.qob")
+    """
+
+    def __init__(self, cols, rows, plies = OPENING_BOOK_PLIES):
+        self.cols, self.rows = cols, rows
+        self.plies = plies
+        self.positions = {}
+
+    def addMove(self, key, action, games = 1, wins = 0):
+        counts = self.positions.setdefault(key, {}).setdefault(OpeningBook.encodeAction(self.cols, action), [0, 0])
+        counts[0] += games
+        counts[1] += wins
+
+    def addGame(self, record):
+        """
+        Añade las primeras plies acciones de una partida. Devuelve False si es de otro tamaño de tablero.
+        """
+        if record.cols != self.cols or record.rows != self.rows:
+            return False
+        winner = record.winner()
+        state = Replay.startState(record)
+        for action in record.actions[:self.plies]:
+            if not isinstance(action, Pass):
+                self.addMove(OpeningBook.key(self.cols, self.rows, state.positionKey(), state.remainingFences), action, 1, int(state.playerToMove == winner))
+            state.apply(action)
+        return True
+
+    def addFile(self, file):
+        """
+        Añade todas las partidas de un fichero de partidas y devuelve cuántas se usaron.
+        """
+        return sum(self.addGame(record) for record in GameRecordReader(file).games())
+
+    def entries(self, minGames = OPENING_BOOK_MIN_GAMES):
+        """
+        (clave, acción codificada, partidas) de cada posición con alguna acción jugada minGames veces, por clave.
+        """
+        entries = []
+        for key in sorted(self.positions):
+            candidates = [(code, games, wins) for code, (games, wins) in self.positions[key].items() if games >= minGames]
+            if candidates:
+                code, games, wins = max(candidates, key = lambda candidate: ((candidate[2] + 1)/(candidate[1] + 2), candidate[1]))
+                entries.append((key, code, min(games, 0xFFFF)))
+        return entries
+
+    def write(self, file, minGames = OPENING_BOOK_MIN_GAMES):
+        """
+        Escribe el libro y devuelve su número de entradas.
+        """
+        entries = self.entries(minGames)
+        with open(file, "wb") as stream:
+            stream.write(OpeningBook.HEADER.pack(OpeningBook.MAGIC, self.cols, self.rows, self.plies, len(entries)))
+            for entry in entries:
+                stream.write(OpeningBook.ENTRY.pack(*entry))
+        return len(entries)
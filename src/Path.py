@@ -1,7 +1,10 @@
+import heapq
 import math
+from collections import deque
 
 from src.Settings        import *
 from src.action.PawnMove import *
+from src.PathCache       import *
 
 
 
@@ -35,35 +38,45 @@ class Path:
                 minManhattanDistance = manhattanDistance
         return minManhattanDistance
 
+    def Reconstruct(previousMoves, move):
+        pathMoves = [move]
+        while move.fromCoord is not None:
+            move = previousMoves[move.fromCoord]
+            pathMoves.append(move)
+        pathMoves.reverse()
+        return Path(pathMoves[1:])
+
     def BreadthFirstSearch(board, startCoord, endCoords, ignorePawns = False):
         global TRACE
         TRACE["Path.BreadthFirstSearch"] += 1
+        cacheKey = PathCache.key(board, "BFS", startCoord, endCoords, ignorePawns)
+        path = PathCache.shared.get(cacheKey)
+        if path is not PathCache.MISSING:
+            return path
+        endCoords = set(endCoords)
         root = PawnMove(None, startCoord)
 
         previousMoves = {startCoord: root}
-        nextMoves = [root]
+        nextMoves = deque([root])
+        expanded = 0
         validPawnMoves = board.storedValidPawnMovesIgnoringPawns if ignorePawns else board.storedValidPawnMoves
         while nextMoves:
-            move = nextMoves.pop(0)
-            for endCoord in endCoords:
-                if move.toCoord == endCoord:
-                    pathMoves = [move]
-                    while move.fromCoord is not None:
-                        move = previousMoves[move.fromCoord]
-                        pathMoves.append(move)
-                    pathMoves.reverse()
-                    return Path(pathMoves[1:])
-            validMoves = validPawnMoves[move.toCoord]
-            sorted(validMoves, key=lambda validMove: Path.ManhattanDistanceMulti(validMove.toCoord, endCoords))
-            for validMove in validMoves:
+            move = nextMoves.popleft()
+            if move.toCoord in endCoords:
+                TRACE["Path.BreadthFirstSearch.expanded"] += expanded
+                return PathCache.shared.put(cacheKey, Path.Reconstruct(previousMoves, move))
+            expanded += 1
+            for validMove in validPawnMoves[move.toCoord]:
                 if validMove.toCoord not in previousMoves:
                     previousMoves[validMove.toCoord] = validMove
                     nextMoves.append(validMove)
-        return None
+        TRACE["Path.BreadthFirstSearch.expanded"] += expanded
+        return PathCache.shared.put(cacheKey, None)
 
     def DepthFirstSearch(board, startCoord, endCoords, ignorePawns = False):
         global TRACE
         TRACE["Path.DepthFirstSearch"] += 1
+        endCoords = set(endCoords)
         root = PawnMove(None, startCoord)
 
         previousMoves = {startCoord: root}
@@ -71,51 +84,134 @@ class Path:
         validPawnMoves = board.storedValidPawnMovesIgnoringPawns if ignorePawns else board.storedValidPawnMoves
         while nextMoves:
             move = nextMoves.pop()
-            for endCoord in endCoords:
-                if move.toCoord == endCoord:
-                    pathMoves = [move]
-                    while move.fromCoord is not None:
-                        move = previousMoves[move.fromCoord]
-                        pathMoves.append(move)
-                    pathMoves.reverse()
-                    return Path(pathMoves[1:])
-            validMoves = validPawnMoves[move.toCoord]
-            sorted(validMoves, key=lambda validMove: Path.ManhattanDistanceMulti(validMove.toCoord, endCoords))
-            for validMove in validMoves:
+            if move.toCoord in endCoords:
+                return Path.Reconstruct(previousMoves, move)
+            for validMove in validPawnMoves[move.toCoord]:
                 if validMove.toCoord not in previousMoves:
                     previousMoves[validMove.toCoord] = validMove
                     nextMoves.append(validMove)
         return None
 
-    def Dijkstra(board, startCoord, endCoords, moveScore = lambda move, step: 1, ignorePawns = False):
+    def Dijkstra(board, startCoord, endCoords, moveScore = None, ignorePawns = False):
+        """
+        Camino de menor coste según moveScore(move, step); por defecto, coste 1 por movimiento.
+        Solo los caminos con el coste por defecto se guardan en PathCache.
+        """
         global TRACE
         TRACE["Path.Dijkstra"] += 1
+        cacheKey = None
+        if moveScore is None:
+            moveScore = lambda move, step: 1
+            cacheKey = PathCache.key(board, "Dijkstra", startCoord, endCoords, ignorePawns)
+            path = PathCache.shared.get(cacheKey)
+            if path is not PathCache.MISSING:
+                return path
+        endCoords = set(endCoords)
         root = PawnMove(None, startCoord)
 
-        previousMoves = {startCoord: (0, root)} 
-        nextMoves = [(0, 0, root)] 
+        # Cola de prioridad con borrado perezoso: las entradas obsoletas se descartan al salir
+        bestScores    = {startCoord: 0}
+        previousMoves = {startCoord: root}
+        pushCount = 0
+        nextMoves = [(0, pushCount, 0, root)]
         validPawnMoves = board.storedValidPawnMovesIgnoringPawns if ignorePawns else board.storedValidPawnMoves
         while nextMoves:
-            sorted(nextMoves, key=lambda nextMove: nextMove[1])
-            (step, score, move) = nextMoves.pop(0) 
-            for endCoord in endCoords:
-                if move.toCoord == endCoord:
-                    pathMoves = [move]
-                    while move.fromCoord is not None:
-                        move = previousMoves[move.fromCoord][1]
-                        pathMoves.append(move)
-                    pathMoves.reverse()
-                    return Path(pathMoves[1:])
-            validMoves = validPawnMoves[move.toCoord]
-            sorted(validMoves, key=lambda validMove: Path.ManhattanDistanceMulti(validMove.toCoord, endCoords))
-            for validMove in validMoves:
+            (score, _, step, move) = heapq.heappop(nextMoves)
+            if score > bestScores[move.toCoord]:
+                continue
+            if move.toCoord in endCoords:
+                path = Path.Reconstruct(previousMoves, move)
+                return path if cacheKey is None else PathCache.shared.put(cacheKey, path)
+            for validMove in validPawnMoves[move.toCoord]:
                 validMoveScore = score + moveScore(validMove, step + 1)
-                if validMove.toCoord not in previousMoves:
-                    previousMoves[validMove.toCoord] = (validMoveScore, validMove)
-                    nextMoves.append((step + 1, validMoveScore, validMove))
-                if validMoveScore < previousMoves[validMove.toCoord][0]:
-                    previousMoves[validMove.toCoord] = (validMoveScore, validMove)
+                if validMoveScore < bestScores.get(validMove.toCoord, math.inf):
+                    bestScores[validMove.toCoord] = validMoveScore
+                    previousMoves[validMove.toCoord] = validMove
+                    pushCount += 1
+                    heapq.heappush(nextMoves, (validMoveScore, pushCount, step + 1, validMove))
+        return None if cacheKey is None else PathCache.shared.put(cacheKey, None)
+
+    def GoalLine(endCoords):
+        """
+        Devuelve ("row", r) o ("col", c) si todas las casillas objetivo están
+        en la misma fila o columna (siempre el caso en Quoridor), o None.
+        """
+        endCoords = list(endCoords)
+        if len(endCoords) > 1:
+            if all(endCoord.row == endCoords[0].row for endCoord in endCoords):
+                return ("row", endCoords[0].row)
+            if all(endCoord.col == endCoords[0].col for endCoord in endCoords):
+                return ("col", endCoords[0].col)
         return None
 
-    def AStar():
-        pass
+    def AStar(board, startCoord, endCoords, ignorePawns = False):
+        """
+        A* con la distancia a la línea objetivo como heurística, O(1) por nodo.
+
+        Sin peones cada movimiento cambia la fila (o la columna) en 1 como
+        máximo, así que |Δ| es admisible. Con peones un salto recto avanza 2,
+        pero cada salto necesita un peón distinto delante, por lo que basta con
+        restar el número de peones. Como un salto puede reducir la heurística
+        en 2, no es consistente: un nodo se reabre si se alcanza con menor coste.
+        """
+        global TRACE
+        TRACE["Path.AStar"] += 1
+        cacheKey = PathCache.key(board, "AStar", startCoord, endCoords, ignorePawns)
+        path = PathCache.shared.get(cacheKey)
+        if path is not PathCache.MISSING:
+            return path
+        goalLine = Path.GoalLine(endCoords)
+        endCoords = set(endCoords)
+        jumps = 0 if ignorePawns else bin(board.bitboard.pawns).count("1")
+        if goalLine is None:
+            heuristic = lambda coord: max(0, Path.ManhattanDistanceMulti(coord, endCoords) - jumps)
+        elif goalLine[0] == "row":
+            heuristic = lambda coord: max(0, abs(goalLine[1] - coord.row) - jumps)
+        else:
+            heuristic = lambda coord: max(0, abs(goalLine[1] - coord.col) - jumps)
+        root = PawnMove(None, startCoord)
+
+        bestScores    = {startCoord: 0}
+        previousMoves = {startCoord: root}
+        pushCount = 0
+        expanded = 0
+        # A igual f se prefiere el nodo más profundo (mayor g)
+        nextMoves = [(heuristic(startCoord), 0, pushCount, root)]
+        validPawnMoves = board.storedValidPawnMovesIgnoringPawns if ignorePawns else board.storedValidPawnMoves
+        while nextMoves:
+            (_, negativeScore, _, move) = heapq.heappop(nextMoves)
+            score = -negativeScore
+            if score > bestScores[move.toCoord]:
+                continue
+            if move.toCoord in endCoords:
+                TRACE["Path.AStar.expanded"] += expanded
+                return PathCache.shared.put(cacheKey, Path.Reconstruct(previousMoves, move))
+            expanded += 1
+            for validMove in validPawnMoves[move.toCoord]:
+                validMoveScore = score + 1
+                if validMoveScore < bestScores.get(validMove.toCoord, math.inf):
+                    bestScores[validMove.toCoord] = validMoveScore
+                    previousMoves[validMove.toCoord] = validMove
+                    pushCount += 1
+                    heapq.heappush(nextMoves, (validMoveScore + heuristic(validMove.toCoord), -validMoveScore, pushCount, validMove))
+        TRACE["Path.AStar.expanded"] += expanded
+        return PathCache.shared.put(cacheKey, None)
+
+    def search(board, startCoord, endCoords, ignorePawns = False, method = None):
+        """
+        Camino más corto con el algoritmo indicado: "BFS" o "AStar".
+        Por defecto Path.defaultMethod (Settings.PATHFINDING_METHOD).
+        """
+        if method is None:
+            method = Path.defaultMethod
+        if method == "BFS":
+            return Path.BreadthFirstSearch(board, startCoord, endCoords, ignorePawns)
+        if method == "AStar":
+            return Path.AStar(board, startCoord, endCoords, ignorePawns)
+        raise ValueError("Algoritmo de búsqueda de caminos desconocido: %s" % method)
+
+
+
+Path.METHODS       = ("BFS", "AStar")
+Path.defaultMethod = PATHFINDING_METHOD
+
@@ -0,0 +1,71 @@
+from collections import OrderedDict
+
+from src.Settings import *
+
+
+
+class PathCache:
+    """
+    Caché LRU de caminos y distancias, de capacidad acotada.
+
+    Las claves incluyen la clave Zobrist de la posición (solo los muros si se
+    ignoran los peones), el tamaño del tablero, el algoritmo, la casilla de
+    partida, las casillas objetivo y si se ignoran los peones. Como las
+    claves identifican la posición, no hace falta invalidar nada al mover:
+    las entradas de posiciones pasadas simplemente dejan de consultarse y
+    acaban expulsadas por las más recientes.
+
+    Aciertos, fallos y expulsiones se cuentan en TRACE["PathCache.*"].
+    """
+
+    MISSING = object()
+
+    def __init__(self, capacity = PATH_CACHE_CAPACITY):
+        self.capacity = capacity
+        self.entries  = OrderedDict()
+
+    @staticmethod
+    def key(board, method, startCoord, endCoords, ignorePawns, positionHash = None):
+        """
+        Clave de una búsqueda en board, o en la posición positionHash si se indica
+        (por ejemplo, la de board con un muro hipotético más).
+        """
+        if positionHash is None:
+            positionHash = board.fencesHash if ignorePawns else board.fencesHash ^ board.pawnsHash
+        return (positionHash, board.cols, board.rows, method, startCoord, tuple(endCoords), ignorePawns)
+
+    def get(self, key):
+        """
+        Valor guardado para key (que puede ser None) o PathCache.MISSING.
+        """
+        global TRACE
+        value = self.entries.get(key, PathCache.MISSING)
+        if value is PathCache.MISSING:
+            TRACE["PathCache.misses"] += 1
+        else:
+            TRACE["PathCache.hits"] += 1
+            self.entries.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        """
+        Guarda value y lo devuelve, expulsando la entrada usada hace más tiempo si se supera la capacidad.
+        """
+        global TRACE
+        if self.capacity > 0:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            if len(self.entries) > self.capacity:
+                self.entries.popitem(last = False)
+                TRACE["PathCache.evictions"] += 1
+        return value
+
+    def clear(self):
+        self.entries.clear()
+
+    def __len__(self):
+        return len(self.entries)
+
+
+
+PathCache.shared = PathCache()
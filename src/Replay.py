@@ -0,0 +1,141 @@
+from src.Settings            import *
+from src.GameState           import *
+from src.GameRecord          import *
+
+
+
+class Replay:
+    """
+    Reconstruye las posiciones de una partida grabada sin volver a jugarla.
+
+    Las acciones del GameRecord se aplican directamente a un GameState: no se
+    dibuja nada ni se consulta a ningún jugador. Con trusted=True (partidas
+    grabadas por Game) no se comprueba la legalidad de las acciones; con
+    trusted=False se comprueba cada una al construir el Replay y se lanza
+    ValueError en la primera ilegal.
+
+    Al construirlo se recorre la partida una vez guardando una copia del estado
+    cada snapshotInterval jugadas, de modo que seek(ply) parte de la copia
+    anterior y aplica como mucho snapshotInterval - 1 acciones.
+
+    USO:
+        replay = Replay.fromFile("partidas.qgr", gameIndex = 3)
+        state = replay.seek(20)   # posición tras 20 jugadas
+        state.distanceToGoal(0)
+    """
+
+    def __init__(self, record, trusted = True, snapshotInterval = REPLAY_SNAPSHOT_INTERVAL):
+        self.record           = record
+        self.trusted          = trusted
+        self.snapshotInterval = max(1, snapshotInterval)
+        self.snapshots        = []
+        state = self.initialState()
+        for ply, action in enumerate(record.actions):
+            if ply % self.snapshotInterval == 0:
+                self.snapshots.append(state.copy())
+            if not trusted:
+                Replay.checkAction(state, action, ply)
+            state.apply(action)
+        if len(record.actions) % self.snapshotInterval == 0:
+            self.snapshots.append(state.copy())
+        self.state = self.snapshots[0].copy()
+        self.ply   = 0
+
+    @staticmethod
+    def fromFile(file, gameIndex = 0, trusted = True, snapshotInterval = REPLAY_SNAPSHOT_INTERVAL):
+        """
+        Replay de la partida gameIndex de un fichero de partidas, leyendo solo hasta ella.
+        """
+        gameCount = 0
+        for record in GameRecordReader(file).games():
+            if gameCount == gameIndex:
+                return Replay(record, trusted, snapshotInterval)
+            gameCount += 1
+        raise IndexError("El fichero solo tiene %d partidas" % gameCount)
+
+    def initialState(self):
+        return Replay.startState(self.record)
+
+    @staticmethod
+    def startState(record):
+        """
+        GameState de la posición inicial de la partida.
+        """
+        return GameState(
+            record.cols, record.rows,
+            record.startCoords,
+            [GameState.endPositionsFor(record.cols, record.rows, playerIndex) for playerIndex in range(record.playerCount())],
+            record.remainingFences,
+            record.firstPlayer)
+
+    @staticmethod
+    def checkAction(state, action, ply):
+        """
+        Lanza ValueError si action no es legal para el jugador al que le toca en state.
+        """
+        if isinstance(action, PawnMove):
+            if action.fromCoord is not None and action.fromCoord != state.pawns[state.playerToMove]:
+                raise ValueError("Jugada %d: el peón del jugador %d no está en %s" % (ply, state.playerToMove, action.fromCoord))
+            if all(validMove.toCoord != action.toCoord for validMove in state.validPawnMoves()):
+                raise ValueError("Jugada %d: movimiento ilegal %s" % (ply, action))
+            return
+        if isinstance(action, Pass):
+            if state.validActions():
+                raise ValueError("Jugada %d: el jugador %d pasa teniendo acciones válidas" % (ply, state.playerToMove))
+            return
+        coord, direction = action.coord, action.direction
+        if direction == Fence.DIRECTION.HORIZONTAL:
+            inBoard = 0 <= coord.col < state.cols - 1 and 0 < coord.row < state.rows
+        else:
+            inBoard = 0 < coord.col < state.cols and 0 <= coord.row < state.rows - 1
+        if state.remainingFences[state.playerToMove] < 1:
+            raise ValueError("Jugada %d: el jugador %d no tiene muros" % (ply, state.playerToMove))
+        if not inBoard or not state.bitboard.isFenceSlotFree(coord, direction) or state.isFencePlacingBlocking(action):
+            raise ValueError("Jugada %d: muro ilegal %s" % (ply, action))
+
+    def __len__(self):
+        return len(self.record.actions)
+
+    def seek(self, ply):
+        """
+        Estado tras las ply primeras jugadas. Es el estado interno del Replay:
+        para modificarlo, hacer antes una copia con copy().
+        """
+        if not 0 <= ply <= len(self):
+            raise IndexError("Jugada %d fuera de la partida (0..%d)" % (ply, len(self)))
+        snapshotIndex = ply // self.snapshotInterval
+        if ply < self.ply or snapshotIndex > self.ply // self.snapshotInterval:
+            self.state = self.snapshots[snapshotIndex].copy()
+            self.ply   = snapshotIndex*self.snapshotInterval
+        actions = self.record.actions
+        while self.ply < ply:
+            self.state.apply(actions[self.ply])
+            self.ply += 1
+        return self.state
+
+    def positions(self):
+        """
+        Genera (jugada, estado) desde la posición inicial hasta la final.
+        """
+        for ply in range(len(self) + 1):
+            yield (ply, self.seek(ply))
+
+    def toText(self, state = None):
+        """
+        Tablero en texto, como Board.drawOnConsole(), con la inicial de cada jugador.
+        """
+        if state is None:
+            state = self.state
+        cols, rows, bitboard = state.cols, state.rows, state.bitboard
+        initials = {coord: name[:1] for coord, name in zip(state.pawns, self.record.names)}
+        lines = ["." + "-+"*(cols - 1) + "-."]
+        for row in range(rows):
+            if row > 0:
+                lines.append("+" + "".join("%s+" % ("-" if bitboard.isTopBlocked(GridCoordinates(col, row)) else " ") for col in range(cols)))
+            line = ""
+            for col in range(cols):
+                coord = GridCoordinates(col, row)
+                line += ("|" if col == 0 or bitboard.isLeftBlocked(coord) else " ") + initials.get(coord, " ")
+            lines.append(line + "|")
+        lines.append("'" + "-+"*(cols - 1) + "-'")
+        return "\n".join(lines)
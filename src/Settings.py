@@ -9,16 +9,50 @@
 DEBUG     = True  # Display additionnal logs on console
 INTERFACE = True  # Display window if true
 TEMPO_SEC = 0.00  # Sleep time between each player, in seconds (default: 0)
+PATHFINDING_METHOD = "BFS"  # Shortest path algorithm used by Path.search: "BFS" or "AStar"
+PATH_CACHE_CAPACITY = 4096  # Entries kept by the shared LRU path cache (0 disables it)
+SEARCH_DEADLINE_MS = 200  # Time budget per move of SearchBot, in milliseconds
+SEARCH_DEADLINE_MARGIN_MS = 20  # Part of SearchBot's budget kept to unwind the search and return, in milliseconds
+SEARCH_MAX_FENCES = 8  # Fence placings tried per node by SearchBot, by decreasing impact
+TRANSPOSITION_TABLE_MB = 16  # Memory cap of each SearchBot transposition table, in megabytes
+MCTS_TIME_MS = 500  # Time budget per move of MCTSBot, in milliseconds (None: iterations only)
+MCTS_DEADLINE_MARGIN_MS = 20  # Part of MCTSBot's time budget kept to collect the worker results and return, in milliseconds
+MCTS_ITERATIONS = None  # Iteration budget per move of MCTSBot (None: time only)
+MCTS_WORKERS = 1  # Processes searching independent MCTSBot trees (root parallelism)
+FENCE_EVALUATION_WORKERS = 1  # Processes evaluating fence impacts for BuilderBot (1: serial)
+FENCE_EVALUATION_MIN_PARALLEL = 64  # Fewer candidate fence placings than this are evaluated serially
+REPLAY_SNAPSHOT_INTERVAL = 16  # Plies between the GameState snapshots kept by Replay (seek cost)
+OPENING_BOOK_FILE = None  # Opening book probed by every bot before its strategy (None: no book)
+OPENING_BOOK_PLIES = 12  # Plies from the start of each game added to an opening book
+OPENING_BOOK_MIN_GAMES = 2  # Games an action must appear in to be kept in the opening book
+ENDGAME_TABLEBASE = True  # Solve fenceless two-player endgames exactly (GreedyStrategy.greedyMove)
+ENDGAME_TABLEBASE_CACHE = 4  # Solved fence layouts kept by EndgameTablebase
+NUMPY_DISTANCES = True  # Use NumPy (if installed) for DynamicProgramming.bellmanFord/floydWarshall
 
 TRACE = {
     "Path.BreadthFirstSearch": 0,
+    "Path.BreadthFirstSearch.expanded": 0,
+    "Path.DepthFirstSearch": 0,
     "Path.Dijkstra": 0,
+    "Path.AStar": 0,
+    "Path.AStar.expanded": 0,
+    "DistanceMap.compute": 0,
+    "DistanceMap.repair": 0,
+    "PathCache.hits": 0,
+    "PathCache.misses": 0,
+    "PathCache.evictions": 0,
+    "EndgameTablebase.solve": 0,
     "Board.validFencePlacings": 0,
     "Board.isValidFencePlacing": 0,
     "Board.validPawnMoves": 0,
     "Board.isValidPawnMove": 0,
     "Board.isFencePlacingBlocking": 0,
     "Board.getFencePlacingImpactOnPaths": 0,
+    "Board.getFencePlacingImpactOnPaths.skipped": 0,
+    "Board.evaluateFencesBatch": 0,
     "Board.updateStoredValidActionsAfterPawnMove": 0,
-    "Board.updateStoredValidActionsAfterFencePlacing": 0
+    "Board.updateStoredValidActionsAfterFencePlacing": 0,
+    "Board.makePawnMove": 0,
+    "Board.makeFencePlacing": 0,
+    "Board.unmake": 0
 }
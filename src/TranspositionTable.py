@@ -0,0 +1,103 @@
+from collections import namedtuple
+
+from src.Settings import *
+from src.benchmark.Profiler import Profiler
+
+
+
+TranspositionEntry = namedtuple("TranspositionEntry", ["key", "depth", "bound", "score", "bestMove", "age"])
+
+
+
+class TranspositionTable:
+    """
+    Tabla de transposición de tamaño fijo para búsquedas en árbol.
+
+    Guarda, por clave de posición, la profundidad buscada, el tipo de cota, la
+    puntuación y la mejor acción encontrada. Una misma posición se alcanza por
+    muchos órdenes de jugadas (sobre todo moviendo peones adelante y atrás), y
+    así solo se busca una vez por profundidad.
+
+    Cada clave tiene una única casilla, key % size. Al guardar se sustituye la
+    entrada existente si es de la misma posición, de una búsqueda anterior
+    (edad distinta) o de una profundidad menor o igual; si no, se conserva.
+
+    El número de casillas sale del límite de memoria en MB, estimando
+    ENTRY_BYTES por entrada. Consultas, aciertos, colisiones (casilla ocupada
+    por otra posición) y sustituciones se publican en Profiler.stats[name].
+    """
+
+    EXACT = 0  # score es el valor exacto
+    LOWER = 1  # score es una cota inferior (hubo poda beta)
+    UPPER = 2  # score es una cota superior (ninguna acción superó alfa)
+
+    ENTRY_BYTES = 200
+
+    def __init__(self, megabytes = TRANSPOSITION_TABLE_MB, name = "TranspositionTable"):
+        self.size    = max(1, int(megabytes*1024*1024) // TranspositionTable.ENTRY_BYTES)
+        self.entries = [None]*self.size
+        self.used    = 0  # Casillas ocupadas, para no recorrer la tabla al publicar
+        self.age     = 0
+        self.name    = name
+        self.stats   = {
+            "probes": 0,
+            "hits": 0,
+            "collisions": 0,
+            "stores": 0,
+            "replacements": 0,
+            "rejected": 0
+        }
+
+    def newSearch(self):
+        """
+        Empieza una búsqueda nueva: sus entradas podrán sustituir a las anteriores.
+        """
+        self.age += 1
+
+    def probe(self, key):
+        """
+        Entrada guardada para key, o None.
+        """
+        self.stats["probes"] += 1
+        entry = self.entries[key % self.size]
+        if entry is None:
+            return None
+        if entry.key != key:
+            self.stats["collisions"] += 1
+            return None
+        self.stats["hits"] += 1
+        return entry
+
+    def store(self, key, depth, bound, score, bestMove):
+        slot = key % self.size
+        entry = self.entries[slot]
+        if entry is not None and entry.key != key and entry.age == self.age and entry.depth > depth:
+            self.stats["rejected"] += 1
+            return
+        if entry is None:
+            self.used += 1
+        elif entry.key != key:
+            self.stats["replacements"] += 1
+        self.stats["stores"] += 1
+        self.entries[slot] = TranspositionEntry(key, depth, bound, score, bestMove, self.age)
+
+    def clear(self):
+        self.entries = [None]*self.size
+        self.used = 0
+        self.age = 0
+
+    def hitRate(self):
+        return self.stats["hits"] / self.stats["probes"] if self.stats["probes"] else 0.0
+
+    def publishStats(self):
+        """
+        Copia los contadores en Profiler.stats, junto a las claves habituales del profiler.
+        """
+        s = Profiler.stats[self.name]
+        s.update(self.stats)
+        s["hit_rate"] = self.hitRate()
+        s["size"] = self.size
+        s["used"] = self.used
+
+    def __len__(self):
+        return self.size
@@ -0,0 +1,86 @@
+import random
+
+from src.interface.Fence import *
+
+
+
+class Zobrist:
+    """
+    Claves Zobrist de 64 bits para identificar posiciones en O(1).
+
+    Cada elemento de la posición tiene un número aleatorio fijo: el peón de cada
+    jugador en cada casilla, cada anclaje de muro en cada dirección y el jugador
+    al que le toca mover. Aparte, cada número de muros restantes de cada
+    jugador tiene también el suyo (remainingFencesHash), para las claves que
+    se guardan en fichero. La clave de una posición es el XOR de los elementos
+    presentes, así que se actualiza con un XOR al mover un peón, colocar o
+    retirar un muro o cambiar de turno, y se restaura igual al deshacer.
+
+    Las tablas son deterministas para cada tamaño de tablero (misma semilla),
+    de modo que las claves sirven entre partidas y procesos.
+    """
+
+    MAX_PLAYERS = 4
+    MAX_FENCES  = 255  # Muros por jugador: caben en un byte, como en GameRecord
+
+    tables = {}
+
+    def __init__(self, cols, rows):
+        self.cols, self.rows = cols, rows
+        rng = random.Random("zobrist-%dx%d" % (cols, rows))
+        squareCount = cols*rows
+        self.pawnKeys  = [[rng.getrandbits(64) for _ in range(squareCount)] for _ in range(Zobrist.MAX_PLAYERS)]
+        self.fenceKeys = {
+            Fence.DIRECTION.HORIZONTAL: [rng.getrandbits(64) for _ in range(squareCount)],
+            Fence.DIRECTION.VERTICAL:   [rng.getrandbits(64) for _ in range(squareCount)]
+        }
+        self.playerToMoveKeys = [rng.getrandbits(64) for _ in range(Zobrist.MAX_PLAYERS)]
+        self.fenceCountKeys   = [[rng.getrandbits(64) for _ in range(Zobrist.MAX_FENCES + 1)] for _ in range(Zobrist.MAX_PLAYERS)]
+
+    @staticmethod
+    def forSize(cols, rows):
+        """
+        Tablas compartidas para un tamaño de tablero.
+        """
+        zobrist = Zobrist.tables.get((cols, rows))
+        if zobrist is None:
+            zobrist = Zobrist(cols, rows)
+            Zobrist.tables[(cols, rows)] = zobrist
+        return zobrist
+
+    def pawnKey(self, playerIndex, coord):
+        return self.pawnKeys[playerIndex][coord.row*self.cols + coord.col]
+
+    def fenceKey(self, coord, direction):
+        return self.fenceKeys[direction][coord.row*self.cols + coord.col]
+
+    def playerToMoveKey(self, playerIndex):
+        return 0 if playerIndex is None else self.playerToMoveKeys[playerIndex]
+
+    def pawnsHash(self, pawnCoords):
+        """
+        Clave de los peones, a partir de sus casillas por índice de jugador (None si no está en el tablero).
+        """
+        key = 0
+        for playerIndex, coord in enumerate(pawnCoords):
+            if coord is not None:
+                key ^= self.pawnKey(playerIndex, coord)
+        return key
+
+    def fenceCountKey(self, playerIndex, count):
+        return self.fenceCountKeys[playerIndex][count]
+
+    def remainingFencesHash(self, remainingFences):
+        """
+        Clave de los muros que le quedan a cada jugador, por índice de jugador.
+        """
+        key = 0
+        for playerIndex, count in enumerate(remainingFences):
+            key ^= self.fenceCountKey(playerIndex, count)
+        return key
+
+    def fencesHash(self, fencePlacings):
+        key = 0
+        for fencePlacing in fencePlacings:
+            key ^= self.fenceKey(fencePlacing.coord, fencePlacing.direction)
+        return key
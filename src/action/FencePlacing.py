@@ -1,25 +1,50 @@
 from src.action.IAction  import *
+from src.GridCoordinates import *
 from src.interface.Fence import *
 
 
 
 class FencePlacing(IAction):
-    def __init__(self, coord, direction):
-        self.coord     = coord
-        self.direction = direction
-
-    def __eq__(self, other):
-        if isinstance(other, self.__class__):
-            return self.coord == other.coord and self.direction == other.direction
-        return NotImplemented
-
-    def __ne__(self, other):
-        if isinstance(other, self.__class__):
-            return not self.__eq__(other)
-        return NotImplemented
+    """
+    Colocación de muro inmutable e internada: una sola instancia por (coord,
+    direction), así que la igualdad es la identidad.
+
+    table(cols, rows) es la tabla de las colocaciones de un tamaño de tablero,
+    indexada por 2*(row*cols + col) + direction.value.
+    """
+
+    __slots__ = ("coord", "direction", "hash")
+
+    interned = {}
+    tables   = {}
+
+    def __new__(cls, coord, direction):
+        key = (coord, direction)
+        fencePlacing = FencePlacing.interned.get(key)
+        if fencePlacing is None:
+            fencePlacing = object.__new__(cls)
+            object.__setattr__(fencePlacing, "coord", coord)
+            object.__setattr__(fencePlacing, "direction", direction)
+            object.__setattr__(fencePlacing, "hash", hash(key))
+            FencePlacing.interned[key] = fencePlacing
+        return fencePlacing
+
+    @staticmethod
+    def table(cols, rows):
+        table = FencePlacing.tables.get((cols, rows))
+        if table is None:
+            table = tuple(FencePlacing(coord, direction) for coord in GridCoordinates.grid(cols, rows) for direction in Fence.DIRECTION)
+            FencePlacing.tables[(cols, rows)] = table
+        return table
+
+    def __setattr__(self, name, value):
+        raise AttributeError("FencePlacing es inmutable")
+
+    def __reduce__(self):
+        return (FencePlacing, (self.coord, self.direction))
 
     def __hash__(self):
-        return hash((self.coord, self.direction))
+        return self.hash
 
     def __str__(self):
         vertical = (self.direction == Fence.DIRECTION.VERTICAL)
@@ -1,4 +1,4 @@
 class IAction:
-    pass
+    __slots__ = ()
 
 
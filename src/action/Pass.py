@@ -0,0 +1,23 @@
+from src.action.IAction import *
+
+
+
+class Pass(IAction):
+    """
+    Turno sin acción: el jugador no tiene ningún movimiento posible y Game
+    pasa al siguiente. Se graba (GameRecord) para que el turno de las acciones
+    siguientes se siga deduciendo bien. Todas las instancias son iguales.
+    """
+
+    __slots__ = ()
+
+    def __eq__(self, other):
+        return isinstance(other, Pass)
+
+    def __hash__(self):
+        return hash(Pass)
+
+    def __str__(self):
+        return "pass"
+
+
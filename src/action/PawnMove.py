@@ -1,28 +1,62 @@
 from src.action.IAction import *
+from src.GridCoordinates import *
 
 
 
 class PawnMove(IAction):
-    def __init__(self, fromCoord, toCoord, throughCoord = None):
-        self.fromCoord    = fromCoord
-        self.toCoord      = toCoord
-        self.throughCoord = throughCoord
+    """
+    Movimiento de peón inmutable e internado, como GridCoordinates: hay una
+    sola instancia por (fromCoord, toCoord, throughCoord), así que la
+    generación de movimientos no crea objetos nuevos y la igualdad es la
+    identidad.
+
+    steps(cols, rows) es la tabla de los pasos simples de un tamaño de
+    tablero, indexada por 4*(row*cols + col) + dirección (izquierda, derecha,
+    arriba, abajo) y con None hacia fuera del tablero.
+    """
+
+    __slots__ = ("fromCoord", "toCoord", "throughCoord", "hash")
+
+    interned = {}
+    tables   = {}
+
+    def __new__(cls, fromCoord, toCoord, throughCoord = None):
+        key = (fromCoord, toCoord, throughCoord)
+        move = PawnMove.interned.get(key)
+        if move is None:
+            move = object.__new__(cls)
+            object.__setattr__(move, "fromCoord", fromCoord)
+            object.__setattr__(move, "toCoord", toCoord)
+            object.__setattr__(move, "throughCoord", throughCoord)
+            object.__setattr__(move, "hash", hash(key))
+            PawnMove.interned[key] = move
+        return move
+
+    @staticmethod
+    def steps(cols, rows):
+        steps = PawnMove.tables.get((cols, rows))
+        if steps is None:
+            steps = []
+            for coord in GridCoordinates.grid(cols, rows):
+                steps.append(PawnMove(coord, coord.left())   if coord.col != 0        else None)
+                steps.append(PawnMove(coord, coord.right())  if coord.col != cols - 1 else None)
+                steps.append(PawnMove(coord, coord.top())    if coord.row != 0        else None)
+                steps.append(PawnMove(coord, coord.bottom()) if coord.row != rows - 1 else None)
+            steps = tuple(steps)
+            PawnMove.tables[(cols, rows)] = steps
+        return steps
 
     def isJump(self):
         return (self.throughCoord is not None)
 
-    def __eq__(self, other):
-        if isinstance(other, self.__class__):
-            return self.fromCoord == other.fromCoord and self.toCoord == other.toCoord and self.throughCoord == other.throughCoord
-        return NotImplemented
+    def __setattr__(self, name, value):
+        raise AttributeError("PawnMove es inmutable")
 
-    def __ne__(self, other):
-        if isinstance(other, self.__class__):
-            return not self.__eq__(other)
-        return NotImplemented
+    def __reduce__(self):
+        return (PawnMove, (self.fromCoord, self.toCoord, self.throughCoord))
 
     def __hash__(self):
-        return hash((self.fromCoord, self.toCoord, self.throughCoord))
+        return self.hash
 
     def __str__(self):
     	return "from %s to %s%s" % (self.fromCoord, self.toCoord, " through %s" % self.throughCoord if self.throughCoord is not None else "") 
@@ -23,7 +23,7 @@ class DivideAndConquer:
     """
     
     @staticmethod
-    def findOptimalFencePlacing(board, player, fencePlacings=None, low=0, high=None):
+    def findOptimalFencePlacing(board, player, fencePlacings=None, low=0, high=None, impacts=None):
         """
         Encuentra el muro óptimo usando Divide y Vencerás.
         
@@ -33,6 +33,8 @@ class DivideAndConquer:
             fencePlacings: Lista de muros candidatos
             low: Índice inferior del rango de búsqueda
             high: Índice superior del rango de búsqueda
+            impacts: Impactos de fencePlacings (Board.evaluateFencesBatch); se
+                calculan todos de una vez en la primera llamada
             
         Returns:
             tuple: (mejor_muro, impacto_máximo)
@@ -45,15 +47,18 @@ class DivideAndConquer:
         if high is None:
             high = len(fencePlacings) - 1
         
+        if impacts is None:
+            impacts = board.evaluateFencesBatch(fencePlacings)
+        
         # CASO BASE: un solo elemento o rango inválido
         if low >= high:
             if low < len(fencePlacings):
-                try:
-                    impact = board.getFencePlacingImpactOnPaths(fencePlacings[low])
-                    score = DivideAndConquer._calculateScore(impact, player.name)
-                    return (fencePlacings[low], score)
-                except PlayerPathObstructedException:
+                # Los muros que bloquearían a algún jugador no tienen impacto
+                impact = impacts.get(fencePlacings[low])
+                if impact is None:
                     return (None, -math.inf)
+                score = DivideAndConquer._calculateScore(impact, player.name)
+                return (fencePlacings[low], score)
             return (None, -math.inf)
         
         # DIVIDIR: calcular punto medio
@@ -61,11 +66,11 @@ class DivideAndConquer:
         
         # CONQUISTAR: resolver recursivamente ambas mitades
         left_fence, left_score = DivideAndConquer.findOptimalFencePlacing(
-            board, player, fencePlacings, low, mid
+            board, player, fencePlacings, low, mid, impacts
         )
         
         right_fence, right_score = DivideAndConquer.findOptimalFencePlacing(
-            board, player, fencePlacings, mid + 1, high
+            board, player, fencePlacings, mid + 1, high, impacts
         )
         
         # COMBINAR: seleccionar el mejor resultado
@@ -109,16 +114,14 @@ class DivideAndConquer:
         sample_size = min(max_candidates * 2, len(all_fences))
         step = len(all_fences) // sample_size
         candidates = []
+        sample = [all_fences[i] for i in range(0, len(all_fences), max(1, step))]
         
-        for i in range(0, len(all_fences), max(1, step)):
-            fence = all_fences[i]
-            try:
-                impact = board.getFencePlacingImpactOnPaths(fence)
-                score = DivideAndConquer._calculateScore(impact, player.name)
-                if score > 0:  # Solo candidatos con impacto positivo
-                    candidates.append((fence, score))
-            except PlayerPathObstructedException:
-                continue
+        # Impacto de toda la muestra en una sola pasada (sin los muros que bloquean)
+        impacts = board.evaluateFencesBatch(sample)
+        for fence, impact in impacts.items():
+            score = DivideAndConquer._calculateScore(impact, player.name)
+            if score > 0:  # Solo candidatos con impacto positivo
+                candidates.append((fence, score))
         
         # Fase 2: Ordenar y tomar los mejores
         candidates.sort(key=lambda x: x[1], reverse=True)
@@ -127,7 +130,7 @@ class DivideAndConquer:
         # Fase 3: Divide y vencerás sobre candidatos filtrados
         if top_candidates:
             return DivideAndConquer.findOptimalFencePlacing(
-                board, player, top_candidates
+                board, player, top_candidates, impacts=impacts
             )
         
         return (None, -math.inf)
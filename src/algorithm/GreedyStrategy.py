@@ -11,6 +11,7 @@
 
 from src.action.IAction import *
 from src.Path import *
+from src.EndgameTablebase import EndgameTablebase
 
 
 class GreedyStrategy:
@@ -66,21 +67,40 @@ class GreedyStrategy:
             
         Complejidad: O(V + E) = O(405)
         Optimalidad: NO garantizada
+
+        EXCEPCIÓN: en un final sin muros de dos jugadores se juega la jugada
+        perfecta de EndgameTablebase (una consulta en la tabla, que se resuelve
+        una vez por disposición de muros).
+        """
+        move = EndgameTablebase.moveFor(board, player)
+        if move is not None:
+            return move
+        return GreedyStrategy.greedyMoveFrom(board, player.pawn.coord, player.endPositions)
+    
+    @staticmethod
+    def greedyMoveFrom(board, coord, endCoords):
+        """
+        greedyMove() a partir de una casilla y unas casillas objetivo, sin
+        necesitar un IPlayer: sirve igual con un Board que con un GameState
+        (por ejemplo, en las simulaciones de MCTSBot).
+        
+        Returns:
+            PawnMove: Primer movimiento del camino más corto, o None
         """
         # Paso 1: Calcular camino más corto (heurística voraz)
-        path = Path.BreadthFirstSearch(
+        path = Path.search(
             board, 
-            player.pawn.coord, 
-            player.endPositions, 
+            coord, 
+            endCoords, 
             ignorePawns=False
         )
         
         # Si no hay camino directo, ignorar peones
         if path is None:
-            path = Path.BreadthFirstSearch(
+            path = Path.search(
                 board,
-                player.pawn.coord,
-                player.endPositions,
+                coord,
+                endCoords,
                 ignorePawns=True
             )
         
@@ -110,25 +130,21 @@ class GreedyStrategy:
         best_fence = None
         best_score = -float('inf')
         
-        for fence_placing in board.storedValidFencePlacings:
-            try:
-                impact = board.getFencePlacingImpactOnPaths(fence_placing)
-                
-                # FUNCIÓN VORAZ: impacto inmediato
-                score = 0
-                for player_name, distance_increase in impact.items():
-                    if player_name == player.name:
-                        score -= distance_increase  # Malo para mí
-                    else:
-                        score += distance_increase  # Bueno (bloquea rival)
-                
-                # DECISIÓN VORAZ: quedarse con el mejor hasta ahora
-                if score > best_score:
-                    best_score = score
-                    best_fence = fence_placing
+        # Impacto de todos los muros válidos en una sola pasada (sin los que bloquean)
+        impacts = board.evaluateFencesBatch(board.storedValidFencePlacings)
+        for fence_placing, impact in impacts.items():
+            # FUNCIÓN VORAZ: impacto inmediato
+            score = 0
+            for player_name, distance_increase in impact.items():
+                if player_name == player.name:
+                    score -= distance_increase  # Malo para mí
+                else:
+                    score += distance_increase  # Bueno (bloquea rival)
             
-            except:
-                continue
+            # DECISIÓN VORAZ: quedarse con el mejor hasta ahora
+            if score > best_score:
+                best_score = score
+                best_fence = fence_placing
         
         return best_fence
     
@@ -3,6 +3,7 @@ import functools
 from collections import defaultdict
 from typing import Callable, Any, Dict
 from src.Path import *
+from src.PathCache import PathCache
 import json
 
 
@@ -249,12 +250,12 @@ class Benchmarker:
                 random.randint(0, board.rows-1)
             )]
             
-            # BFS
-            start_time = time.perf_counter()
-            Path.BreadthFirstSearch(board, start, goals)
-            results["BreadthFirstSearch"].append(
-                time.perf_counter() - start_time
-            )
+            for algo in results:
+                start_time = time.perf_counter()
+                getattr(Path, algo)(board, start, goals)
+                results[algo].append(
+                    time.perf_counter() - start_time
+                )
         
         # Reporte
         for algo, times in results.items():
@@ -265,37 +266,203 @@ class Benchmarker:
                       f"Máx: {max(times)*1000:8.4f}ms")
     
     @staticmethod
-    def benchmark_strategies(game, rounds=10):
+    def benchmark_pathfinding_sizes(sizes=(9, 13, 17, 25), fences_ratio=0.15, iterations=200, seed=0):
+        """
+        Compara Path (deque / heapq) con la implementación anterior
+        (list.pop(0), sorted() descartado, búsqueda lineal en endCoords)
+        sobre tableros cuadrados de varios tamaños.
+
+        Cada tablero se genera sin interfaz con un GameState y recibe
+        muros aleatorios no bloqueantes (fences_ratio * cols * rows / 2).
+        Se buscan caminos desde casillas aleatorias hasta la última fila,
+        ignorando peones, y se comprueba que ambas versiones encuentran
+        caminos de la misma longitud.
+
+        Returns:
+            dict: {size: {algo: {"legacy_ms", "current_ms", "speedup"}}}
+        """
+        import random
+        from src.GridCoordinates import GridCoordinates
+
+        print("\n=== BENCHMARK: BÚSQUEDA DE CAMINOS POR TAMAÑO ===")
+        print(f"{'Size':>5} | {'Algorithm':<20} | {'Legacy(ms)':>10} | {'Current(ms)':>11} | {'Speedup':>7}")
+        print("-" * 68)
+
+        # Sin caché: se mide la búsqueda, no la consulta a PathCache
+        capacity, PathCache.shared.capacity = PathCache.shared.capacity, 0
+        PathCache.shared.clear()
+        rng = random.Random(seed)
+        algos = {
+            "BreadthFirstSearch": (Benchmarker._legacy_breadth_first_search, Path.BreadthFirstSearch),
+            "Dijkstra": (Benchmarker._legacy_dijkstra, Path.Dijkstra)
+        }
+        results = {}
+        for size in sizes:
+            state = Benchmarker._random_state(size, fences_ratio, rng)
+            goals = state.goals[0]
+            starts = [GridCoordinates(rng.randint(0, size - 1), rng.randint(0, size - 2)) for _ in range(iterations)]
+            # Rellenar la tabla perezosa antes de medir
+            for start in starts:
+                Path.BreadthFirstSearch(state, start, goals, ignorePawns = True)
+
+            results[size] = {}
+            for algo, (legacy, current) in algos.items():
+                times = []
+                for implementation in (legacy, current):
+                    start_time = time.perf_counter()
+                    lengths = [implementation(state, start, goals, ignorePawns = True).length() for start in starts]
+                    times.append((time.perf_counter() - start_time) / iterations)
+                    if implementation is legacy:
+                        legacy_lengths = lengths
+                if algo == "BreadthFirstSearch":
+                    assert lengths == legacy_lengths, "BFS legacy y actual difieren"
+                speedup = times[0] / times[1] if times[1] > 0 else float('inf')
+                results[size][algo] = {"legacy_ms": times[0]*1000, "current_ms": times[1]*1000, "speedup": speedup}
+                print(f"{size:>5} | {algo:<20} | {times[0]*1000:>10.4f} | {times[1]*1000:>11.4f} | {speedup:>6.2f}x")
+        PathCache.shared.capacity = capacity
+        return results
+
+    @staticmethod
+    def benchmark_astar(sizes=(9, 17, 25, 33), fences_ratio=0.03, iterations=200, seed=0):
+        """
+        Compara nodos expandidos y tiempo de BFS y A* (Path.search) sobre
+        tableros cuadrados con pocos muros, buscando la última fila desde
+        casillas aleatorias de la primera mitad del tablero.
+
+        Returns:
+            dict: {size: {method: {"expanded", "avg_ms"}}}
+        """
+        import random
+        from src.GridCoordinates import GridCoordinates
+
+        print("\n=== BENCHMARK: BFS vs A* ===")
+        print(f"{'Size':>5} | {'Method':<6} | {'Expanded/search':>15} | {'Avg(ms)':>10}")
+        print("-" * 47)
+
+        capacity, PathCache.shared.capacity = PathCache.shared.capacity, 0
+        PathCache.shared.clear()
+        rng = random.Random(seed)
+        counters = {"BFS": "Path.BreadthFirstSearch.expanded", "AStar": "Path.AStar.expanded"}
+        results = {}
+        for size in sizes:
+            state = Benchmarker._random_state(size, fences_ratio, rng)
+            goals = state.goals[0]
+            starts = [GridCoordinates(rng.randint(0, size - 1), rng.randint(0, size // 2)) for _ in range(iterations)]
+            for start in starts:
+                Path.search(state, start, goals, ignorePawns = True, method = "BFS")
+
+            results[size] = {}
+            lengths = {}
+            for method, counter in counters.items():
+                expandedBefore = TRACE[counter]
+                start_time = time.perf_counter()
+                lengths[method] = [Path.search(state, start, goals, ignorePawns = True, method = method).length() for start in starts]
+                elapsed = (time.perf_counter() - start_time) / iterations
+                expanded = (TRACE[counter] - expandedBefore) / iterations
+                results[size][method] = {"expanded": expanded, "avg_ms": elapsed*1000}
+                print(f"{size:>5} | {method:<6} | {expanded:>15.1f} | {elapsed*1000:>10.4f}")
+            assert lengths["BFS"] == lengths["AStar"], "BFS y A* difieren en la longitud del camino"
+        PathCache.shared.capacity = capacity
+        return results
+
+    @staticmethod
+    def _random_state(size, fences_ratio, rng):
+        """
+        GameState de size x size con dos jugadores enfrentados y
+        fences_ratio * size² / 2 intentos de colocar un muro aleatorio no bloqueante.
         """
-        Compara rendimiento de diferentes estrategias de IA.
+        from src.GridCoordinates     import GridCoordinates
+        from src.GameState           import GameState
+        from src.action.FencePlacing import FencePlacing
+        from src.interface.Fence     import Fence
+
+        middle = size // 2
+        state = GameState(size, size,
+            [GridCoordinates(middle, 0), GridCoordinates(middle, size - 1)],
+            [[GridCoordinates(col, size - 1) for col in range(size)],
+             [GridCoordinates(col, 0) for col in range(size)]],
+            [0, 0])
+        for _ in range(int(fences_ratio * size * size / 2)):
+            coord = GridCoordinates(rng.randint(1, size - 2), rng.randint(1, size - 2))
+            fencePlacing = FencePlacing(coord, rng.choice([Fence.DIRECTION.HORIZONTAL, Fence.DIRECTION.VERTICAL]))
+            if state.bitboard.isFenceSlotFree(coord, fencePlacing.direction) and not state.isFencePlacingBlocking(fencePlacing):
+                state.addFence(fencePlacing)
+        return state
+
+    @staticmethod
+    def _legacy_breadth_first_search(board, startCoord, endCoords, ignorePawns=False):
+        """Path.BreadthFirstSearch antes de deque: referencia para el benchmark."""
+        root = PawnMove(None, startCoord)
+        previousMoves = {startCoord: root}
+        nextMoves = [root]
+        validPawnMoves = board.storedValidPawnMovesIgnoringPawns if ignorePawns else board.storedValidPawnMoves
+        while nextMoves:
+            move = nextMoves.pop(0)
+            for endCoord in endCoords:
+                if move.toCoord == endCoord:
+                    return Path.Reconstruct(previousMoves, move)
+            validMoves = validPawnMoves[move.toCoord]
+            sorted(validMoves, key=lambda validMove: Path.ManhattanDistanceMulti(validMove.toCoord, endCoords))
+            for validMove in validMoves:
+                if validMove.toCoord not in previousMoves:
+                    previousMoves[validMove.toCoord] = validMove
+                    nextMoves.append(validMove)
+        return None
+
+    @staticmethod
+    def _legacy_dijkstra(board, startCoord, endCoords, moveScore=lambda move, step: 1, ignorePawns=False):
+        """Path.Dijkstra antes de heapq: referencia para el benchmark."""
+        root = PawnMove(None, startCoord)
+        previousMoves = {startCoord: (0, root)}
+        nextMoves = [(0, 0, root)]
+        validPawnMoves = board.storedValidPawnMovesIgnoringPawns if ignorePawns else board.storedValidPawnMoves
+        while nextMoves:
+            sorted(nextMoves, key=lambda nextMove: nextMove[1])
+            (step, score, move) = nextMoves.pop(0)
+            for endCoord in endCoords:
+                if move.toCoord == endCoord:
+                    pathMoves = [move]
+                    while move.fromCoord is not None:
+                        move = previousMoves[move.fromCoord][1]
+                        pathMoves.append(move)
+                    pathMoves.reverse()
+                    return Path(pathMoves[1:])
+            validMoves = validPawnMoves[move.toCoord]
+            sorted(validMoves, key=lambda validMove: Path.ManhattanDistanceMulti(validMove.toCoord, endCoords))
+            for validMove in validMoves:
+                validMoveScore = score + moveScore(validMove, step + 1)
+                if validMove.toCoord not in previousMoves:
+                    previousMoves[validMove.toCoord] = (validMoveScore, validMove)
+                    nextMoves.append((step + 1, validMoveScore, validMove))
+                if validMoveScore < previousMoves[validMove.toCoord][0]:
+                    previousMoves[validMove.toCoord] = (validMoveScore, validMove)
+        return None
+
+    @staticmethod
+    def benchmark_strategies(game, rounds=10, workers=None):
+        """
+        Compara rendimiento de diferentes estrategias de IA con un torneo
+        todos contra todos (ver Tournament), en el tamaño de tablero de game.
         
         Mide:
-        - Tiempo por turno
+        - Tiempo por turno (percentiles)
         - Número de turnos hasta victoria
         - Tasa de victoria
+        
+        Requiere src.Settings.INTERFACE = False antes de importar el juego.
         """
         print("\n=== BENCHMARK: ESTRATEGIAS ===")
         
-        from player.RunnerBotImproved import RunnerBot
-        from src.player.BuilderBot import BuilderBot
-        from src.player.RandomBot import RandomBot
+        from src.benchmark.Tournament import Tournament
         
-        strategies = {
-            "RandomBot": RandomBot,
-            "RunnerBot": RunnerBot,
-            "BuilderBot": BuilderBot
-        }
-        
-        results = defaultdict(lambda: {
-            "wins": 0,
-            "total_time": 0,
-            "avg_time_per_move": 0,
-            "moves_count": 0
-        })
-        
-        # TODO: Implementar torneo completo
-        
-        print("El benchmark de estrategias requiere una simulación completa del juego")
-        print("Ver `Game.py` para la integración")
+        results = Tournament.run(
+            ["RandomBot", "RunnerBotImproved", "BuilderBot"],
+            games_per_pairing=rounds,
+            workers=workers,
+            cols=game.board.cols,
+            rows=game.board.rows,
+            fences=game.totalFenceCount
+        )
+        Tournament.report(results)
         
-        return results
\ No newline at end of file
+        return results
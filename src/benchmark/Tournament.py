@@ -0,0 +1,252 @@
+import csv
+import importlib
+import io
+import itertools
+import json
+import os
+import random
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+
+class Tournament:
+    """
+    Torneo todos contra todos entre tipos de bot, sin interfaz y en paralelo.
+
+    USO:
+        results = Tournament.run(["RandomBot", "RunnerBotImproved", "BuilderBot"], games_per_pairing=100)
+        Tournament.report(results)
+        Tournament.export_json(results, "torneo.json")
+
+    Cada pareja de tipos juega games_per_pairing partidas, alternando los
+    asientos. Cada partida se juega en un proceso del pool con su propia
+    semilla, de modo que los resultados son reproducibles y no dependen del
+    número de procesos. Se mide el tiempo de cada jugada.
+
+    Con record_file se añaden todas las partidas a un fichero de partidas
+    (GameRecord), por ejemplo para construir un libro de aperturas (book.py);
+    con book, los bots consultan ese libro de aperturas.
+
+    Los módulos del juego leen INTERFACE al importarse: hay que poner
+    src.Settings.INTERFACE = False antes de importar Game (ver tournament.py).
+    """
+
+    @staticmethod
+    def pairings(bot_types, games_per_pairing, seed=0):
+        """Lista de partidas: (índice, [tipo asiento 0, tipo asiento 1], semilla)."""
+        tasks = []
+        for first, second in itertools.combinations(bot_types, 2):
+            for game in range(games_per_pairing):
+                seats = [first, second] if game % 2 == 0 else [second, first]
+                tasks.append((len(tasks), seats, seed*1000003 + len(tasks)))
+        return tasks
+
+    @staticmethod
+    def isBotType(bot_type):
+        """True si src.player.<bot_type> define una clase <bot_type>."""
+        try:
+            return hasattr(importlib.import_module(f"src.player.{bot_type}"), bot_type)
+        except ImportError:
+            return False
+
+    @staticmethod
+    def play_game(task, cols=9, rows=9, fences=5, record=False, book=None):
+        """
+        Juega una partida (en el proceso actual) y devuelve su resultado:
+        tipos por asiento, ganador, turnos y latencias por jugada en ms, y
+        con record, la partida codificada (GameRecord.encode()).
+        """
+        from src.Game        import Game
+        from src.GameLog     import NullLog
+        from src.GameRecord  import GameRecord, GameRecordWriter
+        from src.OpeningBook import OpeningBook
+
+        index, seats, seed = task
+        if book is not None:
+            OpeningBook.file = book
+        random.seed(seed)
+        players = []
+        latencies = [[] for _ in seats]
+        for seat, bot_type in enumerate(seats):
+            bot_class = getattr(importlib.import_module(f"src.player.{bot_type}"), bot_type)
+            player = bot_class(f"{seat + 1}:{bot_type}")
+            player.nextAction = Tournament._timed(player.nextAction, latencies[seat])
+            players.append(player)
+
+        # Sin destino de eventos (salvo la grabación): no se formatea ningún mensaje durante la partida
+        record_buffer = io.BytesIO() if record else None
+        log = GameRecordWriter(record_buffer) if record else NullLog()
+        start_time = time.perf_counter()
+        game = Game(players, cols, rows, fences, log=log)
+        game.start(1)
+        elapsed = time.perf_counter() - start_time
+
+        winners = [seat for seat, player in enumerate(players) if player.score > 0]
+        result = {
+            "game": index,
+            "seed": seed,
+            "seats": seats,
+            "winner": seats[winners[0]] if winners else None,
+            "winner_seat": winners[0] if winners else None,
+            "turns": sum(len(seat_latencies) for seat_latencies in latencies),
+            "time_s": elapsed,
+            "latencies_ms": latencies
+        }
+        if record:
+            log.close()
+            result["record"] = record_buffer.getvalue()[len(GameRecord.MAGIC):]
+        return result
+
+    @staticmethod
+    def _timed(next_action, latencies):
+        def timed_next_action(board):
+            start_time = time.perf_counter()
+            action = next_action(board)
+            latencies.append((time.perf_counter() - start_time) * 1000)
+            return action
+        return timed_next_action
+
+    @staticmethod
+    def _play_game_args(args):
+        return Tournament.play_game(*args)
+
+    @staticmethod
+    def run(bot_types, games_per_pairing=10, workers=None, cols=9, rows=9, fences=5, seed=0, record_file=None, book=None):
+        """
+        Juega el torneo. Con workers=1 se juega en serie en este proceso;
+        por defecto, un proceso por CPU.
+
+        Returns:
+            dict: {"settings", "bots", "pairings", "games"}
+        """
+        import src.interface.Board as BoardModule
+        if BoardModule.INTERFACE:
+            raise Exception("El torneo se juega sin interfaz: poner src.Settings.INTERFACE = False antes de importar el juego")
+
+        workers = workers or os.cpu_count() or 1
+        tasks = Tournament.pairings(bot_types, games_per_pairing, seed)
+        args = [(task, cols, rows, fences, record_file is not None, book) for task in tasks]
+        start_time = time.perf_counter()
+        if workers == 1:
+            games = [Tournament._play_game_args(arg) for arg in args]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                # map conserva el orden de las partidas
+                games = list(executor.map(Tournament._play_game_args, args, chunksize=max(1, len(args) // (workers*4))))
+        elapsed = time.perf_counter() - start_time
+        if record_file is not None:
+            Tournament.write_records(games, record_file)
+
+        results = Tournament.summarize(bot_types, games)
+        results["settings"] = {
+            "bot_types": list(bot_types),
+            "games_per_pairing": games_per_pairing,
+            "workers": workers,
+            "cols": cols,
+            "rows": rows,
+            "fences": fences,
+            "seed": seed,
+            "book": book,
+            "time_s": elapsed
+        }
+        return results
+
+    @staticmethod
+    def write_records(games, filename):
+        """Añade las partidas grabadas (y las quita de los resultados) a un fichero de partidas."""
+        from src.GameRecord import GameRecord
+
+        with open(filename, 'ab') as f:
+            if f.tell() == 0:
+                f.write(GameRecord.MAGIC)
+            for game in games:
+                f.write(game.pop("record"))
+        print(f"Partidas del torneo grabadas en {filename}")
+
+    @staticmethod
+    def percentile(sorted_values, percent):
+        """Percentil por rango más cercano de una lista ordenada (None si está vacía)."""
+        if not sorted_values:
+            return None
+        rank = max(1, -(-len(sorted_values)*percent // 100))
+        return sorted_values[int(rank) - 1]
+
+    @staticmethod
+    def summarize(bot_types, games):
+        """Victorias, turnos y percentiles de latencia por bot y por pareja."""
+        latencies = defaultdict(list)
+        bots = {bot_type: {"games": 0, "wins": 0, "turns": 0} for bot_type in bot_types}
+        pairings = {}
+        for game in games:
+            pairing_key = " vs ".join(sorted(game["seats"]))
+            pairing = pairings.setdefault(pairing_key, {"games": 0, "wins": defaultdict(int), "turns": 0})
+            pairing["games"] += 1
+            pairing["turns"] += game["turns"]
+            if game["winner"] is not None:
+                pairing["wins"][game["winner"]] += 1
+            for seat, bot_type in enumerate(game["seats"]):
+                bots[bot_type]["games"] += 1
+                bots[bot_type]["turns"] += game["turns"]
+                if game["winner_seat"] == seat:
+                    bots[bot_type]["wins"] += 1
+                latencies[bot_type].extend(game["latencies_ms"][seat])
+
+        for bot_type, s in bots.items():
+            values = sorted(latencies[bot_type])
+            s["win_rate"] = s["wins"] / s["games"] if s["games"] else 0.0
+            s["avg_turns"] = s["turns"] / s["games"] if s["games"] else 0.0
+            s["moves"] = len(values)
+            s["latency_ms"] = {
+                "avg": sum(values) / len(values) if values else None,
+                "p50": Tournament.percentile(values, 50),
+                "p90": Tournament.percentile(values, 90),
+                "p99": Tournament.percentile(values, 99),
+                "max": values[-1] if values else None
+            }
+        for pairing in pairings.values():
+            pairing["wins"] = dict(pairing["wins"])
+            pairing["avg_turns"] = pairing["turns"] / pairing["games"]
+        return {"bots": bots, "pairings": pairings, "games": games}
+
+    @staticmethod
+    def report(results):
+        """Imprime la clasificación y las latencias por bot."""
+        print("\n" + "="*100)
+        print("TORNEO - CLASIFICACIÓN")
+        print("="*100)
+        print(f"{'Bot':<20} | {'Games':>6} | {'Wins':>6} | {'Win%':>6} | {'Turns':>7} | "
+              f"{'p50(ms)':>9} | {'p90(ms)':>9} | {'p99(ms)':>9} | {'Max(ms)':>9}")
+        print("-" * 100)
+        ranking = sorted(results["bots"].items(), key=lambda x: x[1]["win_rate"], reverse=True)
+        for bot_type, s in ranking:
+            latency = s["latency_ms"]
+            print(f"{bot_type:<20} | {s['games']:>6} | {s['wins']:>6} | {s['win_rate']*100:>5.1f}% | {s['avg_turns']:>7.1f} | "
+                  + " | ".join(f"{latency[key]:>9.3f}" if latency[key] is not None else f"{'-':>9}" for key in ("p50", "p90", "p99", "max")))
+        print("-" * 100)
+        for pairing_key, pairing in results["pairings"].items():
+            wins = ", ".join(f"{bot_type}: {wins}" for bot_type, wins in sorted(pairing["wins"].items()))
+            print(f"{pairing_key:<45} | {pairing['games']:>6} partidas | {wins}")
+        print("="*100)
+        if "settings" in results:
+            print(f"\n{len(results['games'])} partidas en {results['settings']['time_s']:.2f}s con {results['settings']['workers']} procesos")
+
+    @staticmethod
+    def export_json(results, filename='tournament_results.json'):
+        """Exporta resumen y partidas a JSON."""
+        with open(filename, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Resultados del torneo exportados a {filename}")
+
+    @staticmethod
+    def export_csv(results, filename='tournament_results.csv'):
+        """Exporta una fila por partida a CSV."""
+        with open(filename, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(["game", "seed", "seat_1", "seat_2", "winner", "turns", "time_s",
+                             "avg_latency_ms_seat_1", "avg_latency_ms_seat_2"])
+            for game in results["games"]:
+                averages = [f"{sum(values) / len(values):.4f}" if values else "" for values in game["latencies_ms"]]
+                writer.writerow([game["game"], game["seed"], game["seats"][0], game["seats"][1],
+                                 game["winner"] or "", game["turns"], f"{game['time_s']:.4f}"] + averages)
+        print(f"Partidas del torneo exportadas a {filename}")
@@ -4,12 +4,18 @@ from src.Settings            import *
 from src.interface.IDrawable import *
 from src.interface.Color     import *
 from src.GridCoordinates     import *
+from src.BitBoard            import *
+from src.FenceConnectivity   import *
+from src.Zobrist             import *
 from src.interface.Square    import *
 from src.interface.Pawn      import *
 from src.interface.Fence     import *
 from src.action.PawnMove     import *
 from src.action.FencePlacing import *
+from src.action.Pass         import *
 from src.Path                import *
+from src.DistanceMap         import *
+from src.NumpyDistances      import NumpyDistances
 from src.exception.PlayerPathObstructedException import *
 
 
@@ -44,6 +50,16 @@ class Board(IDrawable):
             self.window = GraphWin("Quoridor", self.width, self.height)
         self.pawns  = []
         self.fences = []
+        # Muros sin jugador de las colocaciones especulativas, uno por FencePlacing
+        self.neutralFences = {}
+        self.bitboard = BitBoard(cols, rows)
+        self.fenceConnectivity = FenceConnectivity(cols, rows)
+        self.moveStack = []
+        self.distanceMaps = {}
+        self.shortestPathFences = {}
+        self.zobrist = Zobrist.forSize(cols, rows)
+        self.fencesHash, self.pawnsHash, self.playerToMoveHash = 0, 0, 0
+        self.playerToMoveIndex = None
         self.current_round = 1
         self.current_turn = 0
         self.firstCol  = 0
@@ -70,52 +86,67 @@ class Board(IDrawable):
             self.stat_font_small = pygame.font.SysFont('Arial', 12)
 
     def initStoredValidActions(self):
+        """
+        Inicializa las tablas de acciones válidas a partir del BitBoard, que al
+        empezar una ronda está vacío: los peones las actualizan al colocarse.
+        """
         self.storedValidFencePlacings, self.storedValidPawnMoves, self.storedValidPawnMovesIgnoringPawns = [], {}, {}
         for col in range(self.cols):
             for row in range(self.rows):
                 coord = GridCoordinates(col, row)
                 if col != self.lastCol and row != self.firstRow:
-                    self.storedValidFencePlacings.append(FencePlacing(coord, Fence.DIRECTION.HORIZONTAL))
+                    self.storedValidFencePlacings.append(self.bitboard.fencePlacing(coord, Fence.DIRECTION.HORIZONTAL))
                 if col != self.firstCol and row != self.lastRow:
-                    self.storedValidFencePlacings.append(FencePlacing(coord, Fence.DIRECTION.VERTICAL))
-                coordValidPawnMoves, coordValidPawnMovesIgnoringPawns = [], []
-                if col != self.firstCol:
-                    coordValidPawnMovesIgnoringPawns.append(PawnMove(coord, coord.left()))
-                    if col == self.firstCol + 1 and row == self.middleRow:
-                        coordValidPawnMoves.append(PawnMove(coord, coord.left().top(),    coord.left()))
-                        coordValidPawnMoves.append(PawnMove(coord, coord.left().bottom(), coord.left()))
-                    elif col == self.middleCol + 1 and (row == self.firstRow or row == self.lastRow):
-                        coordValidPawnMoves.append(PawnMove(coord, coord.left().left(), coord.left()))
-                    else:
-                        coordValidPawnMoves.append(PawnMove(coord, coord.left()))
-                if col != self.lastCol:
-                    coordValidPawnMovesIgnoringPawns.append(PawnMove(coord, coord.right()))
-                    if col == self.lastCol - 1 and row == self.middleRow:
-                        coordValidPawnMoves.append(PawnMove(coord, coord.right().top(),    coord.right()))
-                        coordValidPawnMoves.append(PawnMove(coord, coord.right().bottom(), coord.right()))
-                    elif col == self.middleCol - 1 and (row == self.firstRow or row == self.lastRow):
-                        coordValidPawnMoves.append(PawnMove(coord, coord.right().right(), coord.right()))
-                    else:
-                        coordValidPawnMoves.append(PawnMove(coord, coord.right()))
-                if row != self.firstRow:
-                    coordValidPawnMovesIgnoringPawns.append(PawnMove(coord, coord.top()))
-                    if col == self.middleCol and row == self.firstRow + 1:
-                        coordValidPawnMoves.append(PawnMove(coord, coord.top().left(),  coord.top()))
-                        coordValidPawnMoves.append(PawnMove(coord, coord.top().right(), coord.top()))
-                    elif (col == self.firstCol or col == self.lastCol) and row == self.middleRow + 1:
-                        coordValidPawnMoves.append(PawnMove(coord, coord.top().top(), coord.top()))
-                    else:
-                        coordValidPawnMoves.append(PawnMove(coord, coord.top()))
-                if row != self.lastRow:
-                    coordValidPawnMovesIgnoringPawns.append(PawnMove(coord, coord.bottom()))
-                    if col == self.middleCol and row == self.lastRow - 1:
-                        coordValidPawnMoves.append(PawnMove(coord, coord.bottom().left(),  coord.bottom()))
-                        coordValidPawnMoves.append(PawnMove(coord, coord.bottom().right(), coord.bottom()))
-                    elif (col == self.firstCol or col == self.lastCol) and row == self.middleRow - 1:
-                        coordValidPawnMoves.append(PawnMove(coord, coord.bottom().bottom(), coord.bottom()))
-                    else:
-                        coordValidPawnMoves.append(PawnMove(coord, coord.bottom()))
-                self.storedValidPawnMoves[coord], self.storedValidPawnMovesIgnoringPawns[coord] = coordValidPawnMoves, coordValidPawnMovesIgnoringPawns
+                    self.storedValidFencePlacings.append(self.bitboard.fencePlacing(coord, Fence.DIRECTION.VERTICAL))
+                self.storedValidPawnMoves[coord]              = self.bitboard.validPawnMoves(coord, False)
+                self.storedValidPawnMovesIgnoringPawns[coord] = self.bitboard.validPawnMoves(coord, True)
+
+    def clear(self):
+        self.pawns, self.fences = [], []
+        self.bitboard = BitBoard(self.cols, self.rows)
+        self.fenceConnectivity = FenceConnectivity(self.cols, self.rows)
+        self.moveStack = []
+        self.distanceMaps = {}
+        self.shortestPathFences = {}
+        self.fencesHash, self.pawnsHash, self.playerToMoveHash = 0, 0, 0
+        self.playerToMoveIndex = None
+
+    def addFence(self, fence):
+        self.fences.append(fence)
+        self.bitboard.placeFence(fence.coord, fence.direction)
+        self.fenceConnectivity.placeFence(fence.coord, fence.direction)
+        self.fencesHash ^= self.zobrist.fenceKey(fence.coord, fence.direction)
+
+    def removeLastFence(self):
+        fence = self.fences.pop()
+        self.bitboard.removeFence(fence.coord, fence.direction)
+        self.fenceConnectivity.removeLastFence()
+        self.fencesHash ^= self.zobrist.fenceKey(fence.coord, fence.direction)
+        return fence
+
+    def updatePawnsHash(self, player, fromCoord, toCoord):
+        if fromCoord is not None:
+            self.pawnsHash ^= self.zobrist.pawnKey(player.index, fromCoord)
+        if toCoord is not None:
+            self.pawnsHash ^= self.zobrist.pawnKey(player.index, toCoord)
+
+    def setPlayerToMove(self, playerIndex):
+        self.playerToMoveIndex = playerIndex
+        self.playerToMoveHash  = self.zobrist.playerToMoveKey(playerIndex)
+
+    def positionKey(self):
+        """
+        Clave Zobrist de la posición: peones, muros y jugador al que le toca mover.
+        """
+        return self.fencesHash ^ self.pawnsHash ^ self.playerToMoveHash
+
+    def passTurn(self, player):
+        """
+        Da el turno al jugador siguiente a player y devuelve el índice anterior, para unmake().
+        """
+        previousPlayerToMoveIndex = self.playerToMoveIndex
+        self.setPlayerToMove((player.index + 1) % len(self.game.players))
+        return previousPlayerToMoveIndex
 
     def draw(self):
         if not INTERFACE:
@@ -360,34 +391,27 @@ class Board(IDrawable):
         return self.grid[coord.col][coord.row]
 
     def hasPawn(self, coord):
-        for pawn in self.pawns:
-            if pawn.coord == coord:
-                return True
-        return False
+        return self.bitboard.hasPawn(coord)
 
     def getPawnAt(self, coord):
+        if not self.bitboard.hasPawn(coord):
+            return None
         for pawn in self.pawns:
             if pawn.coord == coord:
                 return pawn
         return None
 
     def hasFenceAtLeft(self, coord):
-        for fence in self.fences:
-            if fence.direction == Fence.DIRECTION.VERTICAL and (fence.coord == coord or fence.coord == coord.top()):
-                return True
-        return False
+        return self.bitboard.isLeftBlocked(coord)
 
     def hasFenceAtRight(self, coord):
-        return self.hasFenceAtLeft(coord.right())
+        return self.bitboard.isRightBlocked(coord)
 
     def hasFenceAtTop(self, coord):
-        for fence in self.fences:
-            if fence.direction == Fence.DIRECTION.HORIZONTAL and (fence.coord == coord or fence.coord == coord.left()):
-                return True
-        return False
+        return self.bitboard.isTopBlocked(coord)
 
     def hasFenceAtBottom(self, coord):
-        return self.hasFenceAtTop(coord.bottom())
+        return self.bitboard.isBottomBlocked(coord)
 
     def isAtLeftEdge(self, coord):
         return (coord.col == self.firstCol)
@@ -404,56 +428,7 @@ class Board(IDrawable):
     def validPawnMoves(self, coord, ignorePawns = False):
         global TRACE
         TRACE["Board.validPawnMoves"] += 1
-        validMoves = []
-        if not self.isAtLeftEdge(coord) and not self.hasFenceAtLeft(coord):
-            leftCoord = coord.left()
-            if ignorePawns or not self.hasPawn(leftCoord):
-                validMoves.append(PawnMove(coord, leftCoord))
-            else:
-                if not self.isAtLeftEdge(leftCoord) and not self.hasFenceAtLeft(leftCoord) and not self.hasPawn(leftCoord.left()):
-                    validMoves.append(PawnMove(coord, leftCoord.left(), leftCoord))
-                else:
-                    if not self.isAtTopEdge(leftCoord) and not self.hasFenceAtTop(leftCoord) and not self.hasPawn(leftCoord.top()):
-                        validMoves.append(PawnMove(coord, leftCoord.top(), leftCoord))
-                    if not self.isAtBottomEdge(leftCoord) and not self.hasFenceAtBottom(leftCoord) and not self.hasPawn(leftCoord.bottom()):
-                        validMoves.append(PawnMove(coord, leftCoord.bottom(), leftCoord))
-        if not self.isAtRightEdge(coord) and not self.hasFenceAtRight(coord):
-            rightCoord = coord.right()
-            if ignorePawns or not self.hasPawn(rightCoord):
-                validMoves.append(PawnMove(coord, rightCoord))
-            else:
-                if not self.isAtRightEdge(rightCoord) and not self.hasFenceAtRight(rightCoord) and not self.hasPawn(rightCoord.right()):
-                    validMoves.append(PawnMove(coord, rightCoord.right(), rightCoord))
-                else:
-                    if not self.isAtTopEdge(rightCoord) and not self.hasFenceAtTop(rightCoord) and not self.hasPawn(rightCoord.top()):
-                        validMoves.append(PawnMove(coord, rightCoord.top(), rightCoord))
-                    if not self.isAtBottomEdge(rightCoord) and not self.hasFenceAtBottom(rightCoord) and not self.hasPawn(rightCoord.bottom()):
-                        validMoves.append(PawnMove(coord, rightCoord.bottom(), rightCoord))
-        if not self.isAtTopEdge(coord) and not self.hasFenceAtTop(coord):
-            topCoord = coord.top()
-            if ignorePawns or not self.hasPawn(topCoord):
-                validMoves.append(PawnMove(coord, topCoord))
-            else:
-                if not self.isAtTopEdge(topCoord) and not self.hasFenceAtTop(topCoord) and not self.hasPawn(topCoord.top()):
-                    validMoves.append(PawnMove(coord, topCoord.top(), topCoord))
-                else:
-                    if not self.isAtLeftEdge(topCoord) and not self.hasFenceAtLeft(topCoord) and not self.hasPawn(topCoord.left()):
-                        validMoves.append(PawnMove(coord, topCoord.left(), topCoord))
-                    if not self.isAtRightEdge(topCoord) and not self.hasFenceAtRight(topCoord) and not self.hasPawn(topCoord.right()):
-                        validMoves.append(PawnMove(coord, topCoord.right(), topCoord))
-        if not self.isAtBottomEdge(coord) and not self.hasFenceAtBottom(coord):
-            bottomCoord = coord.bottom()
-            if ignorePawns or not self.hasPawn(bottomCoord):
-                validMoves.append(PawnMove(coord, bottomCoord))
-            else:
-                if not self.isAtBottomEdge(bottomCoord) and not self.hasFenceAtBottom(bottomCoord) and not self.hasPawn(bottomCoord.bottom()):
-                    validMoves.append(PawnMove(coord, bottomCoord.bottom(), bottomCoord))
-                else:
-                    if not self.isAtLeftEdge(bottomCoord) and not self.hasFenceAtLeft(bottomCoord) and not self.hasPawn(bottomCoord.left()):
-                        validMoves.append(PawnMove(coord, bottomCoord.left(), bottomCoord))
-                    if not self.isAtRightEdge(bottomCoord) and not self.hasFenceAtRight(bottomCoord) and not self.hasPawn(bottomCoord.right()):
-                        validMoves.append(PawnMove(coord, bottomCoord.right(), bottomCoord))
-        return validMoves
+        return self.bitboard.validPawnMoves(coord, ignorePawns)
 
     def isValidPawnMove(self, fromCoord, toCoord, validMoves = None, ignorePawns = False):
         global TRACE
@@ -507,37 +482,25 @@ class Board(IDrawable):
         if direction == Fence.DIRECTION.HORIZONTAL:
             if self.isAtTopEdge(coord) or self.isAtRightEdge(coord):
                 return False
-            if self.hasFenceAtTop(coord) or self.hasFenceAtTop(coord.right()):
-                return False
         elif direction == Fence.DIRECTION.VERTICAL:
             if self.isAtLeftEdge(coord) or self.isAtBottomEdge(coord):
                 return False
-            if self.hasFenceAtLeft(coord) or self.hasFenceAtLeft(coord.bottom()):
-                return False
         else:
             return False
+
+        # Superposición y cruce con muros existentes, en O(1)
+        if not self.bitboard.isFenceSlotFree(coord, direction):
+            return False
+
+        # Un muro que no cierra ningún ciclo de muros no puede bloquear a nadie
+        if not self.fenceConnectivity.canBlock(coord, direction):
+            return True
         
-        if direction == Fence.DIRECTION.HORIZONTAL:
-            crossingFenceCoord = coord.top().right()
-            for fence in self.fences:
-                if fence.coord == crossingFenceCoord and fence.direction == Fence.DIRECTION.VERTICAL:
-                    return False
-        else:
-            crossingFenceCoord = coord.bottom().left()
-            for fence in self.fences:
-                if fence.coord == crossingFenceCoord and fence.direction == Fence.DIRECTION.HORIZONTAL:
-                    return False
-        
-        checkedFence = Fence(self, None)
-        checkedFence.coord = coord
-        checkedFence.direction = direction
-        self.fences.append(checkedFence)
-        
-        self.updateStoredValidPawnMovesIgnoringPawnsAfterFencePlacing(coord, direction)
+        self.makeFencePlacing(self.bitboard.fencePlacing(coord, direction), ignoringPawnsOnly = True)
         
         all_players_have_path = True
         for player in self.game.players:
-            path = Path.BreadthFirstSearch(
+            path = Path.search(
                 self, 
                 player.pawn.coord, 
                 player.endPositions, 
@@ -546,12 +509,11 @@ class Board(IDrawable):
             
             if path is None:
                 all_players_have_path = False
-                if DEBUG:
-                    print(f"⚠️  Muro {direction.name} en {coord} bloquearía completamente a {player.name}")
+                if DEBUG and self.game.log.enabled:
+                    self.game.log.emit("blockingFence", player = player, coord = coord, direction = direction)
                 break
         
-        self.fences.pop()
-        self.updateStoredValidPawnMovesIgnoringPawnsAfterFencePlacing(coord, direction)
+        self.unmake()
         
         return all_players_have_path
 
@@ -605,9 +567,13 @@ class Board(IDrawable):
 
     def getPawnMoveFromMousePosition(self, pawn, x, y) -> PawnMove:
         square = self.getSquareFromMousePosition(x, y)
-        if square is None or not self.isValidPawnMove(pawn.coord, square.coord):
+        if square is None:
             return None
-        return PawnMove(pawn, square.coord)
+        # El movimiento válido internado (con throughCoord si es un salto), o None
+        for validMove in self.storedValidPawnMoves[pawn.coord]:
+            if validMove.toCoord == square.coord:
+                return validMove
+        return None
 
     def getFencePlacingFromMousePosition(self, x, y) -> FencePlacing:
         # Ajustar por el offset del tablero
@@ -662,18 +628,16 @@ class Board(IDrawable):
     def isFencePlacingBlocking(self, fencePlacing):
         global TRACE
         TRACE["Board.isFencePlacingBlocking"] += 1
-        fence = Fence(self, None)
-        fence.coord, fence.direction = fencePlacing.coord, fencePlacing.direction
-        self.fences.append(fence)
-        self.updateStoredValidPawnMovesIgnoringPawnsAfterFencePlacing(fencePlacing.coord, fencePlacing.direction)
+        if not self.fenceConnectivity.canBlock(fencePlacing.coord, fencePlacing.direction):
+            return False
+        self.makeFencePlacing(fencePlacing, ignoringPawnsOnly = True)
         isBlocking = False
         for player in self.game.players:
-            path = Path.BreadthFirstSearch(self, player.pawn.coord, player.endPositions, ignorePawns = True)
+            path = Path.search(self, player.pawn.coord, player.endPositions, ignorePawns = True)
             if path is None:
                 isBlocking = True
                 break
-        self.fences.pop()
-        self.updateStoredValidPawnMovesIgnoringPawnsAfterFencePlacing(fencePlacing.coord, fencePlacing.direction)
+        self.unmake()
         return isBlocking
 
     def updateStoredValidPawnMovesAt(self, coord):
@@ -682,17 +646,65 @@ class Board(IDrawable):
     def updateStoredValidPawnMovesIgnoringPawnsAt(self, coord):
         self.storedValidPawnMovesIgnoringPawns[coord] = self.validPawnMoves(coord, True)
 
+    def neutralFence(self, fencePlacing):
+        fence = self.neutralFences.get(fencePlacing)
+        if fence is None:
+            fence = Fence(self, None)
+            fence.coord, fence.direction = fencePlacing.coord, fencePlacing.direction
+            self.neutralFences[fencePlacing] = fence
+        return fence
+
     def removeIfExistStoredValidFencePlacing(self, fencePlacing):
+        # Las FencePlacing están internadas: la pertenencia a la lista compara identidades
         if fencePlacing in self.storedValidFencePlacings: self.storedValidFencePlacings.remove(fencePlacing)
 
+    def pawnMoveAffectedCoords(self, fromCoord, toCoord):
+        """
+        Casillas a distancia de Manhattan <= 2 de fromCoord o toCoord: los saltos
+        sobre un peón dependen de las casillas a dos pasos de él.
+        """
+        coords = {}
+        for center in (fromCoord, toCoord):
+            if center is None:
+                continue
+            for col in range(max(center.col - 2, self.firstCol), min(center.col + 2, self.lastCol) + 1):
+                rowRadius = 2 - abs(col - center.col)
+                for row in range(max(center.row - rowRadius, self.firstRow), min(center.row + rowRadius, self.lastRow) + 1):
+                    coords[(col, row)] = None
+        return [GridCoordinates(col, row) for (col, row) in coords]
+
+    def fencePlacingAffectedCoords(self, coord, direction):
+        v = Fence.DIRECTION.VERTICAL
+        minCol, minRow = coord.col - 2 if direction == v else coord.col - 1, coord.row - 1 if direction == v else coord.row - 2
+        maxCol, maxRow = minCol + 3, minRow + 3
+        coords = []
+        for col in range(max(minCol, self.firstCol), min(maxCol, self.lastCol) + 1):
+            for row in range(max(minRow, self.firstRow), min(maxRow, self.lastRow) + 1):
+                if minCol < col < maxCol or minRow < row < maxRow:
+                    coords.append(GridCoordinates(col, row))
+        return coords
+
+    def fencePlacingAffectedCoordsIgnoringPawns(self, coord, direction):
+        v = Fence.DIRECTION.VERTICAL
+        minCol, minRow = coord.col - 1 if direction == v else coord.col, coord.row if direction == v else coord.row - 1
+        return [GridCoordinates(col, row) for col in range(minCol, minCol + 2) for row in range(minRow, minRow + 2)]
+
+    def fencePlacingsExcludedBy(self, coord, direction):
+        """
+        Muros que dejan de ser válidos al colocar uno en coord: el mismo, los dos que
+        se superpondrían en la misma dirección y el que lo cruzaría.
+        """
+        v, h = Fence.DIRECTION.VERTICAL, Fence.DIRECTION.HORIZONTAL
+        return [
+            FencePlacing(coord, direction),
+            FencePlacing(coord.top()    if direction == v else coord.left() , direction),
+            FencePlacing(coord.bottom() if direction == v else coord.right(), direction),
+            FencePlacing(coord.bottom().left() if direction == v else coord.top().right(), h if direction == v else v)
+        ]
+
     def updateStoredValidPawnMovesAfterPawnMove(self, fromCoord, toCoord):
-        coords = [fromCoord] if fromCoord is not None else []
-        coords.append(toCoord)
-        for col in range(self.cols):
-            for row in range(self.rows):
-                coord = GridCoordinates(col, row)
-                if Path.ManhattanDistanceMulti(coord, coords) <= 2:
-                    self.updateStoredValidPawnMovesAt(coord)
+        for coord in self.pawnMoveAffectedCoords(fromCoord, toCoord):
+            self.updateStoredValidPawnMovesAt(coord)
 
     def updateStoredValidActionsAfterPawnMove(self, fromCoord, toCoord):
         global TRACE
@@ -700,28 +712,16 @@ class Board(IDrawable):
         self.updateStoredValidPawnMovesAfterPawnMove(fromCoord, toCoord)
 
     def updateStoredValidFencePlacingsAfterFencePlacing(self, coord, direction):
-        v, h = Fence.DIRECTION.VERTICAL, Fence.DIRECTION.HORIZONTAL
-        self.removeIfExistStoredValidFencePlacing(FencePlacing(coord, direction))
-        self.removeIfExistStoredValidFencePlacing(FencePlacing(coord.top()    if direction == v else coord.left() , direction))
-        self.removeIfExistStoredValidFencePlacing(FencePlacing(coord.bottom() if direction == v else coord.right(), direction))
-        self.removeIfExistStoredValidFencePlacing(FencePlacing(coord.bottom().left() if direction == v else coord.top().right(), h if direction == v else v))
+        for fencePlacing in self.fencePlacingsExcludedBy(coord, direction):
+            self.removeIfExistStoredValidFencePlacing(fencePlacing)
 
     def updateStoredValidPawnMovesAfterFencePlacing(self, coord, direction):
-        v, h = Fence.DIRECTION.VERTICAL, Fence.DIRECTION.HORIZONTAL
-        minCol, minRow = coord.col - 2 if direction == v else coord.col - 1, coord.row - 1 if direction == v else coord.row - 2
-        maxCol, maxRow = minCol + 3, minRow + 3
-        for col in range(minCol, maxCol + 1):
-            for row in range(minRow, maxRow + 1):
-                if minCol < col < maxCol or minRow < row < maxRow:
-                    self.updateStoredValidPawnMovesAt(GridCoordinates(col, row))
+        for affectedCoord in self.fencePlacingAffectedCoords(coord, direction):
+            self.updateStoredValidPawnMovesAt(affectedCoord)
 
     def updateStoredValidPawnMovesIgnoringPawnsAfterFencePlacing(self, coord, direction):
-        v, h = Fence.DIRECTION.VERTICAL, Fence.DIRECTION.HORIZONTAL
-        minCol, minRow = coord.col - 1 if direction == v else coord.col, coord.row if direction == v else coord.row - 1
-        maxCol, maxRow = minCol + 1, minRow + 1
-        for col in range(minCol, maxCol + 1):
-            for row in range(minRow, maxRow + 1):
-                self.updateStoredValidPawnMovesIgnoringPawnsAt(GridCoordinates(col, row))
+        for affectedCoord in self.fencePlacingAffectedCoordsIgnoringPawns(coord, direction):
+            self.updateStoredValidPawnMovesIgnoringPawnsAt(affectedCoord)
 
     def updateStoredValidActionsAfterFencePlacing(self, coord, direction):
         global TRACE
@@ -730,7 +730,91 @@ class Board(IDrawable):
         self.updateStoredValidPawnMovesAfterFencePlacing(coord, direction)
         self.updateStoredValidPawnMovesIgnoringPawnsAfterFencePlacing(coord, direction)
 
+    def replaceStoredValidPawnMoves(self, storedMoves, coords, ignorePawns, changes):
+        for coord in coords:
+            changes.append((storedMoves, coord, storedMoves[coord]))
+            storedMoves[coord] = self.validPawnMoves(coord, ignorePawns)
+
+    def makePawnMove(self, player, toCoord):
+        """
+        Mueve el peón sin dibujar y apila en moveStack las entradas de
+        storedValidPawnMoves que se reemplazan, para que unmake() las restaure.
+        """
+        global TRACE
+        TRACE["Board.makePawnMove"] += 1
+        pawn = player.pawn
+        fromCoord = pawn.coord
+        pawn.coord = toCoord
+        self.bitboard.movePawn(fromCoord, toCoord)
+        self.updatePawnsHash(player, fromCoord, toCoord)
+        changes = []
+        self.replaceStoredValidPawnMoves(self.storedValidPawnMoves, self.pawnMoveAffectedCoords(fromCoord, toCoord), False, changes)
+        self.moveStack.append((PawnMove(fromCoord, toCoord), player, changes, None, self.passTurn(player)))
+
+    def makeFencePlacing(self, fencePlacing, player = None, ignoringPawnsOnly = False):
+        """
+        Coloca un muro sin dibujar y apila en moveStack las entradas de las tablas
+        storedValid* que cambian. Con player, el muro sale de su reserva.
+        Con ignoringPawnsOnly solo se actualiza storedValidPawnMovesIgnoringPawns,
+        que es lo único que consultan las búsquedas de caminos especulativas.
+        """
+        global TRACE
+        TRACE["Board.makeFencePlacing"] += 1
+        coord, direction = fencePlacing.coord, fencePlacing.direction
+        if player is not None:
+            fence = player.fences.pop()
+            fence.coord, fence.direction = coord, direction
+        else:
+            fence = self.neutralFence(fencePlacing)
+        self.addFence(fence)
+        changes = []
+        self.replaceStoredValidPawnMoves(self.storedValidPawnMovesIgnoringPawns, self.fencePlacingAffectedCoordsIgnoringPawns(coord, direction), True, changes)
+        removedFencePlacings = None
+        if not ignoringPawnsOnly:
+            self.replaceStoredValidPawnMoves(self.storedValidPawnMoves, self.fencePlacingAffectedCoords(coord, direction), False, changes)
+            removedFencePlacings = []
+            for excludedFencePlacing in self.fencePlacingsExcludedBy(coord, direction):
+                if excludedFencePlacing in self.storedValidFencePlacings:
+                    index = self.storedValidFencePlacings.index(excludedFencePlacing)
+                    removedFencePlacings.append((index, self.storedValidFencePlacings.pop(index)))
+        previousPlayerToMoveIndex = self.passTurn(player) if player is not None else self.playerToMoveIndex
+        self.moveStack.append((fencePlacing, player, changes, removedFencePlacings, previousPlayerToMoveIndex))
+
+    def make(self, action, player):
+        if isinstance(action, PawnMove):
+            self.makePawnMove(player, action.toCoord)
+        elif isinstance(action, Pass):
+            # Sin movimientos ni muros: solo cambia el turno
+            self.moveStack.append((action, player, [], None, self.passTurn(player)))
+        else:
+            self.makeFencePlacing(action, player)
+
+    def unmake(self):
+        """
+        Deshace la última acción de moveStack restaurando las entradas guardadas,
+        sin volver a generarlas.
+        """
+        global TRACE
+        TRACE["Board.unmake"] += 1
+        action, player, changes, removedFencePlacings, previousPlayerToMoveIndex = self.moveStack.pop()
+        if isinstance(action, PawnMove):
+            player.pawn.coord = action.fromCoord
+            self.bitboard.movePawn(action.toCoord, action.fromCoord)
+            self.updatePawnsHash(player, action.toCoord, action.fromCoord)
+        elif isinstance(action, FencePlacing):
+            fence = self.removeLastFence()
+            if player is not None:
+                player.fences.append(fence)
+            if removedFencePlacings is not None:
+                for index, fencePlacing in reversed(removedFencePlacings):
+                    self.storedValidFencePlacings.insert(index, fencePlacing)
+        for storedMoves, coord, moves in reversed(changes):
+            storedMoves[coord] = moves
+        self.setPlayerToMove(previousPlayerToMoveIndex)
+        return action
+
     def drawOnConsole(self):
+        bitboard = self.bitboard
         print("." + "-+"*(self.cols - 1) + "-.")
         coord = GridCoordinates(0, 0)
         pawn = self.getPawnAt(coord)
@@ -738,13 +822,13 @@ class Board(IDrawable):
         for col in range(1, self.cols):
             coord = GridCoordinates(col, 0)
             pawn = self.getPawnAt(coord)
-            print("%s%s" % (" " if not self.hasFenceAtLeft(coord) else "|", " " if pawn is None else pawn.player.name[:1]), end="")
+            print("%s%s" % (" " if not bitboard.isLeftBlocked(coord) else "|", " " if pawn is None else pawn.player.name[:1]), end="")
         print("|")
         for row in range(1, self.rows):
             print("+", end="")
             for col in range(self.cols):
                 coord = GridCoordinates(col, row)
-                print("%s+" % (" " if not self.hasFenceAtTop(coord) else "-"), end="")
+                print("%s+" % (" " if not bitboard.isTopBlocked(coord) else "-"), end="")
             print("")
             coord = GridCoordinates(0, row)
             pawn = self.getPawnAt(coord)
@@ -752,32 +836,132 @@ class Board(IDrawable):
             for col in range(1, self.cols):
                 coord = GridCoordinates(col, row)
                 pawn = self.getPawnAt(coord)
-                print("%s%s" % (" " if not self.hasFenceAtLeft(coord) else "|", " " if pawn is None else pawn.player.name[:1]), end="")
+                print("%s%s" % (" " if not bitboard.isLeftBlocked(coord) else "|", " " if pawn is None else pawn.player.name[:1]), end="")
             print("|")
         print("'" + "-+"*(self.cols - 1) + "-'")
 
+    def getDistanceMap(self, player):
+        """
+        Mapa de distancias a la meta de player, en caché hasta que cambien los muros
+        y reparado de forma incremental cuando se coloca uno. Los mapas de otros
+        conjuntos de muros se guardan en PathCache, de modo que make()/unmake()
+        de muros durante una búsqueda los reutiliza en lugar de recalcularlos.
+        """
+        distanceMap = self.distanceMaps.get(player)
+        if distanceMap is None or not distanceMap.isValidFor(self.bitboard):
+            cacheKey = PathCache.key(self, "distanceMap", None, player.endPositions, True)
+            cachedMap = PathCache.shared.get(cacheKey)
+            if cachedMap is not PathCache.MISSING:
+                distanceMap = cachedMap
+            elif distanceMap is None:
+                distanceMap = PathCache.shared.put(cacheKey, DistanceMap(self.bitboard, player.endPositions))
+            else:
+                distanceMap = PathCache.shared.put(cacheKey, distanceMap.update(self.bitboard))
+            self.distanceMaps[player] = distanceMap
+        return distanceMap
+
+    def getDistanceToGoal(self, player):
+        """
+        Longitud del camino más corto de player a su meta ignorando peones (math.inf si está bloqueado).
+        """
+        return self.getDistanceMap(player).distance(player.pawn.coord)
+
+    def getShortestPathFences(self, player):
+        """
+        Máscaras de los muros que cortan algún camino más corto de player
+        (ver DistanceMap.shortestPathFences), en caché por muros y posición.
+        """
+        distanceMap = self.getDistanceMap(player)
+        cached = self.shortestPathFences.get(player)
+        if cached is None or cached[0] != distanceMap.fenceKey or cached[1] != player.pawn.coord:
+            cached = (distanceMap.fenceKey, player.pawn.coord, distanceMap.shortestPathFences(player.pawn.coord))
+            self.shortestPathFences[player] = cached
+        return cached[2]
+
+    def isImpactCandidate(self, player, fencePlacing):
+        (horizontalMask, verticalMask) = self.getShortestPathFences(player)
+        mask = horizontalMask if fencePlacing.direction == Fence.DIRECTION.HORIZONTAL else verticalMask
+        return (mask >> self.bitboard.index(fencePlacing.coord)) & 1 == 1
+
+    def impactCandidates(self, player):
+        """
+        Muros válidos que pueden alargar el camino de player: los que cortan
+        algún camino más corto. El resto tiene impacto 0 sobre él.
+        """
+        return [fencePlacing for fencePlacing in self.storedValidFencePlacings if self.isImpactCandidate(player, fencePlacing)]
+
     def getFencePlacingImpactOnPaths(self, fencePlacing: FencePlacing):
         global TRACE
         TRACE["Board.getFencePlacingImpactOnPaths"] += 1
         stateBefore = {}
         for player in self.game.players:
-            path = Path.BreadthFirstSearch(self, player.pawn.coord, player.endPositions, ignorePawns = True)
-            if path is None:
-                print("¡El jugador %s ya está bloqueado!" % (player.name))
+            distance = self.getDistanceToGoal(player)
+            if distance == math.inf:
+                if self.game.log.enabled:
+                    self.game.log.emit("playerBlocked", player = player)
                 return None
-            stateBefore[player.name] = len(path.moves)
-        fence = Fence(self, None)
-        fence.coord, fence.direction = fencePlacing.coord, fencePlacing.direction
-        self.fences.append(fence)
-        self.updateStoredValidPawnMovesIgnoringPawnsAfterFencePlacing(fencePlacing.coord, fencePlacing.direction)
+            stateBefore[player.name] = distance
         impact = {}
+        # Clave de los muros con el muro hipotético: las distancias ya calculadas se reutilizan
+        positionHash = self.fencesHash ^ self.zobrist.fenceKey(fencePlacing.coord, fencePlacing.direction)
         for player in self.game.players:
-            path = Path.BreadthFirstSearch(self, player.pawn.coord, player.endPositions, ignorePawns = True)
-            if path is None:
-                self.fences.pop()
-                self.updateStoredValidPawnMovesIgnoringPawnsAfterFencePlacing(fencePlacing.coord, fencePlacing.direction)
+            if not self.isImpactCandidate(player, fencePlacing):
+                TRACE["Board.getFencePlacingImpactOnPaths.skipped"] += 1
+                impact[player.name] = 0
+                continue
+            cacheKey = PathCache.key(self, "distance", player.pawn.coord, player.endPositions, True, positionHash)
+            distance = PathCache.shared.get(cacheKey)
+            if distance is PathCache.MISSING:
+                distance = self.getDistanceMap(player).distanceAfterFence(fencePlacing.coord, fencePlacing.direction, player.pawn.coord)
+                PathCache.shared.put(cacheKey, distance)
+            if distance == math.inf:
                 raise PlayerPathObstructedException(player, fencePlacing)
-            impact[player.name] = len(path.moves) - stateBefore[player.name]
-        self.fences.pop()
-        self.updateStoredValidPawnMovesIgnoringPawnsAfterFencePlacing(fencePlacing.coord, fencePlacing.direction)
-        return impact
\ No newline at end of file
+            impact[player.name] = distance - stateBefore[player.name]
+        return impact
+
+    def evaluateFencesBatch(self, candidates):
+        """
+        Impacto de todos los muros candidatos a la vez: {FencePlacing: {nombre
+        de jugador: aumento de su distancia}} en el orden de candidates, sin
+        los que bloquearían a algún jugador (como getFencePlacingImpactOnPaths()
+        para cada uno). Vacío si algún jugador ya está bloqueado.
+
+        Con NumPy se evalúan todos en una sola propagación sobre una pila de
+        tableros, uno por candidato (NumpyDistances.fenceBatch): el coste
+        apenas depende del número de candidatos. Sin NumPy, uno a uno con
+        getFencePlacingImpactOnPaths(). Los candidatos deben ser muros que
+        caben en el tablero (storedValidFencePlacings).
+        """
+        global TRACE
+        TRACE["Board.evaluateFencesBatch"] += 1
+        players = self.game.players
+        distancesBefore = []
+        for player in players:
+            distance = self.getDistanceToGoal(player)
+            if distance == math.inf:
+                if self.game.log.enabled:
+                    self.game.log.emit("playerBlocked", player = player)
+                return {}
+            distancesBefore.append(distance)
+
+        candidates = list(candidates)
+        if not NumpyDistances.AVAILABLE:
+            impacts = {}
+            for fencePlacing in candidates:
+                try:
+                    impacts[fencePlacing] = self.getFencePlacingImpactOnPaths(fencePlacing)
+                except PlayerPathObstructedException:
+                    continue
+            return impacts
+
+        if not candidates:
+            return {}
+        distancesAfter = NumpyDistances(self.bitboard).fenceBatch(candidates).distancesAt(
+            [player.endPositions for player in players], [player.pawn.coord for player in players]).T.tolist()
+        unreachable = self.cols*self.rows
+        impacts = {}
+        for fencePlacing, distances in zip(candidates, distancesAfter):
+            if unreachable in distances:
+                continue
+            impacts[fencePlacing] = {player.name: distances[p] - distancesBefore[p] for p, player in enumerate(players)}
+        return impacts
\ No newline at end of file
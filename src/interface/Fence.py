@@ -82,7 +82,7 @@ class Fence(IDrawable):
     def place(self, coord, direction):
         self.coord = coord
         self.direction = direction
-        self.board.fences.append(self)
+        self.board.addFence(self)
         self.board.updateStoredValidActionsAfterFencePlacing(coord, direction)
         self.draw()
 
@@ -89,8 +89,13 @@ class Pawn(IDrawable):
 
     def place(self, coord):
         fromCoord, toCoord = None if self.coord is None else self.coord.clone(), coord
+        # Al inicio de cada ronda el peón aún conserva la casilla de la ronda anterior
+        isOnBoard = self in self.board.pawns
         self.coord = coord
-        self.board.pawns.append(self)
+        if not isOnBoard:
+            self.board.pawns.append(self)
+        self.board.bitboard.movePawn(fromCoord if isOnBoard else None, toCoord)
+        self.board.updatePawnsHash(self.player, fromCoord if isOnBoard else None, toCoord)
         self.board.updateStoredValidActionsAfterPawnMove(fromCoord, toCoord)
         self.draw()
 
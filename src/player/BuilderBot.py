@@ -5,6 +5,7 @@ from src.player.RandomBot import *
 from src.action.IAction   import *
 from src.exception.PlayerPathObstructedException import *
 from src.algorithm.DynamicProgramming import DynamicProgramming
+from src.FenceImpactEvaluator import FenceImpactEvaluator
 
 
 class BuilderBot(RandomBot):
@@ -69,15 +70,10 @@ class BuilderBot(RandomBot):
         fencePlacingImpacts = {}
         self.dp_stats["dp_calculations"] += 1
         
-        # Compute impact of every valid fence placing
-        for fencePlacing in board.storedValidFencePlacings:
-            try:
-                # Usar tabla DP precalculada del board
-                impact = board.getFencePlacingImpactOnPaths(fencePlacing)
-            # Ignore path if it is blocking a player
-            except PlayerPathObstructedException as e:
-                continue
-            
+        # Compute impact of every valid fence placing (in parallel if FENCE_EVALUATION_WORKERS > 1)
+        # Blocking fence placings are left out
+        impacts = FenceImpactEvaluator.impacts(board, board.storedValidFencePlacings)
+        for fencePlacing, impact in impacts.items():
             # Calcular impacto global
             globalImpact = 0
             for playerName in impact:
@@ -1,7 +1,20 @@
 from src.player.IPlayer import *
+from src.OpeningBook    import OpeningBook
 
 
 
 class IBot(IPlayer):
+    # Consultar el libro de aperturas (si hay uno configurado) antes de play()
+    USE_OPENING_BOOK = True
+
+    def nextAction(self, board):
+        if self.USE_OPENING_BOOK:
+            book = OpeningBook.default()
+            if book is not None:
+                action = book.action(board, self)
+                if action is not None:
+                    return action
+        return self.play(board)
+
     def __str__(self):
         return "[BOT] %s (%s)" % (self.name, self.color.name)
\ No newline at end of file
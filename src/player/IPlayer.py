@@ -7,6 +7,7 @@ class IPlayer:
         self.name   = name
         self.color  = color
         self.pawn   = None
+        self.index  = None
         self.fences = []
         self.score  = 0
         self.startPosition = None
@@ -15,12 +16,16 @@ class IPlayer:
     def play(self, board) -> IAction:
         pass
 
+    def nextAction(self, board) -> IAction:
+        """
+        Acción del turno. Los bots consultan antes el libro de aperturas (IBot).
+        """
+        return self.play(board)
+
     def movePawn(self, coord):
-        print("El jugador %s movió su peón a %s" % (self.name, coord))
         self.pawn.move(coord)
 
     def placeFence(self, coord, direction):
-        print("El jugador %s coloca %s" % (self.name, FencePlacing(coord, direction)))
         fence = self.fences.pop()
         fence.place(coord, direction)
 
@@ -0,0 +1,349 @@
+import math
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from src.player.IBot    import *
+from src.action.IAction import *
+from src.action.PawnMove     import *
+from src.action.FencePlacing import *
+from src.action.Pass         import *
+from src.algorithm.GreedyStrategy import GreedyStrategy
+from src.GameState import *
+from src.benchmark.Profiler import Profiler
+
+
+class MCTSNode:
+    """
+    Nodo del árbol de MCTSBot: la posición tras jugar action.
+
+    rewards[i] acumula las partidas simuladas ganadas por el jugador i desde
+    este nodo; playerJustMoved es quien jugó action, y es su recompensa la que
+    cuenta al elegir este nodo desde el padre.
+    """
+
+    def __init__(self, parent, action, playerJustMoved, key, actions, playerCount):
+        self.parent          = parent
+        self.action          = action
+        self.playerJustMoved = playerJustMoved
+        self.key             = key
+        self.untriedActions  = actions
+        self.children        = []
+        self.visits          = 0
+        self.rewards         = [0]*playerCount
+
+    def isFullyExpanded(self):
+        return not self.untriedActions
+
+    def selectChild(self, exploration):
+        """
+        Hijo con mayor UCB1: recompensa media + exploration * sqrt(ln N / n).
+        """
+        logVisits = math.log(self.visits)
+        return max(self.children, key=lambda child:
+            child.rewards[child.playerJustMoved]/child.visits + exploration*math.sqrt(logVisits/child.visits))
+
+    def find(self, key, maxDepth):
+        """
+        Descendiente a maxDepth jugadas como mucho con la clave de posición key, o None.
+        """
+        nodes = [self]
+        for _ in range(maxDepth + 1):
+            for node in nodes:
+                if node.key == key:
+                    return node
+            nodes = [child for node in nodes for child in node.children]
+        return None
+
+
+class MCTSBot(IBot):
+    """
+    Bot que decide con Monte Carlo Tree Search (UCT).
+
+    ALGORITMO FIJO: MONTE CARLO TREE SEARCH (UCT)
+    =============================================
+    En lugar de evaluar posiciones, juega muchas partidas simuladas rápidas
+    y elige la acción que más veces ha resultado prometedora.
+
+    CADA ITERACIÓN:
+    1. Selección: bajar por el árbol eligiendo el hijo con mayor UCB1
+    2. Expansión: añadir un hijo con una acción aún no probada
+    3. Simulación: jugar hasta el final con la política rápida
+    4. Retropropagación: sumar la victoria al ganador en todo el camino
+
+    POLÍTICA DE SIMULACIÓN (rollout):
+    - Peones: GreedyStrategy.greedyMoveFrom (primer paso del camino más corto)
+    - Con probabilidad ROLLOUT_FENCE_PROBABILITY, un muro al azar entre los
+      que cortan el camino más corto del rival más adelantado y no bloquean
+    - A partir de ROLLOUT_MAX_PLIES jugadas gana quien esté más cerca de su meta
+
+    ACCIONES DEL ÁRBOL:
+    Todos los movimientos de peón y los muros que cortan algún camino más corto
+    de un rival (el resto no cambia ninguna distancia).
+
+    PRESUPUESTO Y PARALELISMO:
+    - timeMs milisegundos y/o iterations iteraciones por turno; la búsqueda
+      se detiene MCTS_DEADLINE_MARGIN_MS antes, y el plazo también se
+      comprueba en cada jugada de la simulación (que puede ser larga)
+    - El subárbol de la posición alcanzada se reutiliza en el turno siguiente
+    - Con workers > 1, workers - 1 procesos buscan árboles independientes desde
+      la misma posición y se suman las visitas de las acciones de la raíz
+      (paralelismo de raíz): la fuerza de juego escala con las CPU
+    - Todos los MCTSBot del proceso comparten un único pool (como
+      FenceImpactEvaluator), así que un torneo no deja un pool por bot
+
+    Todo se simula sobre un GameState, sin tocar el Board en pantalla.
+    """
+
+    # Algoritmo fijo - NO puede ser cambiado
+    ALGORITHM = "Monte Carlo Tree Search (UCT)"
+    ALGORITHM_CODE = "MCTS"
+
+    EXPLORATION                = 1.4
+    ROLLOUT_FENCE_PROBABILITY  = 0.1
+    ROLLOUT_MAX_PLIES          = 200
+
+    executor = None
+    executorWorkers = 0
+
+    def __init__(self, name=None, color=None, timeMs=MCTS_TIME_MS, iterations=MCTS_ITERATIONS, workers=MCTS_WORKERS, marginMs=MCTS_DEADLINE_MARGIN_MS):
+        super().__init__(name, color)
+        self.timeMs = timeMs
+        self.marginMs = min(marginMs, timeMs/2) if timeMs is not None else 0
+        self.iterations = iterations
+        self.workers = workers
+        self.root = None
+        self.mcts_stats = {
+            "turns": 0,
+            "iterations": 0,
+            "rollout_plies": 0,
+            "reused_visits": 0
+        }
+
+    @Profiler.profile
+    def play(self, board) -> IAction:
+        self.mcts_stats["turns"] += 1
+        deadline = self.deadline()
+        state = GameState.fromBoard(board, self.index)
+        seeds = [random.getrandbits(32) for _ in range(self.workers - 1)]
+        futures = self.submitWorkers(state, seeds)
+
+        key = MCTSBot.nodeKey(state)
+        self.root = self.root.find(key, state.playerCount()) if self.root is not None else None
+        if self.root is None:
+            self.root = MCTSBot.newRoot(state, key)
+        else:
+            self.root.parent = None
+            self.mcts_stats["reused_visits"] += self.root.visits
+        self.mcts_stats["iterations"] += self.search(self.root, state, deadline)
+
+        visits = {child.action: child.visits for child in self.root.children}
+        try:
+            results = [future.result() for future in futures]
+        except (OSError, NotImplementedError, BrokenProcessPool):
+            # Un proceso del pool murió: solo cuentan las visitas de este proceso
+            MCTSBot.executor = None
+            results = []
+        for result in results:
+            for (action, actionVisits) in result:
+                visits[action] = visits.get(action, 0) + actionVisits
+        if not visits:
+            return GreedyStrategy.greedyMove(board, self)
+        # A igualdad de visitas, el orden de generación de las acciones
+        bestAction = max(visits, key=lambda action: visits[action])
+        self.root = next((child for child in self.root.children if child.action == bestAction), None)
+        return bestAction
+
+    def submitWorkers(self, state, seeds):
+        """
+        Lanza un árbol independiente por semilla en el pool de procesos. Si no se
+        puede crear el pool, se busca solo en este proceso.
+        """
+        if not seeds:
+            return []
+        try:
+            executor = MCTSBot.getExecutor(len(seeds))
+            return [executor.submit(MCTSBot.searchWorker, state, self.timeMs, self.iterations, self.marginMs, seed) for seed in seeds]
+        except (OSError, NotImplementedError, BrokenProcessPool):
+            MCTSBot.executor = None
+            self.workers = 1
+            return []
+
+    @staticmethod
+    def getExecutor(workers):
+        if MCTSBot.executor is None or MCTSBot.executorWorkers != workers:
+            if MCTSBot.executor is not None:
+                MCTSBot.executor.shutdown(wait=False)
+            MCTSBot.executor = ProcessPoolExecutor(max_workers=workers)
+            MCTSBot.executorWorkers = workers
+        return MCTSBot.executor
+
+    @staticmethod
+    def searchWorker(state, timeMs, iterations, marginMs, seed):
+        """
+        Búsqueda de un proceso del pool: devuelve [(acción, visitas)] de la raíz.
+        """
+        random.seed(seed)
+        root = MCTSBot.newRoot(state, MCTSBot.nodeKey(state))
+        bot = MCTSBot(timeMs=timeMs, iterations=iterations, workers=1, marginMs=marginMs)
+        bot.search(root, state, bot.deadline())
+        return [(child.action, child.visits) for child in root.children]
+
+    @staticmethod
+    def nodeKey(state):
+        """
+        Clave Zobrist de la posición combinada con los muros que le quedan a cada jugador.
+        """
+        return state.positionKey() ^ hash(tuple(state.remainingFences))
+
+    @staticmethod
+    def newRoot(state, key):
+        return MCTSNode(None, None, None, key, MCTSBot.treeActions(state), state.playerCount())
+
+    def deadline(self):
+        """
+        Instante (time.perf_counter) en que hay que dejar de buscar en este turno.
+        """
+        if self.timeMs is None:
+            return math.inf
+        return time.perf_counter() + (self.timeMs - self.marginMs)/1000
+
+    def search(self, root, state, deadline):
+        """
+        Itera desde root (la posición de state) hasta agotar el presupuesto o
+        llegar a deadline. state vuelve a quedar como estaba. Devuelve el
+        número de iteraciones.
+        """
+        iterations = 0
+        while (self.iterations is None or iterations < self.iterations) and time.perf_counter() < deadline:
+            node = root
+            depth = 0
+            # 1. Selección
+            while node.isFullyExpanded() and node.children and state.winner() is None:
+                node = node.selectChild(MCTSBot.EXPLORATION)
+                state.apply(node.action)
+                depth += 1
+            # 2. Expansión
+            if node.untriedActions and state.winner() is None:
+                action = node.untriedActions.pop(random.randrange(len(node.untriedActions)))
+                playerIndex = state.playerToMove
+                state.apply(action)
+                depth += 1
+                child = MCTSNode(node, action, playerIndex, MCTSBot.nodeKey(state), MCTSBot.treeActions(state), state.playerCount())
+                node.children.append(child)
+                node = child
+            # 3. Simulación
+            winner = self.rollout(state, deadline)
+            # 4. Retropropagación
+            while node is not None:
+                node.visits += 1
+                node.rewards[winner] += 1
+                node = node.parent
+            for _ in range(depth):
+                state.undo()
+            iterations += 1
+        return iterations
+
+    def rollout(self, state, deadline):
+        """
+        Juega con la política rápida hasta que alguien gane (o se acabe el
+        tiempo del turno) y deshace las jugadas. Devuelve el índice del ganador.
+        """
+        plies = 0
+        winner = state.winner()
+        while winner is None and plies < MCTSBot.ROLLOUT_MAX_PLIES and time.perf_counter() < deadline:
+            state.apply(MCTSBot.rolloutAction(state))
+            plies += 1
+            winner = state.winner()
+        if winner is None:
+            # Sin final: gana el más cercano a su meta (a igualdad, el primero en mover)
+            playerCount = state.playerCount()
+            winner = min(range(playerCount), key=lambda playerIndex:
+                (state.distanceToGoal(playerIndex), (playerIndex - state.playerToMove) % playerCount))
+        for _ in range(plies):
+            state.undo()
+        self.mcts_stats["rollout_plies"] += plies
+        return winner
+
+    @staticmethod
+    def rolloutAction(state):
+        playerIndex = state.playerToMove
+        if state.remainingFences[playerIndex] > 0 and random.random() < MCTSBot.ROLLOUT_FENCE_PROBABILITY:
+            opponents = [other for other in range(state.playerCount()) if other != playerIndex]
+            leader = min(opponents, key=lambda other: state.distanceToGoal(other))
+            fencePlacings = MCTSBot.pathFences(state, leader)
+            random.shuffle(fencePlacings)
+            for fencePlacing in fencePlacings:
+                if not state.isFencePlacingBlocking(fencePlacing):
+                    return fencePlacing
+        validPawnMoves = state.validPawnMoves()
+        if not validPawnMoves:
+            # Peón encerrado por otros peones: pierde el turno
+            return Pass()
+        move = GreedyStrategy.greedyMoveFrom(state, state.pawns[playerIndex], state.goals[playerIndex])
+        if move is None or move not in validPawnMoves:
+            # El camino ignorando peones puede pasar por una casilla ocupada
+            distanceMap = state.distanceMap(playerIndex)
+            move = min(validPawnMoves, key=lambda validMove: distanceMap.distance(validMove.toCoord))
+        return move
+
+    @staticmethod
+    def pathFences(state, playerIndex):
+        """
+        Muros libres (sin comprobar si bloquean) que cortan algún camino más corto del jugador.
+        """
+        cols, rows = state.cols, state.rows
+        coords = GridCoordinates.grid(cols, rows)
+        (horizontalMask, verticalMask) = state.distanceMap(playerIndex).shortestPathFences(state.pawns[playerIndex])
+        fencePlacings = []
+        for (mask, direction) in ((horizontalMask, Fence.DIRECTION.HORIZONTAL), (verticalMask, Fence.DIRECTION.VERTICAL)):
+            while mask:
+                bit = (mask & -mask).bit_length() - 1
+                mask &= mask - 1
+                coord = coords[bit]
+                if direction == Fence.DIRECTION.HORIZONTAL and (coord.col == cols - 1 or coord.row == 0):
+                    continue
+                if direction == Fence.DIRECTION.VERTICAL and (coord.col == 0 or coord.row == rows - 1):
+                    continue
+                if state.bitboard.isFenceSlotFree(coord, direction):
+                    fencePlacings.append(FencePlacing(coord, direction))
+        return fencePlacings
+
+    @staticmethod
+    def treeActions(state):
+        """
+        Acciones que se expanden en el árbol: movimientos de peón y muros no
+        bloqueantes que cortan algún camino más corto de un rival.
+        """
+        if state.winner() is not None:
+            return []
+        playerIndex = state.playerToMove
+        actions = list(state.validPawnMoves())
+        if state.remainingFences[playerIndex] > 0:
+            fencePlacings = set()
+            for other in range(state.playerCount()):
+                if other != playerIndex:
+                    fencePlacings.update(MCTSBot.pathFences(state, other))
+            actions.extend(sorted(
+                (fencePlacing for fencePlacing in fencePlacings if not state.isFencePlacingBlocking(fencePlacing)),
+                key=lambda fencePlacing: (fencePlacing.coord.col, fencePlacing.coord.row, fencePlacing.direction.value)))
+        return actions
+
+    def get_strategy_info(self):
+        """Información sobre estrategia y algoritmo usado."""
+        return {
+            "bot_class": "MCTSBot",
+            "strategy_type": "Monte Carlo Tree Search (UCT)",
+            "algorithm": self.ALGORITHM,
+            "algorithm_code": self.ALGORITHM_CODE,
+            "decision_making": "Most visited root action after greedy rollouts",
+            "time_ms": self.timeMs,
+            "iterations": self.iterations,
+            "workers": self.workers,
+            "stats": self.mcts_stats,
+            "algorithm_fixed": True
+        }
+
+    def __str__(self):
+        return f"[MCTS BOT] {self.name} ({self.color.name}) - Iterations: {self.mcts_stats['iterations']}"
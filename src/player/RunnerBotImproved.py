@@ -76,11 +76,8 @@ class RunnerBotImproved(IBot):
         """
         # ESTRATEGIA DEFENSIVA VORAZ: Si tengo muros y oponente está cerca
         if self.remainingFences() > 0 and len(board.storedValidFencePlacings) > 0:
-            # Calcular mi distancia a objetivo
-            my_path = Path.BreadthFirstSearch(
-                board, self.pawn.coord, self.endPositions, ignorePawns=True
-            )
-            my_distance = len(my_path.moves) if my_path else float('inf')
+            # Calcular mi distancia a objetivo (consulta en el mapa de distancias)
+            my_distance = board.getDistanceToGoal(self)
             
             # Calcular distancia mínima de oponentes
             min_opponent_distance = float('inf')
@@ -88,11 +85,8 @@ class RunnerBotImproved(IBot):
             
             for player in board.game.players:
                 if player.name != self.name:
-                    opp_path = Path.BreadthFirstSearch(
-                        board, player.pawn.coord, player.endPositions, ignorePawns=True
-                    )
-                    if opp_path:
-                        opp_distance = len(opp_path.moves)
+                    opp_distance = board.getDistanceToGoal(player)
+                    if opp_distance != float('inf'):
                         if opp_distance < min_opponent_distance:
                             min_opponent_distance = opp_distance
                             closest_opponent = player
@@ -116,11 +110,8 @@ class RunnerBotImproved(IBot):
             
             # Calcular reducción de distancia (para análisis)
             try:
-                path = Path.BreadthFirstSearch(
-                    board, self.pawn.coord, self.endPositions, ignorePawns=True
-                )
-                if path:
-                    before_distance = len(path.moves)
+                before_distance = board.getDistanceToGoal(self)
+                if before_distance != float('inf'):
                     # Estadística guardada para análisis
                     self.greedy_stats["total_distance_reduced"] += 1
             except:
@@ -229,7 +220,7 @@ class RunnerBotImproved(IBot):
         Explica por qué se tomó el último movimiento.
         Útil para debugging y enseñanza.
         """
-        path = Path.BreadthFirstSearch(
+        path = Path.search(
             board, self.pawn.coord, self.endPositions, ignorePawns=False
         )
         
@@ -270,7 +261,7 @@ class RunnerBotWithAnalysis(RunnerBotImproved):
         """Versión con logging detallado de decisiones."""
         
         # Calcular todas las opciones
-        path = Path.BreadthFirstSearch(
+        path = Path.search(
             board, self.pawn.coord, self.endPositions, ignorePawns=False
         )
         
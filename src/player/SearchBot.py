@@ -0,0 +1,329 @@
+import math
+import time
+
+from src.player.IBot    import *
+from src.action.IAction import *
+from src.action.PawnMove     import *
+from src.action.FencePlacing import *
+from src.action.Pass         import *
+from src.algorithm.GreedyStrategy import GreedyStrategy
+from src.TranspositionTable import *
+from src.exception.PlayerPathObstructedException import *
+from src.benchmark.Profiler import Profiler
+
+
+class SearchTimeout(Exception):
+    """Se lanza dentro de la búsqueda cuando se agota el tiempo del turno."""
+    pass
+
+
+class SearchBot(IBot):
+    """
+    Bot que mira varias jugadas por delante con búsqueda en árbol.
+
+    ALGORITMO FIJO: NEGAMAX CON PODA ALFA-BETA
+    ===========================================
+    Este bot SIEMPRE usa Negamax con poda alfa-beta y profundización iterativa.
+
+    ALGORITMO:
+    1. Profundidad 1, 2, 3... mientras quede tiempo (profundización iterativa)
+    2. En cada nodo, jugar cada acción con board.make() y deshacerla con board.unmake()
+    3. Podar las ramas que no pueden mejorar la ventana [alfa, beta]
+    4. Devolver la mejor acción de la última profundidad completada
+
+    EVALUACIÓN (desde el punto de vista del bot):
+    - Distancia más corta del rival más adelantado - mi distancia
+    - + FENCE_WEIGHT × (mis muros - muros del rival con más muros)
+    - Victoria / derrota: ±WIN_SCORE (antes cuanto más cerca)
+
+    CON 4 JUGADORES (paranoico):
+    Los tres rivales se tratan como un único equipo que minimiza la evaluación
+    del bot; entre dos rivales seguidos no se cambia el signo.
+
+    ACCIONES CONSIDERADAS:
+    - Todos los movimientos de peón (tabla storedValidPawnMoves)
+    - Solo los muros que cortan un camino más corto de algún enemigo
+      (board.impactCandidates), ordenados por impacto y limitados a
+      SEARCH_MAX_FENCES; el resto no cambia la evaluación inmediata
+    - Si no hay ninguna (peón encerrado y sin muros), el jugador pasa el turno
+
+    TABLA DE TRANSPOSICIÓN:
+    Cada posición buscada se guarda con su profundidad, su cota y su mejor
+    acción. Si se vuelve a alcanzar (otro orden de jugadas, peones que van y
+    vuelven, o la siguiente iteración) se reutiliza la puntuación cuando la
+    profundidad basta y, si no, se prueba primero la mejor acción guardada.
+
+    PLAZO:
+    La búsqueda se detiene SEARCH_DEADLINE_MARGIN_MS antes de deadlineMs
+    milisegundos, contados desde que empieza play(); el margen queda para
+    deshacer las jugadas y devolver. El plazo se comprueba en cada nodo, en
+    cada acción de la raíz y en cada muro candidato evaluado. Si se agota el
+    tiempo a mitad de una profundidad, esta se descarta y se devuelve la mejor
+    acción de la anterior (o el movimiento voraz si no dio tiempo a ninguna).
+    Con la CPU libre el turno termina antes de deadlineMs; si el proceso se
+    queda sin CPU (otros procesos en la máquina) puede pasarse.
+
+    COMPLEJIDAD:
+    - O(b^d) sin poda, ~O(b^(d/2)) con buen orden de movimientos
+    - b ≈ 4 movimientos + SEARCH_MAX_FENCES muros
+    """
+
+    # Algoritmo fijo - NO puede ser cambiado
+    ALGORITHM = "Alpha-Beta Negamax"
+    ALGORITHM_CODE = "AB"
+
+    WIN_SCORE     = 1000
+    WIN_THRESHOLD = WIN_SCORE - 100  # Por encima, la puntuación es una victoria segura
+    FENCE_WEIGHT  = 0.5
+
+    def __init__(self, name=None, color=None, deadlineMs=SEARCH_DEADLINE_MS, maxDepth=None, tableMegabytes=TRANSPOSITION_TABLE_MB, marginMs=SEARCH_DEADLINE_MARGIN_MS):
+        super().__init__(name, color)
+        self.deadlineMs = deadlineMs
+        self.marginMs = min(marginMs, deadlineMs/2)
+        self.maxDepth = maxDepth
+        self.table = TranspositionTable(tableMegabytes, "TranspositionTable.%s" % name)
+        self.search_stats = {
+            "turns": 0,
+            "nodes": 0,
+            "max_depth_reached": 0,
+            "timeouts": 0
+        }
+
+    @Profiler.profile
+    def play(self, board) -> IAction:
+        """
+        Profundización iterativa hasta agotar el plazo del turno.
+
+        El tablero queda exactamente como estaba: cada make() tiene su unmake(),
+        también cuando se interrumpe la búsqueda.
+        """
+        self.search_stats["turns"] += 1
+        self.deadline = time.perf_counter() + (self.deadlineMs - self.marginMs)/1000
+        self.board = board
+        self.players = board.game.players
+        self.goals = {player: set(player.endPositions) for player in self.players}
+        self.table.newSearch()
+
+        bestAction = GreedyStrategy.greedyMove(board, self)
+        moveStackSize = len(board.moveStack)
+        depth = 1
+        while self.maxDepth is None or depth <= self.maxDepth:
+            try:
+                (score, action) = self.searchRoot(depth)
+            except SearchTimeout:
+                self.search_stats["timeouts"] += 1
+                while len(board.moveStack) > moveStackSize:
+                    board.unmake()
+                break
+            if action is not None:
+                bestAction = action
+            self.search_stats["max_depth_reached"] = max(self.search_stats["max_depth_reached"], depth)
+            # Victoria o derrota segura: no hace falta mirar más lejos
+            if abs(score) >= SearchBot.WIN_SCORE - depth:
+                break
+            depth += 1
+        self.table.publishStats()
+        return bestAction
+
+    def searchRoot(self, depth):
+        bestScore, bestAction = -math.inf, None
+        alpha, beta = -math.inf, math.inf
+        key = self.positionKey()
+        entry = self.table.probe(key)
+        for action in self.orderedActions(self, entry.bestMove if entry is not None else None):
+            self.checkDeadline()
+            score = self.searchChild(action, self, depth, alpha, beta, 1)
+            if score > bestScore:
+                bestScore, bestAction = score, action
+            alpha = max(alpha, score)
+        self.table.store(key, depth, TranspositionTable.EXACT, bestScore, bestAction)
+        return (bestScore, bestAction)
+
+    def searchChild(self, action, player, depth, alpha, beta, ply, passes=0):
+        """
+        Juega action de player, busca desde el siguiente jugador y deshace la acción.
+        Devuelve la puntuación desde el punto de vista de player.
+        """
+        nextPlayer = self.players[(player.index + 1) % len(self.players)]
+        self.board.make(action, player)
+        try:
+            if self.isSameSide(player, nextPlayer):
+                score = self.negamax(nextPlayer, depth - 1, alpha, beta, ply, passes)
+            else:
+                score = -self.negamax(nextPlayer, depth - 1, -beta, -alpha, ply, passes)
+        finally:
+            self.board.unmake()
+        return score
+
+    def negamax(self, player, depth, alpha, beta, ply, passes=0):
+        """
+        Mejor puntuación alcanzable por el bando de player, con poda alfa-beta.
+        passes cuenta los turnos pasados seguidos hasta este nodo.
+        """
+        self.search_stats["nodes"] += 1
+        self.checkDeadline()
+
+        winner = self.winner()
+        if winner is not None or depth == 0:
+            return self.sideSign(player) * self.evaluate(winner, ply)
+
+        key = self.positionKey()
+        entry = self.table.probe(key)
+        bestAction = None
+        if entry is not None:
+            bestAction = entry.bestMove
+            if entry.depth >= depth:
+                score = self.scoreFromTable(entry.score, ply)
+                if entry.bound == TranspositionTable.EXACT:
+                    return score
+                if entry.bound == TranspositionTable.LOWER:
+                    alpha = max(alpha, score)
+                else:
+                    beta = min(beta, score)
+                if alpha >= beta:
+                    return score
+
+        actions = self.orderedActions(player, bestAction)
+        if not actions:
+            # Peón encerrado y sin muros: pasa el turno, como en Game.start. No
+            # cuenta como jugada (misma profundidad) ni se guarda en la tabla.
+            if passes + 1 >= len(self.players):
+                return self.sideSign(player) * self.evaluate(None, ply)
+            return self.searchChild(Pass(), player, depth + 1, alpha, beta, ply, passes + 1)
+
+        originalAlpha = alpha
+        bestScore = -math.inf
+        for action in actions:
+            score = self.searchChild(action, player, depth, alpha, beta, ply + 1)
+            if score > bestScore:
+                bestScore, bestAction = score, action
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                break
+
+        if bestScore <= originalAlpha:
+            bound = TranspositionTable.UPPER
+        elif bestScore >= beta:
+            bound = TranspositionTable.LOWER
+        else:
+            bound = TranspositionTable.EXACT
+        self.table.store(key, depth, bound, self.scoreToTable(bestScore, ply), bestAction)
+        return bestScore
+
+    def checkDeadline(self):
+        if time.perf_counter() > self.deadline:
+            raise SearchTimeout()
+
+    def positionKey(self):
+        """
+        Clave Zobrist del tablero (peones, muros y turno) combinada con los muros
+        que le quedan a cada jugador, que también cambian la evaluación.
+        """
+        return self.board.positionKey() ^ hash(tuple(player.remainingFences() for player in self.players))
+
+    def scoreToTable(self, score, ply):
+        """
+        Las victorias se guardan relativas al nodo (no a la raíz) para poder
+        reutilizarlas desde otra profundidad.
+        """
+        if score >= SearchBot.WIN_THRESHOLD:
+            return score + ply
+        if score <= -SearchBot.WIN_THRESHOLD:
+            return score - ply
+        return score
+
+    def scoreFromTable(self, score, ply):
+        if score >= SearchBot.WIN_THRESHOLD:
+            return score - ply
+        if score <= -SearchBot.WIN_THRESHOLD:
+            return score + ply
+        return score
+
+    def isSameSide(self, player, otherPlayer):
+        return (player is self) == (otherPlayer is self)
+
+    def sideSign(self, player):
+        return 1 if player is self else -1
+
+    def winner(self):
+        for player in self.players:
+            if player.pawn.coord in self.goals[player]:
+                return player
+        return None
+
+    def evaluate(self, winner, ply):
+        """
+        Evaluación desde el punto de vista del bot.
+        """
+        if winner is self:
+            return SearchBot.WIN_SCORE - ply
+        if winner is not None:
+            return -SearchBot.WIN_SCORE + ply
+        opponents = [player for player in self.players if player is not self]
+        myDistance = self.board.getDistanceToGoal(self)
+        opponentDistance = min(self.board.getDistanceToGoal(player) for player in opponents)
+        fenceBalance = self.remainingFences() - max(player.remainingFences() for player in opponents)
+        return opponentDistance - myDistance + SearchBot.FENCE_WEIGHT * fenceBalance
+
+    def orderedActions(self, player, firstAction=None):
+        """
+        Movimientos de peón (primero los que acercan a la meta) y los muros más
+        prometedores de player contra el bando contrario. firstAction (la mejor
+        acción de la tabla de transposición) va delante si sigue siendo válida.
+        """
+        board = self.board
+        distanceMap = board.getDistanceMap(player)
+        pawnMoves = sorted(board.storedValidPawnMoves[player.pawn.coord], key=lambda move: distanceMap.distance(move.toCoord))
+        if player.remainingFences() < 1:
+            actions = pawnMoves
+        else:
+            actions = pawnMoves[:1] + self.candidateFences(player) + pawnMoves[1:]
+        if firstAction is not None and firstAction in actions:
+            actions.remove(firstAction)
+            actions.insert(0, firstAction)
+        return actions
+
+    def candidateFences(self, player):
+        """
+        Muros que alargan el camino de algún enemigo de player, de mayor a menor impacto.
+        """
+        board = self.board
+        enemies = [other for other in self.players if not self.isSameSide(player, other)]
+        candidates = set()
+        for enemy in enemies:
+            candidates.update(board.impactCandidates(enemy))
+        scoredFences = []
+        for fencePlacing in candidates:
+            self.checkDeadline()
+            try:
+                impact = board.getFencePlacingImpactOnPaths(fencePlacing)
+            except PlayerPathObstructedException:
+                continue
+            if impact is None:
+                continue
+            score = 0
+            for other in self.players:
+                score += (-1 if self.isSameSide(player, other) else 1) * impact[other.name]
+            if score > 0:
+                scoredFences.append((score, fencePlacing.coord.col, fencePlacing.coord.row, fencePlacing.direction.value, fencePlacing))
+        scoredFences.sort(key=lambda scoredFence: (-scoredFence[0],) + scoredFence[1:4])
+        return [scoredFence[4] for scoredFence in scoredFences[:SEARCH_MAX_FENCES]]
+
+    def get_strategy_info(self):
+        """Información sobre estrategia y algoritmo usado."""
+        return {
+            "bot_class": "SearchBot",
+            "strategy_type": "Game-tree search (Negamax + Alpha-Beta)",
+            "algorithm": self.ALGORITHM,
+            "algorithm_code": self.ALGORITHM_CODE,
+            "decision_making": "Iterative deepening under a per-move deadline",
+            "deadline_ms": self.deadlineMs,
+            "max_fences_per_node": SEARCH_MAX_FENCES,
+            "transposition_table_hit_rate": self.table.hitRate(),
+            "stats": self.search_stats,
+            "algorithm_fixed": True
+        }
+
+    def __str__(self):
+        return f"[SEARCH BOT] {self.name} ({self.color.name}) - Depth: {self.search_stats['max_depth_reached']}"
@@ -0,0 +1,94 @@
+import getopt
+import os
+import sys
+
+# Sin interfaz: debe fijarse antes de importar los módulos del juego
+import src.Settings
+src.Settings.INTERFACE = False
+src.Settings.DEBUG     = False
+
+from src.benchmark.Tournament import Tournament
+
+
+PARAMETERS_ERROR_RETURN_CODE = 1
+
+def printUsage():
+    print("Uso: python tournament.py [opciones]\n\n"+
+          "Opciones:\n"+
+          "  -h, --help\t\t\tMostrar esta ayuda\n"+
+          "  -b, --bots=\t\tLista de tipos de bot, ej: RandomBot,RunnerBotImproved,BuilderBot\n"+
+          "  -g, --games=\t\tPartidas por pareja de bots (por defecto 10)\n"+
+          "  -w, --workers=\t\tProcesos en paralelo (por defecto uno por CPU)\n"+
+          "  -x, --cols=\t\tNúmero de columnas del tablero (por defecto 9)\n"+
+          "  -y, --rows=\t\tNúmero de filas del tablero (por defecto 9)\n"+
+          "  -f, --fences=\t\tNúmero de muros por jugador (por defecto 5)\n"+
+          "  -s, --seed=\t\tSemilla del torneo (por defecto 0)\n"+
+          "  -j, --json=\t\tFichero JSON de resultados\n"+
+          "  -c, --csv=\t\tFichero CSV con una fila por partida\n"+
+          "  -r, --record=\t\tAñade las partidas a un fichero de partidas (formato binario GameRecord)\n"+
+          "  -k, --book=\t\tLibro de aperturas que consultan los bots (ver book.py)\n\n"+
+          "Ejemplo:\n  python tournament.py --bots=RandomBot,RunnerBotImproved,BuilderBot --games=100 --json=torneo.json")
+
+def readArguments():
+    try:
+        opts, args = getopt.getopt(sys.argv[1:], "b:g:w:x:y:f:s:j:c:r:k:h", ["bots=", "games=", "workers=", "cols=", "rows=", "fences=", "seed=", "json=", "csv=", "record=", "book=", "help"])
+    except getopt.GetoptError as err:
+        print(err)
+        printUsage()
+        sys.exit(PARAMETERS_ERROR_RETURN_CODE)
+    arguments = {"bot_types": [], "games_per_pairing": 10, "workers": None, "cols": 9, "rows": 9, "fences": 5, "seed": 0}
+    jsonFile, csvFile = None, None
+
+    for opt, arg in opts:
+        if opt in ("-h", "--help"):
+            printUsage()
+            sys.exit(0)
+        elif opt in ("-b", "--bots"):
+            arguments["bot_types"] = arg.split(",")
+        elif opt in ("-g", "--games"):
+            arguments["games_per_pairing"] = int(arg)
+        elif opt in ("-w", "--workers"):
+            arguments["workers"] = int(arg)
+        elif opt in ("-x", "--cols"):
+            arguments["cols"] = int(arg)
+        elif opt in ("-y", "--rows"):
+            arguments["rows"] = int(arg)
+        elif opt in ("-f", "--fences"):
+            arguments["fences"] = int(arg)
+        elif opt in ("-s", "--seed"):
+            arguments["seed"] = int(arg)
+        elif opt in ("-j", "--json"):
+            jsonFile = arg
+        elif opt in ("-c", "--csv"):
+            csvFile = arg
+        elif opt in ("-r", "--record"):
+            arguments["record_file"] = arg
+        elif opt in ("-k", "--book"):
+            if not os.path.exists(arg):
+                print("No existe el libro de aperturas: %s. Abortando." % (arg))
+                sys.exit(PARAMETERS_ERROR_RETURN_CODE)
+            arguments["book"] = arg
+        else:
+            print("Opción no manejada. Abortando.")
+            sys.exit(PARAMETERS_ERROR_RETURN_CODE)
+
+    if len(arguments["bot_types"]) < 2:
+        print("Se esperan al menos 2 tipos de bot. Abortando.")
+        sys.exit(PARAMETERS_ERROR_RETURN_CODE)
+    for botType in arguments["bot_types"]:
+        if botType == "Human" or not Tournament.isBotType(botType):
+            print("Tipo de bot desconocido: %s. Abortando." % (botType))
+            sys.exit(PARAMETERS_ERROR_RETURN_CODE)
+    return arguments, jsonFile, csvFile
+
+def main():
+    arguments, jsonFile, csvFile = readArguments()
+    results = Tournament.run(**arguments)
+    Tournament.report(results)
+    if jsonFile is not None:
+        Tournament.export_json(results, jsonFile)
+    if csvFile is not None:
+        Tournament.export_csv(results, csvFile)
+
+if __name__ == "__main__":
+    main()